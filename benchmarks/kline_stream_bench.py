@@ -0,0 +1,180 @@
+"""
+경량 Binance kline 클라이언트와 ccxt.pro 경로의 메시지당 비용/지연 비교 벤치마크
+
+로컬 WebSocket 대역 서버(stand-in)가 Binance 형식의 kline 메시지를 보내며,
+네트워크 연결 없이 실행됨:
+
+    python -m benchmarks.kline_stream_bench --messages 20000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import ccxt.pro as ccxtpro
+from aiohttp import web
+
+from core.binance_ws import BinanceKlineStream, parse_kline_message, stream_name
+
+def make_kline_message(seq, combined=True, symbol='BTCUSDT', interval='1m'):
+    """Binance USDⓈ-M kline 이벤트 형식의 메시지 생성 (E는 전송 시각)"""
+    now_ms = int(time.time() * 1000)
+    start = now_ms - now_ms % 60000
+    price = 60000 + (seq % 100)
+    data = {
+        'e': 'kline', 'E': now_ms, 's': symbol,
+        'k': {
+            't': start, 'T': start + 59999, 's': symbol, 'i': interval,
+            'f': seq, 'L': seq, 'o': f"{price:.1f}", 'c': f"{price + 1:.1f}",
+            # 거래량 필드에는 전송 시각을 넣어 이벤트 시각이 없는 ccxt 경로의 지연도 측정
+            'h': f"{price + 2:.1f}", 'l': f"{price - 2:.1f}", 'v': str(now_ms),
+            'n': 10, 'x': False, 'q': '740700.0', 'V': '6.1', 'Q': '370350.0', 'B': '0',
+        },
+    }
+    if combined:
+        return json.dumps({'stream': f"{symbol.lower()}@kline_{interval}", 'data': data})
+    return json.dumps(data)
+
+# 대역 서버가 보내는 BTCUSDT 무기한 선물의 exchangeInfo 항목 (ccxt.pro 경로용)
+STAND_IN_MARKET = {
+    'symbol': 'BTCUSDT', 'pair': 'BTCUSDT', 'contractType': 'PERPETUAL', 'status': 'TRADING',
+    'baseAsset': 'BTC', 'quoteAsset': 'USDT', 'marginAsset': 'USDT',
+    'pricePrecision': 2, 'quantityPrecision': 3, 'onboardDate': 1569398400000, 'deliveryDate': 4133404800000,
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'tickSize': '0.10', 'minPrice': '0.1', 'maxPrice': '1000000'},
+        {'filterType': 'LOT_SIZE', 'stepSize': '0.001', 'minQty': '0.001', 'maxQty': '1000'},
+    ],
+}
+
+class KlineStandInServer:
+    """
+    Binance 선물 WebSocket 대역 서버
+    /stream?streams=... 는 결합 스트림 형식, /ws (및 /market/ws 등) 는 SUBSCRIBE 요청 후 단일 스트림 형식으로 전송
+    """
+    
+    def __init__(self, messages, host='127.0.0.1', port=0):
+        self.messages = messages
+        self.host = host
+        self.port = port
+        self.runner = None
+    
+    async def _send_all(self, ws, combined):
+        for seq in range(self.messages):
+            await ws.send_str(make_kline_message(seq, combined=combined))
+            if seq % 100 == 0:
+                await asyncio.sleep(0)
+        await ws.close()
+    
+    async def _combined(self, request):
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+        await self._send_all(ws, combined=True)
+        return ws
+    
+    async def _raw(self, request):
+        ws = web.WebSocketResponse(autoping=True)
+        await ws.prepare(request)
+        subscribe = json.loads((await ws.receive()).data)
+        await ws.send_str(json.dumps({'result': None, 'id': subscribe.get('id')}))
+        await self._send_all(ws, combined=False)
+        return ws
+    
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/stream', self._combined)
+        app.router.add_get('/ws', self._raw)
+        app.router.add_get('/ws/{tail:.*}', self._raw)
+        # 최신 ccxt.pro는 선물 스트림을 /market/ws, /public/ws 처럼 분류별 경로로 연결함
+        app.router.add_get('/{category}/ws', self._raw)
+        app.router.add_get('/{category}/ws/{tail:.*}', self._raw)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"ws://{self.host}:{self.port}"
+    
+    async def stop(self):
+        await self.runner.cleanup()
+
+def summarize(name, latencies_ms, elapsed, count):
+    """count개 메시지 처리 시간과 지연 분포 출력"""
+    if not latencies_ms:
+        print(f"{name}: no messages received")
+        return
+    latencies_ms = sorted(latencies_ms)
+    p99 = latencies_ms[min(len(latencies_ms) - 1, int(len(latencies_ms) * 0.99))]
+    print(f"{name}: {count} msgs, {elapsed / count * 1e6:.1f} us/msg, "
+          f"latency p50 {statistics.median(latencies_ms):.2f} ms, p99 {p99:.2f} ms")
+
+async def bench_native(messages):
+    server = KlineStandInServer(messages)
+    base_url = await server.start()
+    latencies = []
+    done = asyncio.Event()
+    
+    def on_kline(stream, event_time, row, closed):
+        latencies.append(time.time() * 1000 - event_time)
+        if len(latencies) >= messages:
+            done.set()
+    
+    client = BinanceKlineStream([stream_name('BTC/USDT', '1m')], on_kline, base_url)
+    start = time.perf_counter()
+    task = asyncio.create_task(client.run())
+    await asyncio.wait_for(done.wait(), timeout=120)
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await server.stop()
+    summarize('native client', latencies, elapsed, len(latencies))
+
+async def bench_ccxt(messages):
+    server = KlineStandInServer(messages)
+    base_url = await server.start()
+    exchange = ccxtpro.binanceusdm({'options': {'defaultType': 'future'}})
+    exchange.urls['api']['ws']['future'] = f"{base_url}/ws"
+    latencies = []
+    try:
+        # 시장 정보는 REST로 받지 않고, exchangeInfo 형식의 항목을 ccxt의 parse_market()으로 변환해 주입
+        # (lowercaseId 등 ccxt.pro가 스트림 메시지를 시장에 대응시킬 때 쓰는 필드를 ccxt가 직접 채움)
+        exchange.set_markets([exchange.parse_market(STAND_IN_MARKET)])
+        start = last = time.perf_counter()
+        try:
+            # 서버가 모든 메시지를 보내고 연결을 닫을 때까지 수신
+            while True:
+                ohlcv = await asyncio.wait_for(exchange.watch_ohlcv('BTC/USDT:USDT', '1m'), timeout=10)
+                # ccxt는 이벤트 시각을 노출하지 않으므로 대역 서버가 거래량 필드에 넣은 전송 시각 사용
+                latencies.append(time.time() * 1000 - ohlcv[-1][5])
+                last = time.perf_counter()
+        except (ccxtpro.NetworkError, asyncio.TimeoutError):
+            pass
+        # 연결 종료/시간 초과를 기다린 시간은 제외하고 마지막 갱신까지만 측정
+        elapsed = last - start
+        # watch_ohlcv는 여러 메시지를 한 번에 반환할 수 있으므로 비용은 보낸 메시지 수 기준
+        summarize('ccxt.pro path', latencies, elapsed, messages)
+    except Exception as e:
+        print(f"ccxt.pro path: stopped after {len(latencies)} updates ({type(e).__name__}: {e})")
+    finally:
+        await exchange.close()
+        await server.stop()
+
+def bench_parse(messages):
+    """네트워크를 제외한 메시지 파싱 비용"""
+    raw = [make_kline_message(i) for i in range(messages)]
+    start = time.perf_counter()
+    for message in raw:
+        parse_kline_message(message)
+    elapsed = time.perf_counter() - start
+    print(f"parse_kline_message: {elapsed / messages * 1e6:.2f} us/msg")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+    bench_parse(args.messages)
+    asyncio.run(bench_native(args.messages))
+    asyncio.run(bench_ccxt(args.messages))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+페이퍼 트레이딩 엔진 재생 결정성 확인
+
+고정된 캔들을 replay_rows()로 재생해 신호, 체결(시각/가격), 수수료, 실현 손익, 자산이
+기대값과 같은지 확인함. 난수와 네트워크를 쓰지 않으므로 엔진을 바꾼 뒤 그대로 실행하면 됨:
+
+    python -m benchmarks.paper_trading_check
+
+지연 시간 0이면 'close' 모드 주문이 다음 캔들 시가에, 지연이 있으면 (ticks=1) 다음 캔들 종가에,
+ticks=4이면 지연 이후 첫 진행 중 갱신 가격에 체결되는지도 함께 확인함.
+"""
+
+import math
+import sys
+
+from utils.paper_trading import PaperTradingEngine, replay_rows
+
+SYMBOL, TIMEFRAME, TIMEFRAME_MS = 'TEST/USDT', '1m', 60_000
+CLOSES = [100, 101, 99, 98, 97, 100, 103, 104, 102, 99, 98, 101, 104]
+
+# (ticks, latency_ms) -> (신호 [(시각, 방향)], 체결 [(시각, 방향, 가격, 수수료)], (수수료, 실현 손익, 자산))
+SIGNALS = [(300000, 'buy'), (360000, 'buy'), (540000, 'sell'), (660000, 'buy'), (720000, 'buy')]
+EXPECTED = {
+    (1, 0): (
+        SIGNALS,
+        [(300000, 'buy', 97.0, 1.0), (540000, 'sell', 102.0, 2.051546), (660000, 'buy', 98.0, 1.960784)],
+        (5.012331, 90.762078, 10146.974237),
+    ),
+    (1, 5000): (
+        SIGNALS,
+        [(359999, 'buy', 100.0, 1.030928), (599999, 'sell', 99.0, 1.991207), (719999, 'buy', 101.0, 2.020808)],
+        (5.042943, -29.917121, 9995.65218),
+    ),
+    (4, 5000): (
+        SIGNALS,
+        [(314999, 'buy', 97.75, 1.007732), (554999, 'sell', 101.25, 2.036461), (674999, 'buy', 98.75, 1.97579)],
+        (5.019984, 60.592278, 10109.143723),
+    ),
+}
+
+def fixed_rows():
+    """시가는 직전 종가, 고가/저가는 시가/종가에서 1씩 벌어진 캔들 [[ts, o, h, l, c, v], ...]"""
+    rows = []
+    previous = CLOSES[0]
+    for i, close in enumerate(CLOSES):
+        rows.append([i * TIMEFRAME_MS, previous, max(previous, close) + 1, min(previous, close) - 1, close, 10.0])
+        previous = close
+    return rows
+
+def close_enough(a, b):
+    return math.isclose(a, b, rel_tol=0, abs_tol=1e-6)
+
+def check(ticks, latency_ms):
+    """한 조건을 재생하고 기대값과 다른 항목 목록 반환"""
+    engine = PaperTradingEngine(
+        evaluate='close', initial_equity=10000.0, order_notional=1000.0,
+        fee_rate=0.001, slippage=0.0, latency_ms=latency_ms, cci_window=3,
+    )
+    events = replay_rows(engine, SYMBOL, TIMEFRAME, fixed_rows(), TIMEFRAME_MS, ticks=ticks)
+    signals, fills, (fees, realized, equity) = EXPECTED[(ticks, latency_ms)]
+    book = engine.books[(SYMBOL, TIMEFRAME)]
+    errors = []
+    
+    actual_signals = [(e['time'], e['side']) for e in events if e['type'] == 'signal']
+    if actual_signals != signals:
+        errors.append(f"signals {actual_signals} != {signals}")
+    actual_fills = [e for e in events if e['type'] == 'fill']
+    if len(actual_fills) != len(fills):
+        errors.append(f"fills {len(actual_fills)} != {len(fills)}")
+    for event, (time_ms, side, price, fee) in zip(actual_fills, fills):
+        if (event['time'], event['side']) != (time_ms, side) or not close_enough(event['price'], price) \
+                or not close_enough(event['fee'], fee):
+            errors.append(f"fill {event['time']} {event['side']} @ {event['price']:g} fee {event['fee']:.6f} "
+                          f"!= {time_ms} {side} @ {price:g} fee {fee:.6f}")
+    for name, actual, expected in (('fees', book.fees, fees), ('realized', book.realized_pnl, realized),
+                                   ('equity', engine.total_equity(), equity)):
+        if not close_enough(actual, expected):
+            errors.append(f"{name} {actual:.6f} != {expected:.6f}")
+    return errors
+
+def main():
+    failed = False
+    for ticks, latency_ms in EXPECTED:
+        errors = check(ticks, latency_ms)
+        print(f"ticks={ticks} latency={latency_ms}ms: {'OK' if not errors else 'FAILED'}")
+        for error in errors:
+            print(f"  {error}")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
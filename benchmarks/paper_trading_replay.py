@@ -0,0 +1,100 @@
+"""
+페이퍼 트레이딩 엔진 재생 벤치마크
+
+여러 심볼의 캔들 스트림을 진행 중 갱신(--ticks개)까지 포함해 재생하며 배치당 처리 비용과
+모의 매매 결과를 출력함. --history를 주면 로컬 이력 저장소의 마감 캔들을 재생하고,
+없으면 난수 가격 경로를 사용하므로 네트워크 연결 없이 실행됨:
+
+    python -m benchmarks.paper_trading_replay --symbols 200 --candles 1000 --evaluate intra
+    python -m benchmarks.paper_trading_replay --history BTC/USDT --timeframe 5m
+"""
+
+import argparse
+import random
+import time
+
+from core.candle_pyramid import TIMEFRAME_MS
+from utils.paper_trading import PaperTradingEngine, tick_batches
+from config.settings import (
+    DEFAULT_EXCHANGE_ID, HISTORY_DB_PATH, PAPER_INITIAL_EQUITY, PAPER_ORDER_NOTIONAL,
+    PAPER_FEE_RATE, PAPER_SLIPPAGE, PAPER_LATENCY_MS, CCI_WINDOW
+)
+
+def random_walk_rows(candles, timeframe_ms, seed):
+    """난수 가격 경로의 캔들 [[ts, o, h, l, c, v], ...]"""
+    rng = random.Random(seed)
+    price = 100.0 * (1 + seed % 50)
+    rows = []
+    for i in range(candles):
+        open_price = price
+        price *= 1 + rng.gauss(0, 0.004)
+        spread = abs(rng.gauss(0, 0.002)) * price
+        rows.append([i * timeframe_ms, open_price, max(open_price, price) + spread,
+                     min(open_price, price) - spread, price, rng.uniform(1, 100)])
+    return rows
+
+def run(engine, streams, timeframe, ticks):
+    """심볼 스트림들을 시간 순서대로 섞어 재생하고 (배치 수, 경과 시간, 이벤트) 반환"""
+    timeframe_ms = TIMEFRAME_MS[timeframe]
+    count = 0
+    events = []
+    start = time.perf_counter()
+    length = max(len(rows) for rows in streams.values())
+    for i in range(length):
+        for symbol, rows in streams.items():
+            if i >= len(rows):
+                continue
+            for now_ms, batch in tick_batches(rows[i], ticks, timeframe_ms):
+                events.extend(engine.update(symbol, timeframe, batch, now_ms))
+                count += 1
+    return count, time.perf_counter() - start, events
+
+def load_history_rows(symbol, timeframe, candles):
+    from core.history_store import HistoryStore
+    store = HistoryStore(HISTORY_DB_PATH, DEFAULT_EXCHANGE_ID)
+    try:
+        return store.load_before(symbol, timeframe, time.time() * 1000, candles).tolist()
+    finally:
+        store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=100)
+    parser.add_argument('--candles', type=int, default=1000)
+    parser.add_argument('--ticks', type=int, default=5, help="캔들당 진행 중 갱신 수")
+    parser.add_argument('--timeframe', default='5m')
+    parser.add_argument('--evaluate', choices=('close', 'intra'), default='close')
+    parser.add_argument('--latency-ms', type=int, default=PAPER_LATENCY_MS)
+    parser.add_argument('--history', metavar='SYMBOL', help="로컬 이력 저장소의 캔들 재생 (예: BTC/USDT)")
+    args = parser.parse_args()
+    
+    if args.history:
+        rows = load_history_rows(args.history, args.timeframe, args.candles)
+        if len(rows) <= CCI_WINDOW:
+            print(f"{args.history} {args.timeframe}: not enough local history ({len(rows)} candles)")
+            return
+        streams = {args.history: rows}
+    else:
+        streams = {
+            f"SYM{i}/USDT": random_walk_rows(args.candles, TIMEFRAME_MS[args.timeframe], seed=i)
+            for i in range(args.symbols)
+        }
+    
+    engine = PaperTradingEngine(
+        evaluate=args.evaluate, initial_equity=PAPER_INITIAL_EQUITY, order_notional=PAPER_ORDER_NOTIONAL,
+        fee_rate=PAPER_FEE_RATE, slippage=PAPER_SLIPPAGE, latency_ms=args.latency_ms, cci_window=CCI_WINDOW,
+    )
+    count, elapsed, events = run(engine, streams, args.timeframe, args.ticks)
+    fills = [event for event in events if event['type'] == 'fill']
+    print(f"{len(streams)} symbols x {args.candles} candles x {args.ticks} ticks ({args.evaluate}): "
+          f"{count} batches, {elapsed / count * 1e6:.2f} us/batch")
+    print(f"signals {len(events) - len(fills)}, fills {len(fills)}, "
+          f"fees {sum(event['fee'] for event in fills):,.2f}, "
+          f"equity {engine.total_equity():,.2f} / {PAPER_INITIAL_EQUITY * len(streams):,.2f}")
+    if args.history:
+        for event in fills[-10:]:
+            print(f"  {time.strftime('%Y-%m-%d %H:%M', time.gmtime(event['time'] / 1000))} "
+                  f"{event['side']} {event['quantity']:.6g} @ {event['price']:g} realized {event['realized']:+.2f}")
+
+if __name__ == '__main__':
+    main()
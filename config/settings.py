@@ -2,12 +2,27 @@
 애플리케이션 전역 설정값을 정의하는 모듈
 """
 
+import os
+
 # 거래소 설정
 DEFAULT_EXCHANGE_ID = 'binanceusdm'
 DEFAULT_SYMBOL = 'BTC/USDT'
 DEFAULT_TIMEFRAME = '1h'
 DEFAULT_LIMIT = 500
 
+# 별도 수집 프로세스 + 공유 메모리 링 버퍼 사용 여부 (False면 GUI 프로세스의 워커 스레드 사용)
+USE_INGEST_PROCESS = False
+INGEST_RING_CAPACITY = 4096
+
+# ccxt.pro 대신 경량 Binance kline WebSocket 클라이언트 사용 여부
+USE_NATIVE_KLINE_STREAM = False
+BINANCE_FUTURES_WS_URL = 'wss://fstream.binance.com'
+NATIVE_WS_HEARTBEAT = 30.0  # 클라이언트 ping 간격 (초)
+NATIVE_WS_MAX_BACKOFF = 30.0  # 재연결 최대 대기 (초)
+
+# 워커 정지 시 거래소 WebSocket 종료 대기 시간 (초)
+WORKER_CLOSE_TIMEOUT = 2.0
+
 # 차트 설정
 CHART_DEFAULT_HEIGHT = 400
 CHART_SPLITTER_RATIO = 0.75  # 메인 차트 : CCI 차트 = 3:1
@@ -17,6 +32,133 @@ BOLLINGER_WINDOW = 20
 BOLLINGER_STD = 2.0
 CCI_WINDOW = 20
 
+# 메인 차트에 추가로 표시할 레지스트리 지표 (키 -> (지표 이름, 파라미터, 색상))
+# 예: {'ema_50': ('ema', {'span': 50}, 'm'), 'vwap': ('vwap', {}, 'c')}
+INDICATOR_OVERLAYS = {}
+
+# 지표 계산 워커 스레드 수 (GUI 스레드 밖에서 계산)
+INDICATOR_WORKERS = 2
+
+# 지표 결과 캐시 메모리 예산 (바이트)
+INDICATOR_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# 전체 시장 스캐너 설정
+SCANNER_TIMEFRAME = '1h'
+SCANNER_LIMIT = 200  # 심볼당 캔들 수 (시간 축 길이)
+SCANNER_CLOSE_DELAY_MS = 3000  # 캔들 마감 후 갱신까지 대기
+# 순위 조건: CCI가 cci_above 이상/cci_below 이하이거나, 종가가 볼린저 밴드 밖이면 조건 충족
+SCANNER_CONDITIONS = {
+    'cci_above': 100,
+    'cci_below': -100,
+    'outside_bands': True,
+}
+
+# 틱 지연 추적 설정
+LATENCY_WINDOW = 500  # 심볼/단계별로 보관할 최근 샘플 수
+LATENCY_BUDGET_MS = 1000.0  # 종단 간 지연 경고 기준 (밀리초)
+LATENCY_WARN_INTERVAL = 10.0  # 경고 최소 간격 (초)
+LATENCY_READOUT_INTERVAL_MS = 1000  # 실시간 표시 갱신 주기
+
+# REST 폴백 증분 폴링 설정
+REST_POLLS_PER_CANDLE = 12  # 진행 중 캔들당 폴링 횟수 (1m 기준 5초 간격)
+REST_POLL_MIN_INTERVAL_MS = 2000
+REST_POLL_MAX_INTERVAL_MS = 60000
+REST_POLL_CLOSE_DELAY_MS = 1000  # 캔들 마감 후 확정 캔들 조회까지 대기 시간
+REST_POLL_DELTA_LIMIT = 100  # 증분 요청당 최대 캔들 수 (가득 차면 즉시 이어서 요청)
+REST_WEIGHT_LIMIT = 2400  # Binance USDⓈ-M 1분 요청 가중치 한도
+REST_WEIGHT_BACKOFF_RATIO = 0.7  # 이 비율을 넘으면 폴링 간격을 늘림
+
+# REST 요청 스케줄러 설정
+REST_SCHEDULER_WORKERS = 8  # 동시 REST 요청 수 (ccxt 내장 rate limit과 함께 적용)
+REST_PRIORITY_WEIGHT_RATIOS = {  # 우선순위별로 사용할 수 있는 1분 가중치 한도 비율
+    0: 0.95,  # 대화형
+    1: 0.85,  # 폴링
+    2: 0.6,  # 백필/스캔
+    3: 0.4,  # 선행 로드
+}
+
+# 과거 이력 페이징 설정
+HISTORY_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'history.sqlite3')
+HISTORY_PAGE_SIZE = 499  # 페이지당 캔들 수 (500 미만이면 klines 요청 가중치 2)
+HISTORY_PREFETCH_CANDLES = 100  # 로드된 구간 끝에서 이 캔들 수 이내로 보이면 다음 페이지 요청
+HISTORY_MAX_CANDLES = 20000  # 메모리에 보관할 최대 캔들 수
+
+# 다중 해상도 캔들 피라미드 설정
+PYRAMID_TIMEFRAMES = ['1m', '5m', '15m', '1h', '4h', '1d', '3d']  # 기본 타임프레임의 배수인 것만 사용
+PYRAMID_MIN_PIXELS_PER_CANDLE = 3  # 캔들당 픽셀이 이보다 작아지면 상위 레벨로 전환
+PYRAMID_WARMUP_CANDLES = 300  # 화면에 전달하는 구간 앞에 지표 계산용으로 더 붙이는 캔들 수
+
+# 체결 집계 초 단위 캔들 설정 (1s/5s/15s)
+TRADE_LATE_WINDOW_MS = 2000  # 최근 체결 시각 기준 이 시간 이내 버킷은 늦은 체결로 계속 갱신
+TRADE_MAX_GAP_FILL = 3600  # 체결 없는 구간을 직전 종가로 채울 최대 버킷 수
+TRADE_SEED_LIMIT = 1000  # 시작 시 REST로 받아 집계할 최근 체결 수
+TRADE_EMIT_INTERVAL_MS = 100  # 워커가 모은 캔들/체결을 GUI로 보내는 최소 간격
+
+# 호가 깊이 히트맵 설정
+DEPTH_BOOK_LIMIT = 1000  # watch_order_book 호가 수
+DEPTH_SAMPLE_MS = 1000  # 히트맵 열 하나의 시간 간격
+DEPTH_COLUMNS = 3600  # 보관할 열 수 (1초 간격이면 1시간, 메모리 약 3600 x 400 x 4바이트)
+DEPTH_ROWS = 400  # 가격 구간 수
+DEPTH_TILE_COLUMNS = 60  # 히트맵 이미지 하나가 담는 열 수 (새 열이 들어오면 그 타일만 다시 올림, DEPTH_COLUMNS의 약수)
+DEPTH_LEVEL_HYSTERESIS = 0.2  # 최신 열 최대값이 색 범위 상한과 이 비율 이상 차이 날 때만 전체 타일의 색 범위 갱신 (그 사이는 포화 표시)
+DEPTH_STEP_RATIO = 0.0002  # 가격 구간 폭 (첫 스냅샷 중간가 대비 비율, 2bp)
+DEPTH_EMIT_INTERVAL_MS = 250  # 워커가 GUI로 스냅샷을 보내는 최소 간격
+
+# 볼륨 프로파일 설정
+PROFILE_STEP_RATIO = 0.0005  # 최소 가격 구간 폭 (첫 가격 대비 비율, 5bp)
+PROFILE_MAX_BINS = 400  # 가격 구간 수 상한 (넘으면 구간 폭을 정수배로 넓혀 기존 구간을 병합)
+PROFILE_MAX_CANDLES = 2000  # 프로파일 행렬에 보관할 최대 캔들 수 (체결/추정 각각)
+PROFILE_WIDTH_FRACTION = 0.2  # 최대 거래량 막대 길이 (보이는 X 범위 대비 비율)
+PROFILE_REFRESH_MS = 200  # 오버레이 다시 그리기 최소 간격
+PROFILE_FOOTPRINT_MAX_CANDLES = 60  # 보이는 캔들이 이 수 이하일 때만 풋프린트 표시
+
+# 페이퍼 트레이딩 설정 (CCI 신호 기반 모의 매매)
+PAPER_SYMBOLS = []  # 현재 차트 외에 함께 모의 매매할 심볼 (PAPER_TIMEFRAME 사용), 예: ['ETH/USDT', 'SOL/USDT']
+PAPER_TIMEFRAME = '5m'
+PAPER_EVALUATE = 'close'  # 'close': 캔들 마감 시 신호 평가, 'intra': 진행 중 캔들 갱신마다 평가
+PAPER_INITIAL_EQUITY = 10000.0  # 심볼별 시작 자산 (USDT)
+PAPER_ORDER_NOTIONAL = 1000.0  # 신호당 목표 포지션 금액 (USDT)
+PAPER_FEE_RATE = 0.0004  # 체결 수수료율 (테이커)
+PAPER_SLIPPAGE = 0.0001  # 체결가에 불리하게 적용하는 슬리피지 비율
+PAPER_LATENCY_MS = 250  # 신호 발생부터 주문 체결까지의 모의 지연 (ms)
+PAPER_ALLOW_SHORT = True  # False면 매도 신호는 청산만 수행
+PAPER_CCI_OVERBOUGHT = 100
+PAPER_CCI_OVERSOLD = -100
+PAPER_WARMUP_CANDLES = 100  # 저장소에 캔들이 부족한 심볼의 CCI 워밍업용 REST 요청 개수
+PAPER_MAX_MARKERS = 200  # 장부별로 차트 마커용으로 보관할 최근 체결 수
+PAPER_EQUITY_POINTS = 2000  # 장부별 자산 곡선 보관 개수
+
+# 세션 스냅샷 설정
+SESSION_SNAPSHOT_PATH = os.path.join(os.path.dirname(HISTORY_DB_PATH), 'session.npz')
+SESSION_SNAPSHOT_CANDLES = 1000  # 스냅샷에 저장하는 최근 캔들 수
+
+# 최근 차트 작업 집합 설정
+WARM_CHART_COUNT = 4  # 백그라운드에 유지할 최근 차트 수 (차트마다 스트림 연결 하나)
+WARM_MAX_BYTES = 64 * 1024 * 1024  # 보관 차트의 캔들 배열/DataFrame 메모리 합계 한도
+
+# 유휴 시간 선행 로드 설정
+PREFETCH_IDLE_MS = 3000  # 차트 조작이 없을 때 선행 로드를 시작하기까지의 시간
+PREFETCH_MAX_CANDIDATES = 4  # 한 번에 선행 로드하는 차트 수
+PREFETCH_RECENT_SYMBOLS = 6  # 후보로 사용하는 최근 심볼 수
+PREFETCH_MAX_AGE_MS = 5 * 60 * 1000  # 받아 둔 캔들을 사용하는 최대 시간 (캔들 경계를 넘으면 그 전에 폐기)
+
+# 관심 종목 격자 설정
+GRID_SYMBOLS = [
+    'BTC/USDT', 'ETH/USDT', 'XRP/USDT', 'SOL/USDT', 'BNB/USDT', 'DOGE/USDT', 'ADA/USDT', 'AVAX/USDT',
+    'LINK/USDT', 'DOT/USDT', 'LTC/USDT', 'TRX/USDT', 'BCH/USDT', 'NEAR/USDT', 'APT/USDT', 'ARB/USDT',
+]
+GRID_TIMEFRAME = '5m'
+GRID_COLUMNS = 4
+GRID_VISIBLE_CANDLES = 120  # 작은 차트에 그리는 최근 캔들 수
+RENDER_FRAME_MS = 33  # 렌더 스케줄러 프레임 간격 (약 30fps)
+RENDER_FRAME_BUDGET_MS = 12  # 한 프레임에서 차트 다시 그리기에 쓰는 최대 시간
+RENDER_IDLE_MS = 250  # 대기 중인 차트가 모두 보이지 않을 때 다시 확인하는 간격
+
+# 알림 설정
+ALERT_RULES = []  # 시작 시 등록할 (심볼, 규칙 문자열) 목록, 예: ('BTC/USDT', 'price > 70000')
+ALERT_MAX_MESSAGES = 500  # 알림 영역에 보관할 최대 줄 수
+ALERT_FEED_TIMEFRAME = '1m'  # 표시 중이 아닌 심볼의 규칙을 평가할 때 구독하는 타임프레임 (CCI/볼린저도 이 기준)
+
 # 초기 지표 상태
 SHOW_BOLLINGER = True
 SHOW_CCI = True
@@ -0,0 +1,153 @@
+"""
+ccxt.pro 없이 Binance USDⓈ-M kline 스트림을 직접 수신하는 경량 WebSocket 클라이언트 모듈
+"""
+
+import asyncio
+import json
+import threading
+import traceback
+import aiohttp
+
+from core.data_worker import Worker
+from utils.latency import CandleBatch
+from config.settings import (
+    BINANCE_FUTURES_WS_URL, NATIVE_WS_HEARTBEAT, NATIVE_WS_MAX_BACKOFF
+)
+
+def stream_name(symbol, timeframe):
+    """
+    ccxt 심볼과 타임프레임을 Binance 스트림 이름으로 변환
+    예: ('BTC/USDT', '1m') 또는 ('BTC/USDT:USDT', '1m') -> 'btcusdt@kline_1m'
+    """
+    market_id = symbol.split(':')[0].replace('/', '').lower()
+    return f"{market_id}@kline_{timeframe}"
+
+def parse_kline_message(raw):
+    """
+    kline 메시지에서 필요한 필드만 파싱
+    
+    Parameters:
+    raw (str): 결합 스트림({"stream": ..., "data": {...}}) 또는 단일 스트림 메시지
+    
+    Returns:
+    tuple: (스트림 이름, 이벤트 시각(ms), [timestamp, open, high, low, close, volume], 마감 여부)
+           kline 이벤트가 아니면 None
+    """
+    message = json.loads(raw)
+    data = message.get('data', message)
+    kline = data.get('k') if isinstance(data, dict) else None
+    if kline is None:
+        return None  # 구독 응답 등
+    row = [kline['t'], float(kline['o']), float(kline['h']), float(kline['l']),
+           float(kline['c']), float(kline['v'])]
+    name = message.get('stream') or f"{kline['s'].lower()}@kline_{kline['i']}"
+    return name, data['E'], row, kline['x']
+
+class BinanceKlineStream:
+    """
+    Binance 결합 스트림(combined stream) kline 클라이언트
+    
+    여러 심볼/타임프레임을 하나의 연결로 구독하며, 서버 ping에는 aiohttp가 자동으로
+    pong을 응답하고, 연결이 끊기면 지수 백오프로 재연결함.
+    수신한 kline마다 on_kline(스트림 이름, 이벤트 시각, 캔들 행, 마감 여부)를 호출함.
+    """
+    
+    def __init__(self, streams, on_kline, base_url=BINANCE_FUTURES_WS_URL,
+                 heartbeat=NATIVE_WS_HEARTBEAT, max_backoff=NATIVE_WS_MAX_BACKOFF, on_error=None):
+        self.streams = list(streams)
+        self.on_kline = on_kline
+        self.on_error = on_error
+        self.base_url = base_url.rstrip('/')
+        self.heartbeat = heartbeat
+        self.max_backoff = max_backoff
+        self._ws = None
+        self._request_id = 0
+        self.messages = 0
+        self.reconnects = 0
+    
+    @property
+    def url(self):
+        return f"{self.base_url}/stream?streams={'/'.join(self.streams)}"
+    
+    async def _send_method(self, method, streams):
+        if self._ws is None or self._ws.closed:
+            return
+        self._request_id += 1
+        await self._ws.send_str(json.dumps({'method': method, 'params': list(streams), 'id': self._request_id}))
+    
+    async def subscribe(self, streams):
+        """연결을 유지한 채 스트림 추가 (재연결 시에도 유지됨)"""
+        new = [s for s in streams if s not in self.streams]
+        self.streams.extend(new)
+        if new:
+            await self._send_method('SUBSCRIBE', new)
+    
+    async def unsubscribe(self, streams):
+        removed = [s for s in streams if s in self.streams]
+        self.streams = [s for s in self.streams if s not in removed]
+        if removed:
+            await self._send_method('UNSUBSCRIBE', removed)
+    
+    def _report(self, message):
+        print(message)
+        if self.on_error:
+            self.on_error(message)
+    
+    async def run(self):
+        """취소될 때까지 수신 (연결 끊김 시 자동 재연결)"""
+        backoff = 1.0
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=self.heartbeat, autoping=True) as ws:
+                        self._ws = ws
+                        backoff = 1.0
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                parsed = parse_kline_message(msg.data)
+                                if parsed is not None:
+                                    self.messages += 1
+                                    self.on_kline(*parsed)
+                            elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                    self._report(f"Binance kline stream disconnected; reconnecting in {backoff:.0f}s.")
+                except asyncio.CancelledError:
+                    raise
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError) as e:
+                    self._report(f"Binance kline stream error: {type(e).__name__} - {e}; reconnecting in {backoff:.0f}s.")
+                finally:
+                    self._ws = None
+                self.reconnects += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+class NativeKlineWorker(Worker):
+    """
+    ccxt.pro 대신 BinanceKlineStream을 사용하는 워커
+    Worker와 같은 시그널/정지 방식을 사용하므로 MainWindow에서 그대로 교체 가능
+    """
+    
+    def __init__(self, symbol, timeframe, base_url=BINANCE_FUTURES_WS_URL):
+        super().__init__(None, symbol, timeframe)
+        self.stream = BinanceKlineStream(
+            [stream_name(symbol, timeframe)], self._on_kline, base_url,
+            on_error=self.signals.error.emit,
+        )
+    
+    async def stream_async(self):
+        thread_id = threading.get_ident()
+        print(f"Starting native Binance kline stream for {self.symbol} on {self.timeframe} in thread {thread_id}")
+        try:
+            await self.stream.run()
+        except asyncio.CancelledError:
+            print(f"Native kline stream for {self.symbol} in thread {thread_id} was cancelled.")
+            raise
+        except Exception as e:
+            error_msg = f"Error in native kline stream ({self.symbol}): {type(e).__name__} - {e}"
+            print(error_msg)
+            traceback.print_exc()
+            self.signals.error.emit(error_msg)
+    
+    def _on_kline(self, stream, event_time, row, closed):
+        if self._is_running:
+            self.signals.new_data.emit(CandleBatch([row], event_time=event_time / 1000))
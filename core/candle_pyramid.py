@@ -0,0 +1,103 @@
+"""
+기본 타임프레임 캔들로부터 상위 타임프레임 집계 캔들을 유지하는 다중 해상도 피라미드 모듈
+"""
+
+import ccxt
+import numpy as np
+
+from config.settings import PYRAMID_TIMEFRAMES
+
+TIMEFRAME_MS = {
+    '1s': 1_000, '5s': 5_000, '15s': 15_000,
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000, '1w': 604_800_000,
+}
+
+def timeframe_to_ms(timeframe):
+    """타임프레임 길이 (ms) - 표에 없으면 ccxt 규칙으로 해석하고, 해석할 수 없으면 None"""
+    if timeframe in TIMEFRAME_MS:
+        return TIMEFRAME_MS[timeframe]
+    try:
+        return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+    except Exception:
+        return None
+
+def aggregate_candles(timestamps, values, bucket_ms):
+    """
+    정렬된 캔들을 bucket_ms 단위로 집계 (벡터화)
+    
+    Returns:
+    tuple: (버킷 시작 타임스탬프 int64 배열, (M, 5) open/high/low/close/volume 배열)
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=float)
+    buckets = timestamps - timestamps % bucket_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(timestamps)] - 1
+    aggregated = np.empty((len(starts), 5), dtype=float)
+    aggregated[:, 0] = values[starts, 0]
+    aggregated[:, 1] = np.maximum.reduceat(values[:, 1], starts)
+    aggregated[:, 2] = np.minimum.reduceat(values[:, 2], starts)
+    aggregated[:, 3] = values[ends, 3]
+    aggregated[:, 4] = np.add.reduceat(values[:, 4], starts)
+    return buckets[starts], aggregated
+
+class CandlePyramid:
+    """
+    기본 캔들 저장소 위의 상위 타임프레임 집계 레벨 (예: 1m -> 15m -> 4h -> 1d)
+    
+    update()는 변경된 첫 캔들이 속한 버킷부터만 다시 집계하므로, 실시간 틱이나
+    새 캔들 마감 시에는 레벨마다 마지막 한두 버킷만 갱신됨
+    """
+    
+    def __init__(self, base_timeframe, timeframes=PYRAMID_TIMEFRAMES):
+        self.base_timeframe = base_timeframe
+        base_ms = timeframe_to_ms(base_timeframe)
+        # 기본 타임프레임의 배수인 상위 타임프레임만 레벨로 사용
+        self.timeframes = [
+            tf for tf in timeframes
+            if base_ms and TIMEFRAME_MS[tf] > base_ms and TIMEFRAME_MS[tf] % base_ms == 0
+        ]
+        self.levels = {
+            tf: (np.empty(0, dtype=np.int64), np.empty((0, 5), dtype=float)) for tf in self.timeframes
+        }
+    
+    def rebuild(self, timestamps, values):
+        for tf in self.timeframes:
+            self.levels[tf] = aggregate_candles(timestamps, values, TIMEFRAME_MS[tf])
+    
+    def update(self, timestamps, values, first_changed):
+        """기본 캔들의 first_changed 인덱스 이후가 바뀌었을 때 해당 버킷부터 다시 집계"""
+        if first_changed is None:
+            return
+        if first_changed <= 0:
+            self.rebuild(timestamps, values)
+            return
+        changed_ts = timestamps[first_changed]
+        for tf in self.timeframes:
+            bucket_ms = TIMEFRAME_MS[tf]
+            bucket_start = changed_ts - changed_ts % bucket_ms
+            level_ts, level_values = self.levels[tf]
+            keep = np.searchsorted(level_ts, bucket_start)
+            base_start = np.searchsorted(timestamps, bucket_start)
+            tail_ts, tail_values = aggregate_candles(timestamps[base_start:], values[base_start:], bucket_ms)
+            self.levels[tf] = (
+                np.concatenate((level_ts[:keep], tail_ts)),
+                np.concatenate((level_values[:keep], tail_values)),
+            )
+    
+    def choose_timeframe(self, visible_ms, width_px, min_pixels):
+        """
+        보이는 구간 길이와 화면 폭에 맞는 레벨 선택
+        캔들당 픽셀이 min_pixels 이상이 되는 가장 낮은 해상도(가장 짧은 타임프레임)를 반환
+        (길이를 알 수 없는 기본 타임프레임이면 항상 기본 타임프레임)
+        """
+        base_ms = timeframe_to_ms(self.base_timeframe)
+        if visible_ms <= 0 or width_px <= 0 or base_ms is None:
+            return self.base_timeframe
+        for tf in [self.base_timeframe] + self.timeframes:
+            candles = visible_ms / (base_ms if tf == self.base_timeframe else TIMEFRAME_MS[tf])
+            if width_px / max(candles, 1) >= min_pixels:
+                return tf
+        return self.timeframes[-1] if self.timeframes else self.base_timeframe
@@ -0,0 +1,142 @@
+"""
+OHLCV 캔들을 타임스탬프 순 NumPy 배열로 보관하는 캔들 저장소를 정의하는 모듈
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.candle_pyramid import CandlePyramid
+
+CANDLE_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+def frame_to_rows(df):
+    """fetch_ohlcv() 형식의 DataFrame을 [ts(ms), o, h, l, c, v] 배열로 변환"""
+    if df is None or df.empty:
+        return np.empty((0, 6), dtype=float)
+    rows = np.empty((len(df), 6), dtype=float)
+    rows[:, 0] = df['timestamp'].to_numpy().astype('datetime64[ms]').astype(np.int64)
+    for i, col in enumerate(CANDLE_COLUMNS[1:], start=1):
+        rows[:, i] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+    return rows
+
+def rows_to_frame(rows):
+    """ccxt 형식 캔들 리스트([[ts(ms), o, h, l, c, v], ...])를 fetch_ohlcv()와 같은 형식의 DataFrame으로 변환"""
+    df = pd.DataFrame(rows, columns=CANDLE_COLUMNS)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    for col in CANDLE_COLUMNS[1:]:
+        df[col] = pd.to_numeric(df[col])
+    return df.sort_values(by='timestamp').reset_index(drop=True)
+
+class CandleStore:
+    """
+    타임스탬프(ms) 오름차순으로 정렬된 캔들 배열 저장소
+    
+    timestamps: int64 배열, values: (N, 5) float 배열 (open, high, low, close, volume)
+    upsert()는 ccxt 형식 캔들 리스트 전체를 한 번에 병합하며, 변경될 때마다 version이 증가함
+    enable_pyramid()를 호출하면 변경 시마다 상위 타임프레임 집계(CandlePyramid)도 증분 갱신함
+    """
+    
+    def __init__(self):
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0, 5), dtype=float)
+        self.version = 0
+        self.pyramid = None
+    
+    def enable_pyramid(self, base_timeframe):
+        """기본 타임프레임에 맞는 다중 해상도 피라미드 생성 (현재 데이터로 즉시 집계)"""
+        self.pyramid = CandlePyramid(base_timeframe)
+        self.pyramid.rebuild(self.timestamps, self.values)
+    
+    def __len__(self):
+        return len(self.timestamps)
+    
+    @property
+    def last_timestamp(self):
+        return int(self.timestamps[-1]) if len(self.timestamps) else None
+    
+    @property
+    def first_timestamp(self):
+        return int(self.timestamps[0]) if len(self.timestamps) else None
+    
+    @property
+    def nbytes(self):
+        """캔들 배열과 피라미드 레벨 배열의 메모리 사용량 (바이트)"""
+        total = self.timestamps.nbytes + self.values.nbytes
+        if self.pyramid:
+            total += sum(ts.nbytes + values.nbytes for ts, values in self.pyramid.levels.values())
+        return total
+    
+    def clear(self):
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0, 5), dtype=float)
+        self.version += 1
+        if self.pyramid:
+            self.pyramid.rebuild(self.timestamps, self.values)
+    
+    def replace_frame(self, df):
+        """저장소 내용을 DataFrame 데이터로 교체"""
+        self.clear()
+        self.upsert(frame_to_rows(df))
+    
+    @staticmethod
+    def _normalize(rows):
+        """입력 캔들을 타임스탬프 순으로 정렬하고 배치 내 중복 타임스탬프는 마지막 값만 유지"""
+        batch = np.asarray(rows, dtype=float).reshape(-1, 6)
+        timestamps = batch[:, 0].astype(np.int64)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps = timestamps[order]
+        batch = batch[order]
+        keep = np.ones(len(timestamps), dtype=bool)
+        keep[:-1] = timestamps[1:] != timestamps[:-1]
+        return timestamps[keep], batch[keep, 1:]
+    
+    def upsert(self, rows):
+        """
+        캔들 배치를 타임스탬프 기준으로 병합 (벡터화)
+        
+        Parameters:
+        rows (list | numpy.ndarray): [[timestamp(ms), open, high, low, close, volume], ...] (순서 무관)
+        
+        Returns:
+        int | None: 변경된 첫 행의 인덱스 (변경이 없으면 None)
+        """
+        if rows is None or len(rows) == 0:
+            return None
+        timestamps, values = self._normalize(rows)
+        
+        positions = np.searchsorted(self.timestamps, timestamps)
+        in_range = positions < len(self.timestamps)
+        exists = np.zeros(len(timestamps), dtype=bool)
+        exists[in_range] = self.timestamps[positions[in_range]] == timestamps[in_range]
+        
+        # 기존 타임스탬프는 제자리에서 갱신
+        self.values[positions[exists]] = values[exists]
+        
+        # 새 타임스탬프는 정렬 위치에 삽입 (위치는 삽입 전 배열 기준)
+        new = ~exists
+        if new.any():
+            self.timestamps = np.insert(self.timestamps, positions[new], timestamps[new])
+            self.values = np.insert(self.values, positions[new], values[new], axis=0)
+        
+        self.version += 1
+        first_changed = int(positions.min())
+        if self.pyramid:
+            self.pyramid.update(self.timestamps, self.values, first_changed)
+        return first_changed
+    
+    def keep_range(self, start, stop):
+        """인덱스 [start, stop) 구간만 남기고 나머지 캔들 제거 (메모리 제한용)"""
+        start, stop = max(start, 0), min(stop, len(self.timestamps))
+        if start == 0 and stop == len(self.timestamps):
+            return
+        self.timestamps = self.timestamps[start:stop].copy()
+        self.values = self.values[start:stop].copy()
+        self.version += 1
+        if self.pyramid:
+            self.pyramid.rebuild(self.timestamps, self.values)
+    
+    def to_frame(self):
+        """fetch_ohlcv()와 같은 형식의 DataFrame 생성"""
+        df = pd.DataFrame(self.values, columns=CANDLE_COLUMNS[1:])
+        df.insert(0, 'timestamp', pd.to_datetime(self.timestamps, unit='ms'))
+        return df
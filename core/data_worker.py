@@ -10,9 +10,13 @@ import pandas as pd
 from PyQt6.QtCore import pyqtSignal, QObject, QThread
 import traceback
 
+from config.settings import WORKER_CLOSE_TIMEOUT
+from utils.latency import CandleBatch
+
 # WorkerSignals class to emit signals from the WebSocket thread
 class WorkerSignals(QObject):
-    new_data = pyqtSignal(list)
+    new_data = pyqtSignal(object) # list of candle rows (utils.latency.CandleBatch carries trace timestamps)
+    trades = pyqtSignal(object) # (timestamps, prices, amounts, is_buy) 배열 - 체결 워커만 사용
     error = pyqtSignal(str)
     finished = pyqtSignal() # Ensure finished is defined once properly
 
@@ -24,16 +28,28 @@ class Worker(QObject):
         self.timeframe = timeframe
         self.signals = WorkerSignals()
         self._is_running = False # Controlled by start_streaming and stop
+        self._stop_requested = False # stop()이 start_streaming보다 먼저 호출된 경우를 위한 플래그
         self.loop = None # asyncio event loop for this thread
+        self._task = None # 실행 중인 스트리밍 태스크 (stop()에서 취소)
 
     def start_streaming(self):
-        self._is_running = True
         thread_id = threading.get_ident()
         print(f"Worker.start_streaming called for {self.symbol} in thread {thread_id}")
+        if self._stop_requested:
+            print(f"Worker for {self.symbol} was stopped before streaming started.")
+            self.signals.finished.emit()
+            return
+        self._is_running = True
         try:
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
-            self.loop.run_until_complete(self.watch_ohlcv_loop_async())
+            self._task = self.loop.create_task(self.stream_async())
+            if self._stop_requested:
+                # 태스크 생성 직전에 stop()이 호출된 경우
+                self._task.cancel()
+            self.loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            print(f"Streaming task for {self.symbol} in thread {thread_id} was cancelled by stop().")
         except Exception as e:
             # Catching broad Exception here to ensure any loop setup error is reported
             error_msg = f"Error in Worker.start_streaming for {self.symbol} in thread {thread_id}: {type(e).__name__} - {e}"
@@ -42,6 +58,8 @@ class Worker(QObject):
             self.signals.error.emit(error_msg)
         finally:
             # This finally block executes after run_until_complete finishes or if an exception occurs in the try block.
+            self._is_running = False
+            self._task = None
             if self.loop and not self.loop.is_closed():
                 print(f"Closing asyncio event loop for {self.symbol} in thread {thread_id} (start_streaming finally block).")
                 self.loop.close()
@@ -51,6 +69,15 @@ class Worker(QObject):
             print(f"Worker for {self.symbol} in thread {thread_id} emitting finished signal from start_streaming.")
             self.signals.finished.emit()
 
+    async def stream_async(self):
+        """워커 스레드의 이벤트 루프에서 실행되는 스트리밍 코루틴 (하위 클래스에서 교체 가능)"""
+        await self.watch_ohlcv_loop_async()
+
+    async def close_exchange_async(self):
+        """거래소 WebSocket 연결 종료 (시간 제한 적용)"""
+        if hasattr(self.exchange, 'close') and callable(self.exchange.close):
+            await asyncio.wait_for(self.exchange.close(), timeout=WORKER_CLOSE_TIMEOUT)
+
     async def watch_ohlcv_loop_async(self):
         thread_id = threading.get_ident()
         print(f"Starting watch_ohlcv_loop_async for {self.symbol} on {self.timeframe} in thread {thread_id}")
@@ -83,7 +110,7 @@ class Worker(QObject):
                     ohlcv_list = await self.exchange.watch_ohlcv(self.symbol, self.timeframe)
                     if self._is_running and ohlcv_list: 
                         # print(f"WebSocket ({self.symbol}): Received {len(ohlcv_list)} candle(s).")
-                        self.signals.new_data.emit(ohlcv_list) 
+                        self.signals.new_data.emit(CandleBatch(ohlcv_list)) # ccxt does not expose the event time
                     elif self._is_running and not self.exchange.is_connected():
                         print(f"Exchange {self.exchange.id} is not connected for {self.symbol} in thread {thread_id}. Stopping worker.")
                         self.signals.error.emit(f"Exchange not connected for {self.symbol}")
@@ -132,10 +159,9 @@ class Worker(QObject):
             print(f"watch_ohlcv_loop_async for {self.symbol} in thread {thread_id} entering finally block. _is_running: {self._is_running}")
             try:
                 # This check is important: exchange might be None or already closed by another path
-                if hasattr(self.exchange, 'close') and callable(self.exchange.close):
-                    print(f"Attempting to close exchange ({self.symbol}) from watch_ohlcv_loop_async finally block (thread {thread_id}).")
-                    await self.exchange.close() # Ensure ccxt.pro cleans up its WebSocket
-                    print(f"Exchange ({self.symbol}) closed successfully in watch_ohlcv_loop_async (thread {thread_id}).")
+                print(f"Attempting to close exchange ({self.symbol}) from watch_ohlcv_loop_async finally block (thread {thread_id}).")
+                await self.close_exchange_async() # Ensure ccxt.pro cleans up its WebSocket
+                print(f"Exchange ({self.symbol}) closed successfully in watch_ohlcv_loop_async (thread {thread_id}).")
             except Exception as e_close:
                 close_error_msg = f"Error closing exchange for {self.symbol} in watch_ohlcv_loop_async (thread {thread_id}): {type(e_close).__name__} - {e_close}"
                 print(close_error_msg)
@@ -145,16 +171,23 @@ class Worker(QObject):
             print(f"Exited watch_ohlcv_loop_async for {self.symbol} in thread {thread_id}.")
 
     def stop(self):
+        """
+        스트리밍 정지 (GUI 스레드에서 호출 가능)
+        대기 중인 watch 태스크를 워커의 이벤트 루프에서 스레드 안전하게 취소하므로,
+        다음 메시지를 기다리지 않고 곧바로 거래소 연결을 닫고 종료함
+        """
         thread_id = threading.get_ident()
         print(f"Worker.stop called for {self.symbol} in thread {thread_id}. Current _is_running: {self._is_running}")
-        if self._is_running:
-            self._is_running = False
-            # The watch_ohlcv_loop_async will see _is_running as False and exit,
-            # then its finally block will close the exchange.
-            # The asyncio loop itself will be closed by start_streaming's finally block.
-            print(f"_is_running set to False for {self.symbol} in thread {thread_id}. Loop should terminate gracefully.")
+        self._stop_requested = True
+        self._is_running = False
+        
+        loop, task = self.loop, self._task
+        if loop is not None and task is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+                print(f"Cancellation of the streaming task for {self.symbol} scheduled on its event loop.")
+            except RuntimeError:
+                # 확인 직후 루프가 닫힌 경우 - 이미 종료 중
+                pass
         else:
             print(f"Worker for {self.symbol} in thread {thread_id} was already stopped or not started.")
-        # Note: Do not try to directly manipulate or stop self.loop here.
-        # Let it finish naturally through run_until_complete in start_streaming.
-        print(f"Worker.stop for {self.symbol} in thread {thread_id} finished processing flag.") 
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+호가창 깊이를 가격 구간별로 집계해 고정 크기 링 버퍼에 보관하는 모듈
+"""
+
+import numpy as np
+
+class DepthRing:
+    """
+    시간 x 가격 구간 호가 잔량 링 버퍼 (히트맵용)
+    
+    - sample_ms마다 열 하나를 쓰며, 같은 구간 안의 스냅샷은 현재 열을 덮어씀
+    - 시각 구간 slot의 열은 항상 slot % columns 위치에 기록하고, 링을 tile_columns개 열씩 타일로 나눔
+      타일 하나는 연속된 시각 구간을 담으므로 화면에서는 타일마다 이미지 하나를 두고,
+      새 열이 기록된 타일(take_dirty_tiles())만 다시 올리면 됨
+    - 가격 구간은 첫 스냅샷의 중간가 기준으로 정하고, 중간가가 가운데 절반을 벗어나면 다시 정렬함
+      (이때는 모든 열이 이동하므로 모든 타일이 갱신 대상이 됨)
+    - 값은 log1p(잔량)으로 저장해 표시할 때 별도 변환이 필요 없음
+    """
+    
+    def __init__(self, columns, rows, step_ratio, sample_ms, tile_columns=60):
+        if columns % tile_columns:
+            raise ValueError(f"columns ({columns}) must be a multiple of tile_columns ({tile_columns})")
+        self.columns = columns
+        self.rows = rows
+        self.step_ratio = step_ratio
+        self.sample_ms = sample_ms
+        self.tile_columns = tile_columns
+        self.buffer = np.zeros((columns, rows), dtype=np.float32)
+        self.head = None  # 최신 열 위치 (last_slot % columns)
+        self.last_slot = None
+        self.price_step = None
+        self.base_bucket = None
+        self._dirty = set()
+    
+    @property
+    def tile_count(self):
+        return self.columns // self.tile_columns
+    
+    def _write_column(self, column):
+        self.buffer[self.head] = column
+        self._dirty.add(self.head // self.tile_columns)
+    
+    def _mark_all_dirty(self):
+        self._dirty.update(range(self.tile_count))
+    
+    def _advance(self, count):
+        """새 열로 이동 (건너뛴 구간은 빈 열로 채움)"""
+        if count >= self.columns:
+            self.buffer[:] = 0
+            self.head = (self.head + count) % self.columns
+            self._mark_all_dirty()
+            return
+        empty = np.zeros(self.rows, dtype=np.float32)
+        for _ in range(count):
+            self.head = (self.head + 1) % self.columns
+            self._write_column(empty)
+    
+    def _recenter(self, mid_bucket):
+        """가격 구간 기준을 중간가 중심으로 이동 (기존 열도 같은 가격에 맞게 이동)"""
+        new_base = mid_bucket - self.rows // 2
+        shift = new_base - self.base_bucket
+        if abs(shift) >= self.rows:
+            self.buffer[:] = 0
+        elif shift > 0:
+            self.buffer[:, :-shift] = self.buffer[:, shift:]
+            self.buffer[:, -shift:] = 0
+        elif shift < 0:
+            self.buffer[:, -shift:] = self.buffer[:, :shift]
+            self.buffer[:, :-shift] = 0
+        self.base_bucket = new_base
+        self._mark_all_dirty()
+    
+    def add_snapshot(self, timestamp, bids, asks):
+        """
+        호가 스냅샷 반영
+        
+        Parameters:
+        timestamp (int): 스냅샷 시각 (ms)
+        bids, asks (numpy.ndarray): [[price, amount], ...] 배열
+        
+        Returns:
+        bool: 반영 여부 (이미 지난 구간의 스냅샷이면 False)
+        """
+        if len(bids) == 0 or len(asks) == 0:
+            return False
+        slot = int(timestamp) // self.sample_ms
+        if self.last_slot is not None and slot < self.last_slot:
+            return False
+        
+        mid = (bids[0, 0] + asks[0, 0]) / 2
+        if self.price_step is None:
+            self.price_step = mid * self.step_ratio
+            self.base_bucket = int(mid // self.price_step) - self.rows // 2
+        mid_bucket = int(mid // self.price_step)
+        if not self.rows // 4 <= mid_bucket - self.base_bucket < 3 * self.rows // 4:
+            self._recenter(mid_bucket)
+        
+        levels = np.concatenate((bids, asks))
+        index = (levels[:, 0] // self.price_step).astype(np.int64) - self.base_bucket
+        inside = (index >= 0) & (index < self.rows)
+        column = np.bincount(index[inside], weights=levels[inside, 1], minlength=self.rows)
+        
+        if self.last_slot is None:
+            self.head = slot % self.columns
+        elif slot > self.last_slot:
+            self._advance(slot - self.last_slot)
+        self.last_slot = slot
+        self._write_column(np.log1p(column).astype(np.float32))
+        return True
+    
+    def latest_column(self):
+        return self.buffer[self.head]
+    
+    def take_dirty_tiles(self):
+        """마지막 호출 이후 내용이 바뀐 타일 번호 목록 (호출하면 비워짐)"""
+        dirty, self._dirty = sorted(self._dirty), set()
+        return dirty
+    
+    def tile(self, index):
+        """
+        타일 하나의 열 배열과 배치 위치
+        
+        최신 열이 있는 타일은 최신 열까지만 반환함 (그 뒤의 열은 한 바퀴 전의 가장 오래된 데이터이므로 표시하지 않음)
+        
+        Returns:
+        tuple: ((열 수, rows) 배열 뷰, (시작 시각(초), 최저 가격, 폭(초), 높이)) - 아직 스냅샷이 없으면 None
+        """
+        if self.last_slot is None:
+            return None
+        first = index * self.tile_columns
+        # 이 타일 위치에 가장 최근에 기록된 바퀴의 시작 시각 구간
+        start_slot = self.last_slot - (self.last_slot - first) % self.columns
+        count = self.head - first + 1 if self.head // self.tile_columns == index else self.tile_columns
+        rect = (start_slot * self.sample_ms / 1000, self.base_bucket * self.price_step,
+                count * self.sample_ms / 1000, self.rows * self.price_step)
+        return self.buffer[first:first + count], rect
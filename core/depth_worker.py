@@ -0,0 +1,83 @@
+"""
+watch_order_book 호가 스트림을 받아 스냅샷을 전달하는 워커를 정의하는 모듈
+"""
+
+import asyncio
+import threading
+import time
+import traceback
+import ccxt
+import numpy as np
+
+from core.data_worker import Worker
+from config.settings import DEPTH_BOOK_LIMIT, DEPTH_EMIT_INTERVAL_MS
+
+def book_side_array(levels):
+    """ccxt 호가 한쪽 ([[price, amount, ...], ...]) -> (N, 2) 배열"""
+    if not levels:
+        return np.empty((0, 2), dtype=float)
+    return np.asarray([level[:2] for level in levels], dtype=float)
+
+class DepthWorker(Worker):
+    """
+    호가 스냅샷 워커
+    Worker와 같은 시그널/정지 방식을 사용하며, DEPTH_EMIT_INTERVAL_MS마다 최대 한 번
+    {'symbol', 'timestamp', 'bids', 'asks'} (NumPy 배열) 딕셔너리를 new_data로 보냄
+    """
+    
+    def __init__(self, exchange, symbol, limit=DEPTH_BOOK_LIMIT):
+        super().__init__(exchange, symbol, None)
+        self.limit = limit
+    
+    async def stream_async(self):
+        await self.watch_order_book_loop_async()
+    
+    async def watch_order_book_loop_async(self):
+        thread_id = threading.get_ident()
+        print(f"Starting watch_order_book_loop_async for {self.symbol} in thread {thread_id}")
+        last_emit = 0.0
+        try:
+            if not self.exchange or not self.exchange.has.get('watchOrderBook'):
+                error_msg = "ccxtpro exchange object not initialized or does not support watch_order_book."
+                print(f"ERROR: {error_msg}")
+                self.signals.error.emit(error_msg)
+                return
+            
+            while self._is_running:
+                try:
+                    book = await self.exchange.watch_order_book(self.symbol, self.limit)
+                    now = time.time()
+                    if not self._is_running or (now - last_emit) * 1000 < DEPTH_EMIT_INTERVAL_MS:
+                        continue
+                    last_emit = now
+                    self.signals.new_data.emit({
+                        'symbol': self.symbol,
+                        'timestamp': book.get('timestamp') or int(now * 1000),
+                        'bids': book_side_array(book['bids']),
+                        'asks': book_side_array(book['asks']),
+                    })
+                except asyncio.CancelledError:
+                    print(f"watch_order_book_loop_async for {self.symbol} in thread {thread_id} was cancelled.")
+                    self._is_running = False
+                    break
+                except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+                    if not self._is_running:
+                        break
+                    error_msg = f"{type(e).__name__} in watch_order_book_loop_async ({self.symbol}): {e}"
+                    print(f"WARNING: {error_msg}")
+                    self.signals.error.emit(error_msg)
+                    await asyncio.sleep(5)
+                except Exception as e:
+                    if self._is_running:
+                        error_msg = f"Error in watch_order_book_loop_async ({self.symbol}, thread {thread_id}): {type(e).__name__} - {e}"
+                        print(error_msg)
+                        traceback.print_exc()
+                        self.signals.error.emit(error_msg)
+                        self._is_running = False
+                    break
+        finally:
+            try:
+                await self.close_exchange_async()
+            except Exception as e_close:
+                print(f"Error closing exchange for {self.symbol} in watch_order_book_loop_async: {type(e_close).__name__} - {e_close}")
+            print(f"Exited watch_order_book_loop_async for {self.symbol} in thread {thread_id}.")
@@ -2,23 +2,34 @@
 거래소 연결 및 데이터 요청을 관리하는 모듈
 """
 
+import threading
 import ccxt
 import ccxt.pro as ccxtpro
 import traceback
+from concurrent.futures import Future
 import pandas as pd
+from core.request_scheduler import (
+    RequestScheduler, RestResponse, PRIORITY_INTERACTIVE, PRIORITY_POLL, kline_weight
+)
 from config.settings import DEFAULT_EXCHANGE_ID
 
 class ExchangeManager:
     """
     거래소 연결 및 데이터 요청을 관리하는 클래스
     REST API 및 WebSocket 연결을 모두 처리
+    모든 REST 요청은 RequestScheduler를 거쳐 우선순위/요청 가중치에 따라 실행됨
+    (스케줄러 스레드마다 마켓 정보를 공유하는 별도 ccxt 인스턴스를 사용해 요청별 응답 헤더를 분리함)
     """
     
-    def __init__(self, exchange_id=DEFAULT_EXCHANGE_ID):
+    def __init__(self, exchange_id=DEFAULT_EXCHANGE_ID, connect=True):
         self.exchange_id = exchange_id
         self.rest_exchange = None
         self.ws_exchange = None
-        self.init_exchanges()
+        self.scheduler = RequestScheduler()
+        self._thread_local = threading.local()
+        # connect=False이면 호출한 쪽에서 init_exchanges()를 (백그라운드 스레드 등에서) 직접 호출
+        if connect:
+            self.init_exchanges()
     
     def init_exchanges(self):
         """REST 및 WebSocket 거래소 객체 초기화"""
@@ -54,14 +65,14 @@ class ExchangeManager:
             traceback.print_exc()
             self.ws_exchange = None
     
-    def fetch_ohlcv(self, symbol, timeframe, limit=500):
+    def fetch_ohlcv(self, symbol, timeframe, limit=500, priority=PRIORITY_INTERACTIVE):
         """REST API를 사용하여 OHLCV 데이터 가져오기"""
         if not self.rest_exchange:
             print("ERROR: REST exchange not initialized for fetch_ohlcv.")
             return None
         
         try:
-            ohlcv = self.rest_exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            ohlcv = self.submit_ohlcv_rows(symbol, timeframe, limit, priority=priority).result()
             if ohlcv:
                 df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
                 df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
@@ -77,6 +88,81 @@ class ExchangeManager:
             traceback.print_exc()
             return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
     
+    def submit_ohlcv_rows(self, symbol, timeframe, limit=500, since=None, priority=PRIORITY_POLL):
+        """
+        OHLCV 요청을 스케줄러에 넣고 Future 반환
+        같은 (심볼, 타임프레임, since, limit) 요청이 이미 대기/실행 중이면 그 Future를 공유함
+        (REST 거래소가 초기화되지 않았으면 예외가 설정된 Future 반환)
+        """
+        if not self.rest_exchange:
+            future = Future()
+            future.response_headers = None
+            future.set_exception(RuntimeError("REST exchange not initialized for submit_ohlcv_rows."))
+            return future
+        key = ('ohlcv', symbol, timeframe, since, limit)
+        return self.scheduler.submit(
+            key, self._call_rest, 'fetch_ohlcv', symbol, timeframe,
+            since=since, limit=limit, priority=priority, weight=kline_weight(limit)
+        )
+    
+    def fetch_ohlcv_rows(self, symbol, timeframe, limit=500, since=None, priority=PRIORITY_POLL):
+        """REST API로 OHLCV를 ccxt 원본 리스트 형식([[ts, o, h, l, c, v], ...])으로 가져오기"""
+        if not self.rest_exchange:
+            print("ERROR: REST exchange not initialized for fetch_ohlcv_rows.")
+            return []
+        return self.submit_ohlcv_rows(symbol, timeframe, limit, since, priority).result() or []
+    
+    def _thread_rest_exchange(self):
+        """현재 스케줄러 스레드 전용 REST 거래소 인스턴스 (마켓 정보는 초기화된 인스턴스와 공유)"""
+        exchange = getattr(self._thread_local, 'exchange', None)
+        if exchange is None:
+            exchange = getattr(ccxt, self.exchange_id)({
+                'options': { 'defaultType': 'future', },
+            })
+            exchange.set_markets(self.rest_exchange.markets, self.rest_exchange.currencies)
+            self._thread_local.exchange = exchange
+        return exchange
+    
+    def _call_rest(self, method, *args, **kwargs):
+        """
+        스케줄러 스레드에서 실행: 이 스레드의 인스턴스로 요청하고 그 응답 헤더를 결과와 함께 반환
+        (실패하면 예외의 response_headers에 헤더를 남김)
+        """
+        exchange = self._thread_rest_exchange()
+        exchange.last_response_headers = None
+        try:
+            result = getattr(exchange, method)(*args, **kwargs)
+        except Exception as e:
+            e.response_headers = dict(exchange.last_response_headers or {})
+            raise
+        return RestResponse(result, dict(exchange.last_response_headers or {}))
+    
+    def fetch_recent_trades(self, symbol, limit=1000, priority=PRIORITY_INTERACTIVE):
+        """최근 체결 목록 (초 단위 캔들 초기화용, aggTrades 요청 가중치 20)"""
+        if not self.rest_exchange:
+            print("ERROR: REST exchange not initialized for fetch_recent_trades.")
+            return []
+        future = self.scheduler.submit(
+            ('trades', symbol, limit), self._call_rest, 'fetch_trades', symbol,
+            limit=limit, priority=priority, weight=20
+        )
+        return future.result() or []
+    
+    def get_usdm_symbols(self):
+        """로드된 시장 정보에서 거래 중인 USDT 마진 무기한 선물 심볼 목록 반환"""
+        if not self.rest_exchange or not self.rest_exchange.markets:
+            return self.get_supported_symbols()
+        symbols = [
+            market['symbol'] for market in self.rest_exchange.markets.values()
+            if market.get('swap') and market.get('linear') and market.get('quote') == 'USDT'
+            and market.get('active', True)
+        ]
+        return sorted(symbols)
+    
+    def shutdown(self):
+        """REST 요청 스케줄러 종료"""
+        self.scheduler.shutdown()
+    
     def create_ws_exchange(self):
         """새로운 WebSocket 거래소 인스턴스 생성"""
         try:
@@ -0,0 +1,96 @@
+"""
+차트를 이동할 때 과거/이후 캔들 페이지를 백그라운드에서 불러오는 모듈
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import traceback
+import ccxt
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.history_store import HistoryStore, is_contiguous
+from core.request_scheduler import PRIORITY_BACKFILL
+from core.trade_aggregator import TRADE_TIMEFRAMES
+from config.settings import HISTORY_DB_PATH, HISTORY_PAGE_SIZE
+
+class HistorySignals(QObject):
+    page_ready = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class HistoryLoader:
+    """
+    이력 페이지 로더
+    로컬 이력 저장소에 빈틈 없는 페이지가 있으면 그것을 사용하고, 없으면 요청 스케줄러를 통해
+    백필 우선순위로 REST에서 받아 저장소에 저장함. 결과는 page_ready 시그널로 GUI 스레드에 전달됨.
+    체결 집계 타임프레임(1s/5s/15s)은 거래소 kline이 없으므로 로컬 저장소에 있는 만큼만 반환함.
+    """
+    
+    def __init__(self, exchange_manager, path=HISTORY_DB_PATH, page_size=HISTORY_PAGE_SIZE):
+        self.exchange_manager = exchange_manager
+        self.page_size = page_size
+        self.signals = HistorySignals()
+        self.store = HistoryStore(path, exchange_manager.exchange_id)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='history')
+    
+    def request_page(self, symbol, timeframe, anchor, direction):
+        """
+        anchor(ms) 이전('older') 또는 이후('newer') 페이지 요청
+        
+        page_ready로 전달되는 딕셔너리: symbol, timeframe, direction, anchor, rows, source
+        """
+        self._executor.submit(self._load_page, symbol, timeframe, anchor, direction)
+    
+    def save_closed(self, symbol, timeframe, rows):
+        """마감된 캔들을 백그라운드에서 저장소에 기록"""
+        self._executor.submit(self._save, symbol, timeframe, rows)
+    
+    def _save(self, symbol, timeframe, rows):
+        try:
+            self.store.save(symbol, timeframe, rows)
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(f"이력 저장 오류: {e}")
+    
+    def _load_page(self, symbol, timeframe, anchor, direction):
+        try:
+            timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+            limit = self.page_size
+            if direction == 'older':
+                rows = self.store.load_before(symbol, timeframe, anchor, limit)
+                local_ok = len(rows) == limit and is_contiguous(rows, timeframe_ms, last=anchor - timeframe_ms)
+                since = anchor - limit * timeframe_ms
+            else:
+                rows = self.store.load_after(symbol, timeframe, anchor, limit)
+                local_ok = len(rows) == limit and is_contiguous(rows, timeframe_ms, first=anchor + timeframe_ms)
+                since = anchor + timeframe_ms
+            
+            source = 'local'
+            if not local_ok and timeframe not in TRADE_TIMEFRAMES:
+                source = 'rest'
+                rows = self.exchange_manager.fetch_ohlcv_rows(
+                    symbol, timeframe, limit, since=since, priority=PRIORITY_BACKFILL
+                )
+                # 진행 중인 캔들은 저장하지 않음
+                closed = [row for row in rows if row[0] + timeframe_ms <= self.exchange_manager.rest_exchange.milliseconds()]
+                self.store.save(symbol, timeframe, closed)
+                if direction == 'older':
+                    rows = [row for row in rows if row[0] < anchor]
+            
+            self.signals.page_ready.emit({
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'direction': direction,
+                'anchor': anchor,
+                'rows': rows,
+                'source': source,
+            })
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(f"이력 로드 오류: {type(e).__name__} - {e}")
+            self.signals.page_ready.emit({
+                'symbol': symbol, 'timeframe': timeframe, 'direction': direction,
+                'anchor': anchor, 'rows': [], 'source': 'error',
+            })
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.store.close()
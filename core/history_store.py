@@ -0,0 +1,81 @@
+"""
+마감된 캔들을 SQLite에 보관하는 로컬 이력 저장소를 정의하는 모듈
+"""
+
+import os
+import sqlite3
+import threading
+import numpy as np
+
+class HistoryStore:
+    """
+    (거래소, 심볼, 타임프레임, 타임스탬프) 기준 캔들 이력 저장소
+    마감된 캔들만 저장해야 하며 (진행 중 캔들은 값이 계속 바뀜), 같은 타임스탬프는 덮어씀
+    """
+    
+    def __init__(self, path, exchange_id):
+        self.path = path
+        self.exchange_id = exchange_id
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS candles ("
+                "exchange TEXT NOT NULL, symbol TEXT NOT NULL, timeframe TEXT NOT NULL, ts INTEGER NOT NULL, "
+                "open REAL, high REAL, low REAL, close REAL, volume REAL, "
+                "PRIMARY KEY (exchange, symbol, timeframe, ts)) WITHOUT ROWID"
+            )
+            self._conn.commit()
+    
+    def save(self, symbol, timeframe, rows):
+        """[[ts(ms), o, h, l, c, v], ...] 캔들 저장"""
+        if rows is None or len(rows) == 0:
+            return
+        records = [
+            (self.exchange_id, symbol, timeframe, int(row[0]), *map(float, row[1:6]))
+            for row in rows
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+            self._conn.commit()
+    
+    def _query(self, sql, params):
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return np.asarray(rows, dtype=float).reshape(-1, 6)
+    
+    def load_before(self, symbol, timeframe, before, limit):
+        """before(ms) 이전의 최근 캔들 limit개 (타임스탬프 오름차순)"""
+        rows = self._query(
+            "SELECT ts, open, high, low, close, volume FROM candles "
+            "WHERE exchange = ? AND symbol = ? AND timeframe = ? AND ts < ? ORDER BY ts DESC LIMIT ?",
+            (self.exchange_id, symbol, timeframe, int(before), int(limit))
+        )
+        return rows[::-1]
+    
+    def load_after(self, symbol, timeframe, after, limit):
+        """after(ms) 이후의 캔들 limit개 (타임스탬프 오름차순)"""
+        return self._query(
+            "SELECT ts, open, high, low, close, volume FROM candles "
+            "WHERE exchange = ? AND symbol = ? AND timeframe = ? AND ts > ? ORDER BY ts ASC LIMIT ?",
+            (self.exchange_id, symbol, timeframe, int(after), int(limit))
+        )
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def is_contiguous(rows, timeframe_ms, first=None, last=None):
+    """캔들 배열이 빈틈 없이 이어지는지 (선택적으로 시작/끝 타임스탬프까지) 확인"""
+    if len(rows) == 0:
+        return False
+    timestamps = rows[:, 0].astype(np.int64)
+    if first is not None and timestamps[0] != first:
+        return False
+    if last is not None and timestamps[-1] != last:
+        return False
+    return bool(np.all(np.diff(timestamps) == timeframe_ms))
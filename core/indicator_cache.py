@@ -0,0 +1,161 @@
+"""
+지표 계산 결과를 메모리 예산 내에서 재사용하는 LRU 캐시를 정의하는 모듈
+"""
+
+from collections import OrderedDict
+import threading
+import zlib
+import numpy as np
+
+from utils.calculations import ComputationContext
+from config.settings import INDICATOR_CACHE_MAX_BYTES
+
+def data_version(columns):
+    """입력 배열의 데이터 버전 (길이, 첫/마지막 시각, 내용 체크섬)"""
+    times = columns['time_axis_val']
+    if len(times) == 0:
+        return (0,)
+    checksum = 0
+    for name in sorted(columns):
+        checksum = zlib.crc32(np.ascontiguousarray(columns[name]).tobytes(), checksum)
+    return (len(times), float(times[0]), float(times[-1]), checksum)
+
+def _reusable_prefix(old_columns, new_columns, names):
+    """
+    이전 입력과 새 입력을 타임스탬프 기준으로 정렬하여 재사용 가능한 구간 계산
+    
+    Returns:
+    tuple: (offset, unchanged) - 새 데이터의 첫 캔들이 이전 데이터의 offset 위치에 있고,
+           새 데이터의 앞 unchanged개 캔들이 이전과 동일함. 정렬할 수 없으면 (0, 0)
+    """
+    old_times = old_columns['time_axis_val']
+    new_times = new_columns['time_axis_val']
+    if len(old_times) == 0 or len(new_times) == 0:
+        return 0, 0
+    offset = int(np.searchsorted(old_times, new_times[0]))
+    if offset >= len(old_times) or old_times[offset] != new_times[0]:
+        return 0, 0
+    overlap = min(len(old_times) - offset, len(new_times))
+    differs = np.zeros(overlap, dtype=bool)
+    for name in names:
+        differs |= old_columns[name][offset:offset + overlap] != new_columns[name][:overlap]
+    unchanged = int(np.argmax(differs)) if differs.any() else overlap
+    return offset, unchanged
+
+class _CacheEntry:
+    def __init__(self, version, columns, outputs):
+        self.version = version
+        self.columns = columns
+        self.outputs = outputs
+        self.nbytes = (sum(arr.nbytes for arr in columns.values()) +
+                       sum(arr.nbytes for arr in outputs.values()))
+
+class IndicatorCache:
+    """
+    (심볼, 타임프레임, 지표, 파라미터) 시리즈별 지표 결과 캐시
+    
+    각 항목은 계산에 사용된 입력 배열과 데이터 버전을 함께 보관함.
+    데이터 버전이 같으면 저장된 결과를 그대로 반환하고, 실시간 틱처럼 앞부분이 같은
+    데이터라면 lookback이 선언된 지표에 한해 바뀐 꼬리 구간만 다시 계산함.
+    항목 크기의 합이 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거함.
+    """
+    
+    def __init__(self, max_bytes=INDICATOR_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(symbol, timeframe, name, params):
+        return (symbol, timeframe, name, tuple(sorted(params.items())))
+    
+    @property
+    def nbytes(self):
+        return self._bytes
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def get_or_compute(self, symbol, timeframe, spec, params, columns, contexts):
+        """
+        캐시된 결과를 반환하거나 필요한 구간만 계산하여 저장
+        
+        Parameters:
+        symbol (str), timeframe (str): 시리즈 식별자
+        spec (IndicatorSpec): 레지스트리 지표 정의
+        params (dict): resolve_params()로 확정된 파라미터
+        columns (dict): 'time_axis_val'과 지표 입력 컬럼을 포함한 읽기 전용 배열
+        contexts (dict): 시작 인덱스 -> ComputationContext (같은 요청의 지표들이 중간값 공유)
+        
+        Returns:
+        dict: 출력 이름 -> 배열
+        """
+        key = self.make_key(symbol, timeframe, spec.name, params)
+        names = ('time_axis_val',) + tuple(col for col in spec.inputs if col != 'time_axis_val')
+        inputs = {name: columns[name] for name in names}
+        version = data_version(inputs)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry.outputs
+        
+        outputs = None
+        lookback = spec.lookback(params)
+        if entry is not None:
+            offset, unchanged = _reusable_prefix(entry.columns, inputs, names)
+            # 재귀형 지표(lookback 없음)는 꼬리 구간만 다시 계산할 수 없으므로 전체 재계산
+            if unchanged > 0 and lookback is not None:
+                outputs = self._extend(entry, spec, params, columns, contexts, offset, unchanged, lookback)
+                self.partial_hits += 1
+        
+        if outputs is None:
+            outputs = spec(self._context(columns, contexts, 0), params)
+            self.misses += 1
+        
+        self._store(key, _CacheEntry(version, inputs, outputs))
+        return outputs
+    
+    def _context(self, columns, contexts, start):
+        if start not in contexts:
+            contexts[start] = ComputationContext({name: arr[start:] for name, arr in columns.items()})
+        return contexts[start]
+    
+    def _extend(self, entry, spec, params, columns, contexts, offset, unchanged, lookback):
+        """바뀌지 않은 앞부분은 이전 결과를 사용하고, 꼬리 구간만 다시 계산"""
+        start = max(unchanged - lookback + 1, 0)
+        tail = spec(self._context(columns, contexts, start), params)
+        outputs = {}
+        for name, tail_values in tail.items():
+            values = np.concatenate((entry.outputs[name][offset:offset + unchanged],
+                                     tail_values[unchanged - start:]))
+            if offset > 0:
+                # 앞쪽이 잘린 데이터는 새로 계산한 결과와 동일하게 워밍업 구간을 비움
+                values[:lookback - 1] = np.nan
+            outputs[name] = values
+        return outputs
+    
+    def _store(self, key, entry):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            # 메모리 예산 초과 시 가장 오래 사용되지 않은 항목부터 제거
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,123 @@
+"""
+기술적 지표 계산을 GUI 스레드 밖의 워커 풀에서 처리하는 모듈
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import traceback
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.indicator_cache import IndicatorCache
+from utils.indicator_registry import get_indicator
+from config.settings import INDICATOR_WORKERS
+
+# 스냅샷에 포함되는 캔들 컬럼
+SNAPSHOT_COLUMNS = ('time_axis_val', 'open', 'high', 'low', 'close', 'volume')
+
+def make_snapshot(df, columns=SNAPSHOT_COLUMNS):
+    """
+    DataFrame(또는 컬럼명 -> 배열 매핑)에서 읽기 전용 NumPy 배열 스냅샷 생성
+    
+    Parameters:
+    df (pandas.DataFrame | dict): 캔들 데이터가 포함된 DataFrame 또는 컬럼별 배열
+    columns (tuple): 스냅샷에 포함할 컬럼
+    
+    Returns:
+    dict: 컬럼명 -> 쓰기 불가능한 float 배열
+    """
+    snapshot = {}
+    for col in columns:
+        arr = np.array(df[col], dtype=float)
+        arr.setflags(write=False)
+        snapshot[col] = arr
+    return snapshot
+
+class IndicatorSignals(QObject):
+    results_ready = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class IndicatorEngine:
+    """
+    지표 계산 요청을 백그라운드 스레드 풀에서 실행하고 결과를 시그널로 전달하는 클래스
+    요청마다 버전 번호를 부여하며, 더 새로운 요청이 들어온 이후의 결과는 버림
+    계산 결과는 IndicatorCache를 거쳐 토글/심볼 전환/실시간 틱 사이에 재사용됨
+    """
+    
+    def __init__(self, max_workers=INDICATOR_WORKERS, cache=None):
+        self.signals = IndicatorSignals()
+        self.cache = cache if cache is not None else IndicatorCache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='indicator')
+        self._lock = threading.Lock()
+        self._latest_version = 0
+    
+    @property
+    def latest_version(self):
+        return self._latest_version
+    
+    def is_stale(self, version):
+        """더 새로운 요청이 제출되었는지 여부"""
+        return version != self._latest_version
+    
+    def invalidate(self):
+        """진행 중인 모든 요청의 결과를 무효화"""
+        with self._lock:
+            self._latest_version += 1
+    
+    def submit(self, snapshot, requests, symbol=None, timeframe=None):
+        """
+        지표 계산 요청 제출
+        
+        Parameters:
+        snapshot (dict): make_snapshot()으로 만든 읽기 전용 배열
+        requests (dict): 결과 키 -> (레지스트리 지표 이름, 파라미터) (예: {'cci': ('cci', {'window': 20})})
+        symbol (str), timeframe (str): 결과 캐시의 시리즈 식별자
+        
+        Returns:
+        int: 요청 버전 번호
+        """
+        with self._lock:
+            self._latest_version += 1
+            version = self._latest_version
+        future = self._executor.submit(self._compute, version, snapshot, dict(requests), symbol, timeframe)
+        future.add_done_callback(self._on_done)
+        return version
+    
+    def _compute(self, version, snapshot, requests, symbol, timeframe):
+        """워커 스레드에서 지표 계산 (GUI 객체에 접근하지 않음)"""
+        if self.is_stale(version):
+            return None  # 이미 더 새로운 데이터가 들어옴 - 계산 생략
+        
+        # 요청 하나에서 계산되는 지표들은 같은 컨텍스트(시작 인덱스별)의 중간값을 공유
+        contexts = {}
+        indicators = {}
+        for key, (name, params) in requests.items():
+            spec = get_indicator(name)
+            indicators[key] = self.cache.get_or_compute(
+                symbol, timeframe, spec, spec.resolve_params(params), snapshot, contexts
+            )
+        
+        return {
+            'version': version,
+            'x': snapshot['time_axis_val'],
+            'indicators': indicators,
+        }
+    
+    def _on_done(self, future):
+        """워커 스레드에서 호출됨 - 최신 결과만 시그널로 전달"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            traceback.print_exception(type(error), error, error.__traceback__)
+            self.signals.error.emit(f"지표 계산 중 오류 발생: {type(error).__name__} - {error}")
+            return
+        result = future.result()
+        if result is None or self.is_stale(result['version']):
+            return
+        self.signals.results_ready.emit(result)
+    
+    def shutdown(self):
+        """스레드 풀 종료 (대기 중인 결과는 무효화)"""
+        self.invalidate()
+        self._executor.shutdown(wait=False)
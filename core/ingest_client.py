@@ -0,0 +1,119 @@
+"""
+수집 프로세스를 관리하고 공유 메모리 링 버퍼의 캔들을 GUI로 전달하는 클라이언트 모듈
+"""
+
+import multiprocessing
+import threading
+import traceback
+from PyQt6.QtCore import QObject
+
+from core.data_worker import WorkerSignals
+from core.ingest_process import run_ingest_process
+from core.shm_ring import SharedCandleRing
+from utils.latency import CandleBatch
+from config.settings import INGEST_RING_CAPACITY
+
+class IngestClient(QObject):
+    """
+    GUI 프로세스 측 수집 프로세스 핸들
+    
+    네트워크 I/O와 메시지 처리는 자식 프로세스에서 수행하고, GUI 프로세스는
+    공유 메모리에 매핑된 링 버퍼에서 마지막으로 읽은 이후의 캔들만 읽어 Worker와 같은 new_data 시그널로 전달함
+    """
+    
+    def __init__(self, exchange_id, ring_capacity=INGEST_RING_CAPACITY):
+        super().__init__()
+        self.exchange_id = exchange_id
+        self.ring_capacity = ring_capacity
+        self.signals = WorkerSignals()
+        self.process = None
+        self.ring = None
+        self.symbol = None
+        self.timeframe = None
+        self._appended = 0  # 마지막으로 읽은 시점의 링 누적 추가 수
+        self._lock = threading.Lock()
+        self._listener = None
+    
+    def start(self):
+        """수집 프로세스와 알림 수신 스레드 시작"""
+        ctx = multiprocessing.get_context('spawn')  # Qt 스레드가 있는 프로세스에서 fork 하지 않음
+        self._command_conn, child_command_conn = ctx.Pipe()
+        self._notify_conn, child_notify_conn = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(
+            target=run_ingest_process,
+            args=(self.exchange_id, child_command_conn, child_notify_conn),
+            name='candle-ingest',
+            daemon=True,
+        )
+        self.process.start()
+        self._listener = threading.Thread(target=self._listen, name='ingest-listener', daemon=True)
+        self._listener.start()
+        print(f"수집 프로세스가 시작되었습니다 (pid {self.process.pid}).")
+    
+    def subscribe(self, symbol, timeframe):
+        """스트림 구독 (이전 구독은 해제)"""
+        self.unsubscribe()
+        with self._lock:
+            self.ring = SharedCandleRing.create(self.ring_capacity)
+            self.symbol = symbol
+            self.timeframe = timeframe
+            self._appended = 0
+        self._command_conn.send(('subscribe', symbol, timeframe, self.ring.name))
+        print(f"수집 프로세스 구독: {symbol} {timeframe}")
+    
+    def unsubscribe(self):
+        with self._lock:
+            if self.ring is None:
+                return
+            symbol, timeframe, ring = self.symbol, self.timeframe, self.ring
+            self.ring = None
+            self.symbol = self.timeframe = None
+        try:
+            self._command_conn.send(('unsubscribe', symbol, timeframe))
+        except (OSError, ValueError):
+            pass
+        ring.close()
+    
+    def _listen(self):
+        """알림 수신 스레드: 쌓인 알림을 모두 비운 뒤 링 버퍼에서 한 번만 읽음"""
+        while True:
+            try:
+                messages = [self._notify_conn.recv()]
+                while self._notify_conn.poll(0):
+                    messages.append(self._notify_conn.recv())
+            except (EOFError, OSError):
+                break
+            for message in messages:
+                if message[0] == 'error':
+                    self.signals.error.emit(message[1])
+            current = (self.symbol, self.timeframe)
+            if any(message[0] == 'update' and message[1:] == current for message in messages):
+                try:
+                    self._read_new_candles()
+                except Exception:
+                    traceback.print_exc()
+        self.signals.finished.emit()
+    
+    def _read_new_candles(self):
+        with self._lock:
+            if self.ring is None:
+                return
+            # 마지막으로 전달한 캔들(진행 중 캔들)과 그 이후 추가된 캔들만 복사
+            rows, self._appended = self.ring.read_since(self._appended)
+            if rows is None or len(rows) == 0:
+                return
+        self.signals.new_data.emit(CandleBatch(rows.tolist()))
+    
+    def shutdown(self):
+        """수집 프로세스 종료 및 공유 메모리 해제"""
+        self.unsubscribe()
+        if self.process is not None:
+            try:
+                self._command_conn.send(('stop',))
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        print("수집 프로세스가 종료되었습니다.")
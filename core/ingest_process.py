@@ -0,0 +1,90 @@
+"""
+거래소 스트림을 별도 프로세스에서 수신하여 공유 메모리 링 버퍼에 기록하는 수집 프로세스 모듈
+
+이 모듈은 spawn된 자식 프로세스에서 임포트되므로 Qt에 의존하지 않음
+"""
+
+import asyncio
+import traceback
+import ccxt
+import ccxt.pro as ccxtpro
+
+from core.shm_ring import SharedCandleRing
+
+def run_ingest_process(exchange_id, command_conn, notify_conn):
+    """
+    수집 프로세스 진입점
+    
+    Parameters:
+    exchange_id (str): ccxt.pro 거래소 ID
+    command_conn (Connection): GUI -> 수집 프로세스 명령 채널
+        ('subscribe', symbol, timeframe, ring_name) / ('unsubscribe', symbol, timeframe) / ('stop',)
+    notify_conn (Connection): 수집 프로세스 -> GUI 알림 채널
+        ('update', symbol, timeframe) / ('error', message)
+    """
+    try:
+        asyncio.run(_ingest_main(exchange_id, command_conn, notify_conn))
+    except KeyboardInterrupt:
+        pass
+
+async def _stream_to_ring(exchange, symbol, timeframe, ring, notify_conn):
+    """watch_ohlcv 결과를 링 버퍼에 기록하고 GUI에 알림"""
+    while True:
+        try:
+            ohlcv_list = await exchange.watch_ohlcv(symbol, timeframe)
+            if ohlcv_list:
+                ring.write(ohlcv_list)
+                notify_conn.send(('update', symbol, timeframe))
+        except asyncio.CancelledError:
+            raise
+        except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+            notify_conn.send(('error', f"Ingest stream error ({symbol} {timeframe}): {e}"))
+            await asyncio.sleep(5)
+        except Exception as e:
+            traceback.print_exc()
+            notify_conn.send(('error', f"Ingest stream stopped ({symbol} {timeframe}): {type(e).__name__} - {e}"))
+            return
+
+async def _ingest_main(exchange_id, command_conn, notify_conn):
+    exchange = getattr(ccxtpro, exchange_id)({
+        'options': {
+            'defaultType': 'future',  # For USDⓈ-M futures markets
+        },
+    })
+    loop = asyncio.get_running_loop()
+    streams = {}  # (symbol, timeframe) -> (task, ring)
+    
+    async def stop_stream(key):
+        task, ring = streams.pop(key)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        ring.close()
+    
+    try:
+        while True:
+            try:
+                command = await loop.run_in_executor(None, command_conn.recv)
+            except (EOFError, OSError):
+                break  # GUI 프로세스 종료
+            kind = command[0]
+            if kind == 'subscribe':
+                _, symbol, timeframe, ring_name = command
+                key = (symbol, timeframe)
+                if key in streams:
+                    await stop_stream(key)
+                ring = SharedCandleRing.attach(ring_name)
+                task = asyncio.create_task(_stream_to_ring(exchange, symbol, timeframe, ring, notify_conn))
+                streams[key] = (task, ring)
+            elif kind == 'unsubscribe':
+                key = (command[1], command[2])
+                if key in streams:
+                    await stop_stream(key)
+            elif kind == 'stop':
+                break
+    finally:
+        for key in list(streams):
+            await stop_stream(key)
+        try:
+            await exchange.close()
+        except Exception:
+            traceback.print_exc()
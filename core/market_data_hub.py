@@ -0,0 +1,306 @@
+"""
+여러 차트 창이 스트림, 캔들 저장소, 지표 캐시를 공유하도록 하는 프로세스 전역 시장 데이터 허브 모듈
+"""
+
+import threading
+import traceback
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+from core.exchange import ExchangeManager
+from core.candle_store import CandleStore
+from core.ingest_client import IngestClient
+from core.indicator_cache import IndicatorCache
+from core.prefetcher import SpeculativePrefetcher
+from core.data_worker import Worker, WorkerSignals
+from core.binance_ws import NativeKlineWorker
+from core.trade_worker import TradeWorker
+from core.trade_aggregator import TRADE_TIMEFRAMES
+from core.rest_poller import RestPoller
+from core.request_scheduler import is_rate_limit_error, used_weight_from_headers, retry_after_from_headers
+from config.settings import (
+    DEFAULT_EXCHANGE_ID, USE_INGEST_PROCESS, USE_NATIVE_KLINE_STREAM,
+    REST_POLL_DELTA_LIMIT, TRADE_SEED_LIMIT
+)
+
+class MarketFeed(QObject):
+    """
+    (심볼, 타임프레임) 하나의 실시간 스트림과 캔들 저장소
+    
+    스트림 종류(체결 집계 워커, kline 워커, 수집 프로세스, REST 폴링)는 기존 MainWindow와 같은
+    규칙으로 고르며, 들어온 캔들 배치는 저장소에 한 번만 병합한 뒤 signals.new_data로 모든 구독 창에 전달함.
+    history_loaded, live_detached, persisted_until은 저장소 상태이므로 구독 창들이 공유함
+    """
+    
+    poll_done = pyqtSignal(object)  # REST 폴링 Future - 스케줄러 스레드에서 전달
+    
+    def __init__(self, exchange_manager, symbol, timeframe):
+        super().__init__()
+        self.exchange_manager = exchange_manager
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.signals = WorkerSignals()
+        self.candle_store = CandleStore()
+        self.candle_store.enable_pyramid(timeframe)
+        self.refcount = 0
+        self.history_loaded = False  # 초기 이력(REST/스냅샷/로컬 저장소)을 불러옴 - 실시간/알림 백필 캔들만 있으면 False
+        self.live_detached = False  # 과거 구간을 보는 동안 최신 구간이 저장소에서 제거됨
+        self.persisted_until = None  # 로컬 저장소에 기록한 마지막 마감 캔들 다음 타임스탬프 (ms)
+        self.delta_pending = False  # 세션 스냅샷 이후 캔들을 받는 중 (병합 전에는 마감 캔들을 기록하지 않음)
+        self.worker = None
+        self.thread = None
+        self.ingest_client = None
+        self.timer = None
+        self.rest_poller = None
+        self.poll_done.connect(self.apply_rest_poll)
+    
+    @property
+    def key(self):
+        return (self.symbol, self.timeframe)
+    
+    def start(self):
+        """스트림 시작 (WebSocket 우선, 불가능하면 REST 폴링)"""
+        if self.exchange_manager.ws_exchange:
+            print(f"WebSocket 연결을 초기화합니다: {self.symbol} {self.timeframe}")
+            if USE_INGEST_PROCESS and self.timeframe not in TRADE_TIMEFRAMES:
+                self.ingest_client = IngestClient(self.exchange_manager.exchange_id)
+                self.ingest_client.signals.new_data.connect(self.merge_batch)
+                self.ingest_client.signals.error.connect(self.signals.error)
+                self.ingest_client.start()
+                self.ingest_client.subscribe(self.symbol, self.timeframe)
+            else:
+                self.start_worker_thread()
+        elif self.exchange_manager.rest_exchange and self.timeframe in TRADE_TIMEFRAMES:
+            print(f"{self.timeframe} 캔들은 체결 스트림이 필요하므로 REST API 폴백을 사용할 수 없습니다.")
+        elif self.exchange_manager.rest_exchange:
+            print("WebSocket 연결을 초기화할 수 없습니다. REST API로 폴백합니다.")
+            # REST API 증분 폴링 타이머 설정 (캔들 경계에 맞춘 단발성 타이머를 매번 다시 예약)
+            self.rest_poller = RestPoller(self.timeframe)
+            self.timer = QTimer(self)
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.poll_rest)
+            self.schedule_rest_poll()
+            print(f"REST API 폴링 타이머가 시작되었습니다. (진행 중 캔들 갱신 간격 {self.rest_poller.base_interval_ms / 1000:g}초)")
+        else:
+            print("치명적 오류: 거래소 연결을 초기화할 수 없습니다.")
+            self.signals.error.emit("치명적 오류: 거래소 연결을 초기화할 수 없습니다.")
+    
+    def start_worker_thread(self):
+        """WebSocket 워커 스레드 시작"""
+        # 워커 생성 (초 단위 타임프레임은 체결 집계, 그 외에는 설정에 따라 경량 Binance 클라이언트 또는 ccxt.pro 사용)
+        if self.timeframe in TRADE_TIMEFRAMES:
+            symbol = self.symbol
+            self.worker = TradeWorker(
+                self.exchange_manager.create_ws_exchange(), symbol, self.timeframe,
+                seed_trades=lambda: self.exchange_manager.fetch_recent_trades(symbol, TRADE_SEED_LIMIT),
+            )
+        elif USE_NATIVE_KLINE_STREAM and self.exchange_manager.exchange_id.startswith('binance'):
+            self.worker = NativeKlineWorker(self.symbol, self.timeframe)
+        else:
+            self.worker = Worker(self.exchange_manager.create_ws_exchange(), self.symbol, self.timeframe)
+        
+        self.thread = QThread()
+        self.worker.moveToThread(self.thread)
+        
+        self.worker.signals.new_data.connect(self.merge_batch)
+        self.worker.signals.error.connect(self.signals.error)
+        self.worker.signals.finished.connect(self.thread.quit)
+        self.worker.signals.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+        
+        self.thread.started.connect(self.worker.start_streaming)
+        self.thread.start()
+        print(f"WebSocket 워커 스레드가 시작되었습니다: {self.symbol} {self.timeframe}")
+    
+    def stop(self):
+        """스트림 정지 (마지막 구독 창이 해제될 때 허브가 호출)"""
+        if self.ingest_client:
+            self.ingest_client.shutdown()
+            self.ingest_client = None
+        
+        if self.timer and self.timer.isActive():
+            self.timer.stop()
+        self.timer = None
+        
+        if self.thread and self.thread.isRunning():
+            if self.worker:
+                self.worker.stop()  # 워커 루프 정지 및 거래소 연결 닫기
+            self.thread.quit()
+            if not self.thread.wait(5000):
+                print("워커 스레드가 제한 시간 내에 종료되지 않았습니다. 강제 종료합니다.")
+                self.thread.terminate()
+                self.thread.wait()
+        self.worker = None
+        self.thread = None
+        print(f"스트림을 정지했습니다: {self.symbol} {self.timeframe}")
+    
+    @pyqtSlot(object)
+    def merge_batch(self, batch):
+        """
+        캔들 배치를 저장소에 한 번 병합한 뒤 구독 창들에 전달
+        (live_detached 동안에는 병합하지 않고 알림 평가용으로 전달만 함)
+        """
+        if not batch:
+            return
+        if not self.live_detached:
+            try:
+                self.candle_store.upsert(batch)
+            except Exception as e:
+                print(f"캔들 배치 병합 중 오류 발생 ({self.symbol} {self.timeframe}): {e}")
+                traceback.print_exc()
+                return
+        self.signals.new_data.emit(batch)
+    
+    def schedule_rest_poll(self, delay_ms=None):
+        """다음 REST 폴링 예약 (기본값: 캔들 경계와 요청 가중치를 반영한 RestPoller 스케줄)"""
+        if self.timer is None:
+            return
+        if delay_ms is None:
+            delay_ms = self.rest_poller.next_delay_ms()
+        self.timer.start(delay_ms)
+    
+    def poll_rest(self):
+        """
+        REST API 증분 폴링 (WebSocket 대체용)
+        마지막 저장 캔들 이후의 캔들만 요청하고, 응답은 poll_done으로 GUI 스레드에 전달되어 병합됨
+        (응답을 받을 때까지 다음 폴링을 예약하지 않으므로 폴링 요청은 한 번에 하나만 진행됨)
+        """
+        since = self.candle_store.last_timestamp
+        if self.live_detached or since is None:
+            # 과거 구간을 보는 중이거나 구독 창의 초기 로드 전이면 다음 폴링으로 미룸
+            self.schedule_rest_poll()
+            return
+        
+        try:
+            future = self.exchange_manager.submit_ohlcv_rows(
+                self.symbol, self.timeframe, REST_POLL_DELTA_LIMIT, since=since
+            )
+        except Exception as e:
+            print(f"REST API 데이터 업데이트 중 오류 발생: {e}")
+            self.schedule_rest_poll()
+            return
+        future.add_done_callback(self.poll_done.emit)
+    
+    @pyqtSlot(object)
+    def apply_rest_poll(self, future):
+        """GUI 스레드: 폴링 응답 병합 후 다음 폴링 예약 (피드가 정지되었으면 무시)"""
+        if self.timer is None or future.cancelled():
+            return
+        
+        delay_ms = None
+        # 요청 가중치/Retry-After는 이 요청의 응답 헤더로만 판단 (다른 스레드의 응답과 섞이지 않음)
+        headers = getattr(future, 'response_headers', None)
+        try:
+            rows = future.result() or []
+            self.rest_poller.note_success()
+            
+            if rows:
+                self.merge_batch(rows)
+                # 한 번에 다 받지 못한 경우 (긴 공백 이후) 즉시 이어서 요청
+                if len(rows) >= REST_POLL_DELTA_LIMIT:
+                    delay_ms = 0
+        except Exception as e:
+            if is_rate_limit_error(e):
+                retry_after = retry_after_from_headers(headers)
+                self.rest_poller.note_rate_limited(retry_after)
+                print(f"REST API 요청 한도 초과, 폴링을 지연합니다: {e}")
+            else:
+                print(f"REST API 데이터 업데이트 중 오류 발생: {e}")
+                traceback.print_exc()
+        finally:
+            self.rest_poller.note_weight(used_weight_from_headers(headers))
+            self.schedule_rest_poll(delay_ms)
+
+class MarketDataHub(QObject):
+    """
+    프로세스 전역 시장 데이터 허브 (MarketDataHub.instance()로 접근)
+    
+    - 거래소 연결과 REST 요청 스케줄러(ExchangeManager), 지표 결과 캐시, 선행 로드를 모든 창이 공유
+    - (심볼, 타임프레임)별 MarketFeed를 구독 수로 관리하여 같은 스트림을 여러 창이 구독해도
+      연결, 저장소, 지표 계산은 하나만 유지하고, 마지막 구독이 해제되면 스트림을 정지함
+    - 창은 acquire()/release()로 허브를 사용하며, 마지막 창이 해제하면 거래소 자원을 정리함
+    - 거래소 초기화(마켓 목록 로드)는 백그라운드 스레드에서 수행하므로 허브 생성은 즉시 끝나며,
+      준비 전에 구독한 피드의 스트림은 준비가 끝난 뒤 시작됨 (ready 시그널은 GUI 스레드에서 전달)
+    """
+    
+    connected = pyqtSignal()  # 백그라운드 스레드 -> GUI 스레드 전달용
+    ready = pyqtSignal()  # 거래소 연결 초기화 완료
+    
+    _instance = None
+    
+    @classmethod
+    def instance(cls, exchange_id=DEFAULT_EXCHANGE_ID):
+        if cls._instance is None:
+            cls._instance = cls(exchange_id)
+        return cls._instance
+    
+    def __init__(self, exchange_id=DEFAULT_EXCHANGE_ID):
+        super().__init__()
+        self.exchange_manager = ExchangeManager(exchange_id, connect=False)
+        self.indicator_cache = IndicatorCache()
+        self.prefetcher = SpeculativePrefetcher(self.exchange_manager, self.indicator_cache)
+        self.feeds = {}
+        self.clients = 0
+        self.is_ready = False
+        self.connected.connect(self._on_connected)
+        threading.Thread(target=self._connect, name='exchange-init', daemon=True).start()
+    
+    def _connect(self):
+        """백그라운드 스레드: 거래소 초기화 (마켓 목록 로드)"""
+        try:
+            self.exchange_manager.init_exchanges()
+        finally:
+            self.connected.emit()
+    
+    @pyqtSlot()
+    def _on_connected(self):
+        """GUI 스레드: 준비 전에 구독된 피드의 스트림 시작 후 창들에 ready 전달"""
+        self.is_ready = True
+        for feed in self.feeds.values():
+            feed.start()
+        self.ready.emit()
+    
+    def acquire(self):
+        """허브 사용 시작 (창 생성 시)"""
+        self.clients += 1
+        return self
+    
+    def release(self):
+        """허브 사용 종료 (창 종료 시), 마지막 창이면 모든 스트림과 거래소 자원 정리"""
+        self.clients -= 1
+        if self.clients > 0:
+            return
+        self.prefetcher.cancel()
+        for feed in list(self.feeds.values()):
+            feed.stop()
+        self.feeds.clear()
+        self.exchange_manager.shutdown()
+        if MarketDataHub._instance is self:
+            MarketDataHub._instance = None
+    
+    def subscribe(self, symbol, timeframe):
+        """
+        (심볼, 타임프레임) 피드 구독 - 첫 구독이면 스트림 시작
+        
+        Returns:
+        MarketFeed: 공유 피드 (signals.new_data 연결 및 candle_store 사용)
+        """
+        key = (symbol, timeframe)
+        feed = self.feeds.get(key)
+        if feed is None:
+            feed = MarketFeed(self.exchange_manager, symbol, timeframe)
+            self.feeds[key] = feed
+        feed.refcount += 1
+        if feed.refcount == 1 and self.is_ready:
+            feed.start()
+        else:
+            print(f"공유 스트림을 구독합니다: {symbol} {timeframe} (구독 {feed.refcount})")
+        return feed
+    
+    def unsubscribe(self, feed):
+        """피드 구독 해제 - 마지막 구독이면 스트림 정지 및 저장소 해제"""
+        feed.refcount -= 1
+        if feed.refcount > 0:
+            return
+        feed.stop()
+        if self.feeds.get(feed.key) is feed:
+            del self.feeds[feed.key]
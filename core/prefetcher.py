@@ -0,0 +1,156 @@
+"""
+유휴 시간에 다음에 열 가능성이 높은 차트의 캔들과 지표를 미리 받아 두는 선행 로드 모듈
+"""
+
+import threading
+import time
+import numpy as np
+
+from core.candle_pyramid import timeframe_to_ms
+from core.candle_store import rows_to_frame
+from core.request_scheduler import PRIORITY_PREFETCH
+from utils.indicator_registry import get_indicator
+from config.settings import DEFAULT_LIMIT, PREFETCH_MAX_AGE_MS, PREFETCH_MAX_CANDIDATES
+
+def prefetch_candidates(symbol, timeframe, timeframes, recent_symbols, max_count=PREFETCH_MAX_CANDIDATES):
+    """
+    선행 로드 후보 (심볼, 타임프레임) 목록 - 가능성이 높은 순서
+    
+    1. 현재 심볼의 인접 타임프레임 (timeframes 목록에서 바로 아래/위)
+    2. 최근 사용한 심볼의 현재 타임프레임 (최근 순)
+    """
+    candidates = []
+    if timeframe in timeframes:
+        i = timeframes.index(timeframe)
+        for j in (i - 1, i + 1):
+            if 0 <= j < len(timeframes):
+                candidates.append((symbol, timeframes[j]))
+    for recent in recent_symbols:
+        if recent != symbol:
+            candidates.append((recent, timeframe))
+    return candidates[:max_count]
+
+class _Prefetched:
+    def __init__(self, rows, fetched_at):
+        self.rows = rows
+        self.fetched_at = fetched_at  # ms
+
+class SpeculativePrefetcher:
+    """
+    REST 요청 스케줄러의 가장 낮은 우선순위(PRIORITY_PREFETCH)로 후보 차트의 최근 캔들을 받아 두고,
+    받은 즉시 공유 지표 캐시에 지표를 계산해 둠. 사용자가 해당 차트를 열면 take()로 캔들을 넘겨받아
+    네트워크 요청 없이 표시하고, 지표는 캐시 적중으로 처리됨.
+    
+    - 같은 (심볼, 타임프레임, limit) 요청은 스케줄러에서 병합되므로, 선행 로드 도중 사용자가 그 차트를 열면
+      대기 중인 요청이 상호작용 우선순위로 승격되어 그대로 사용됨
+    - cancel()은 아직 시작되지 않은 요청을 취소해 상호작용 요청과 요청 가중치를 다투지 않게 함
+    - 받아 둔 캔들은 캔들 경계를 넘거나 PREFETCH_MAX_AGE_MS가 지나면 쓰지 않으며 (마감 캔들 누락 방지),
+      그렇게 쓸 수 없게 된 항목은 다음 prefetch() 호출 때 버림 (넘겨받지 않은 캔들이 쌓이지 않도록)
+    """
+    
+    def __init__(self, exchange_manager, indicator_cache, limit=DEFAULT_LIMIT, max_age_ms=PREFETCH_MAX_AGE_MS):
+        self.exchange_manager = exchange_manager
+        self.indicator_cache = indicator_cache
+        self.limit = limit
+        self.max_age_ms = max_age_ms
+        self._lock = threading.Lock()
+        self._prefetched = {}  # (심볼, 타임프레임) -> _Prefetched
+        self._futures = {}  # (심볼, 타임프레임) -> Future
+    
+    def is_fresh(self, key, now_ms=None):
+        with self._lock:
+            entry = self._prefetched.get(key)
+        return entry is not None and self._entry_fresh(key, entry, now_ms)
+    
+    def _entry_fresh(self, key, entry, now_ms=None):
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        tf_ms = timeframe_to_ms(key[1])
+        if tf_ms is None or now_ms - entry.fetched_at > self.max_age_ms:
+            return False
+        # 받은 이후 캔들이 마감되었으면 마지막 마감 캔들의 최종 값이 없으므로 다시 받아야 함
+        # (경계는 받은 마지막 캔들의 시작 시각 기준 - 월요일에 시작하는 1w 캔들처럼 epoch에 맞지 않는 타임프레임 포함)
+        return now_ms < int(entry.rows[-1][0]) + tf_ms
+    
+    def evict_stale(self, now_ms=None):
+        """쓸 수 없게 된 (넘겨받지 않은 채 오래되었거나 캔들 경계를 넘은) 캔들 폐기"""
+        with self._lock:
+            for key, entry in list(self._prefetched.items()):
+                if not self._entry_fresh(key, entry, now_ms):
+                    del self._prefetched[key]
+    
+    def prefetch(self, keys, indicator_requests=None):
+        """
+        후보 차트 선행 로드 요청 (이미 신선한 데이터가 있거나 요청 중인 차트는 건너뜀)
+        
+        Parameters:
+        keys (list): (심볼, 타임프레임) 목록
+        indicator_requests (dict): 결과 키 -> (레지스트리 지표 이름, 파라미터) - 받은 뒤 미리 계산할 지표
+        
+        Returns:
+        int: 새로 제출한 요청 수
+        """
+        if not self.exchange_manager.rest_exchange:
+            return 0
+        self.evict_stale()
+        submitted = 0
+        for key in keys:
+            with self._lock:
+                pending = key in self._futures
+            if pending or self.is_fresh(key):
+                continue
+            symbol, timeframe = key
+            future = self.exchange_manager.submit_ohlcv_rows(symbol, timeframe, self.limit, priority=PRIORITY_PREFETCH)
+            with self._lock:
+                self._futures[key] = future
+            future.add_done_callback(lambda f, key=key: self._on_done(key, f, indicator_requests or {}))
+            submitted += 1
+        return submitted
+    
+    def _on_done(self, key, future, indicator_requests):
+        """스케줄러 스레드에서 호출됨 - 캔들 보관 후 지표를 공유 캐시에 계산"""
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        rows = future.result()
+        if not rows:
+            return
+        with self._lock:
+            self._prefetched[key] = _Prefetched(rows, int(time.time() * 1000))
+        
+        # 창에서 만드는 스냅샷(make_snapshot)과 같은 열/값으로 계산해 전환 시 캐시 적중이 되도록 함
+        data = np.asarray(rows, dtype=float)
+        snapshot = {
+            'time_axis_val': data[:, 0] / 1000,
+            'open': data[:, 1], 'high': data[:, 2], 'low': data[:, 3], 'close': data[:, 4], 'volume': data[:, 5],
+        }
+        contexts = {}
+        symbol, timeframe = key
+        try:
+            for name, params in indicator_requests.values():
+                spec = get_indicator(name)
+                self.indicator_cache.get_or_compute(symbol, timeframe, spec, spec.resolve_params(params), snapshot, contexts)
+        except Exception as e:
+            print(f"선행 로드 지표 계산 실패 ({symbol} {timeframe}): {type(e).__name__} - {e}")
+    
+    def take(self, symbol, timeframe):
+        """
+        받아 둔 캔들을 DataFrame으로 넘겨받기 (신선하지 않거나 없으면 None)
+        """
+        key = (symbol, timeframe)
+        fresh = self.is_fresh(key)
+        with self._lock:
+            entry = self._prefetched.pop(key, None)
+        if entry is None or not fresh:
+            return None
+        return rows_to_frame(entry.rows)
+    
+    def cancel(self, keep=None):
+        """대기 중인 선행 로드 요청 취소 (keep 차트의 요청은 유지해 상호작용 요청과 병합되게 함)"""
+        with self._lock:
+            futures = [(key, f) for key, f in self._futures.items() if key != keep]
+        for key, future in futures:
+            if future.cancel():
+                with self._lock:
+                    self._futures.pop(key, None)
@@ -0,0 +1,236 @@
+"""
+모든 REST 요청이 거치는 우선순위/요청 가중치 기반 요청 스케줄러를 정의하는 모듈
+"""
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+import ccxt
+
+from config.settings import REST_WEIGHT_LIMIT, REST_SCHEDULER_WORKERS, REST_PRIORITY_WEIGHT_RATIOS
+
+# 요청 우선순위 (숫자가 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0  # 차트 로드, 심볼 전환 등 사용자가 기다리는 요청
+PRIORITY_POLL = 1  # REST 폴링, 스캐너 갱신
+PRIORITY_BACKFILL = 2  # 과거 이력 페이징, 전체 시장 스캔
+PRIORITY_PREFETCH = 3  # 유휴 시간 선행 로드
+
+def kline_weight(limit):
+    """Binance USDⓈ-M /fapi/v1/klines 요청 가중치 (limit 구간별)"""
+    if limit is None or limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+def is_rate_limit_error(error):
+    """429(요청 과다)/418(IP 차단) 응답에 해당하는 ccxt 예외인지 여부"""
+    return isinstance(error, ccxt.DDoSProtection)
+
+def _header(headers, name):
+    """대소문자를 무시하고 응답 헤더 값 조회"""
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+def used_weight_from_headers(headers):
+    """Binance 응답 헤더에서 1분 사용 가중치 추출"""
+    try:
+        return int(_header(headers, 'x-mbx-used-weight-1m'))
+    except (TypeError, ValueError):
+        return None
+
+def retry_after_from_headers(headers):
+    try:
+        return float(_header(headers, 'retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+class RestResponse:
+    """
+    요청 함수가 결과와 함께 그 요청의 응답 헤더를 돌려줄 때 사용하는 래퍼
+    스케줄러는 헤더로 가중치를 보정한 뒤 Future에는 value만 넣고, 헤더는 future.response_headers로 남김
+    (실패한 요청은 예외의 response_headers 속성으로 전달)
+    """
+    
+    def __init__(self, value, headers):
+        self.value = value
+        self.headers = headers
+
+class _Request:
+    def __init__(self, key, fn, args, kwargs, priority, weight):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.weight = weight
+        self.future = Future()
+        self.started = False
+
+class RequestScheduler:
+    """
+    REST 요청 우선순위 큐
+    
+    - 우선순위가 높은 요청부터 REST_SCHEDULER_WORKERS개 스레드에서 실행
+    - 응답 헤더(x-mbx-used-weight-1m)로 분 단위 사용 가중치를 추적하고, 우선순위별 허용 비율
+      (REST_PRIORITY_WEIGHT_RATIOS)을 넘는 요청은 다음 분까지 대기시켜 대화형 요청 몫을 남겨 둠
+    - 같은 key의 요청이 대기/실행 중이면 새로 보내지 않고 같은 Future를 반환 (더 높은 우선순위로 요청되면 승격)
+    - 429/418 응답을 받으면 Retry-After(없으면 다음 분)까지 모든 요청을 멈춤
+    - 응답 헤더는 요청 함수가 RestResponse(또는 예외의 response_headers)로 직접 돌려준 것만 사용하므로
+      여러 스케줄러 스레드가 동시에 요청해도 다른 요청의 헤더를 읽지 않음
+    
+    반환되는 Future는 같은 key를 요청한 호출자들이 공유하므로, 취소(cancel)는 대기 중인 요청에만 적용됨
+    """
+    
+    def __init__(self, weight_limit=REST_WEIGHT_LIMIT, max_workers=REST_SCHEDULER_WORKERS):
+        self.weight_limit = weight_limit
+        self.used_weight = 0
+        self._window = int(time.time() // 60)
+        self._paused_until = 0.0
+        self._heap = []
+        self._pending = {}  # key -> 대기/실행 중인 _Request
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._run, name=f'rest-scheduler-{i}', daemon=True)
+            for i in range(max_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(self, key, fn, *args, priority=PRIORITY_POLL, weight=1, **kwargs):
+        """요청을 큐에 넣고 Future 반환 (key가 None이면 중복 병합하지 않음)"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RequestScheduler is shut down.")
+            request = self._pending.get(key) if key is not None else None
+            if request is not None and not request.future.cancelled():
+                if priority < request.priority and not request.started:
+                    # 이전 힙 항목은 우선순위 불일치로 건너뛰게 되고, 새 항목으로 승격됨
+                    request.priority = priority
+                    heapq.heappush(self._heap, (priority, next(self._seq), request))
+                    self._cond.notify()
+                return request.future
+            
+            request = _Request(key, fn, args, kwargs, priority, weight)
+            if key is not None:
+                self._pending[key] = request
+            heapq.heappush(self._heap, (priority, next(self._seq), request))
+            self._cond.notify()
+            return request.future
+    
+    def call(self, key, fn, *args, priority=PRIORITY_INTERACTIVE, weight=1, **kwargs):
+        """요청을 큐에 넣고 결과를 기다려 반환 (동기 호출용)"""
+        return self.submit(key, fn, *args, priority=priority, weight=weight, **kwargs).result()
+    
+    def note_weight(self, used_weight):
+        """
+        응답 헤더의 사용 가중치로 추정치 보정
+        여러 스레드의 응답은 순서 없이 도착하므로, 같은 분 안에서는 (서버 값은 줄어들지 않으므로) 더 큰 값만 반영함
+        """
+        if used_weight is None:
+            return
+        with self._cond:
+            window = int(time.time() // 60)
+            if window != self._window:
+                self._window = window
+                self.used_weight = used_weight
+            else:
+                self.used_weight = max(self.used_weight, used_weight)
+    
+    def pause(self, seconds=None):
+        """요청 한도 초과 시 지정 시간(기본값: 다음 분 시작)까지 모든 요청 중지"""
+        now = time.time()
+        if seconds is None:
+            seconds = 60 - now % 60
+        with self._cond:
+            self._paused_until = max(self._paused_until, now + seconds)
+    
+    def _wait_time(self, request, now):
+        """요청을 보내기 전 기다려야 하는 시간 (0이면 즉시 실행 가능)"""
+        window = int(now // 60)
+        if window != self._window:
+            # Binance 가중치는 분 단위로 초기화됨
+            self._window = window
+            self.used_weight = 0
+        if now < self._paused_until:
+            return self._paused_until - now
+        ceiling = self.weight_limit * REST_PRIORITY_WEIGHT_RATIOS.get(request.priority, 1.0)
+        if self.used_weight + request.weight > ceiling:
+            return 60 - now % 60 + 0.05
+        return 0
+    
+    def _next_request(self):
+        """실행할 다음 요청을 꺼냄 (조건 변수 잠금 상태에서 호출)"""
+        while not self._closed:
+            if not self._heap:
+                self._cond.wait()
+                continue
+            priority, _, request = self._heap[0]
+            if request.started or priority != request.priority or request.future.cancelled():
+                heapq.heappop(self._heap)
+                if request.future.cancelled() and self._pending.get(request.key) is request:
+                    del self._pending[request.key]
+                continue
+            # 힙 맨 앞 요청이 가장 높은 우선순위이자 가장 높은 허용 비율이므로 이것만 확인하면 됨
+            wait = self._wait_time(request, time.time())
+            if wait > 0:
+                self._cond.wait(wait)
+                continue
+            heapq.heappop(self._heap)
+            request.started = True
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            self.used_weight += request.weight
+            return request
+        return None
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                request = self._next_request()
+            if request is None:
+                return
+            
+            headers = None
+            try:
+                result = request.fn(*request.args, **request.kwargs)
+                if isinstance(result, RestResponse):
+                    result, headers = result.value, result.headers
+            except Exception as e:
+                headers = getattr(e, 'response_headers', None)
+                if is_rate_limit_error(e):
+                    print(f"REST 요청 한도 초과: 요청을 일시 중지합니다 ({e})")
+                    self.pause(retry_after_from_headers(headers))
+                request.future.response_headers = headers
+                request.future.set_exception(e)
+            else:
+                request.future.response_headers = headers
+                request.future.set_result(result)
+            finally:
+                try:
+                    self.note_weight(used_weight_from_headers(headers))
+                except Exception:
+                    traceback.print_exc()
+                with self._cond:
+                    if self._pending.get(request.key) is request:
+                        del self._pending[request.key]
+                    self._cond.notify_all()
+    
+    def shutdown(self):
+        """대기 중인 요청을 취소하고 스케줄러 스레드 종료"""
+        with self._cond:
+            self._closed = True
+            for _, _, request in self._heap:
+                request.future.cancel()
+            self._heap = []
+            self._pending.clear()
+            self._cond.notify_all()
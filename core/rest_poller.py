@@ -0,0 +1,69 @@
+"""
+REST 폴백용 캔들 경계 정렬 증분 폴링 스케줄을 계산하는 모듈
+"""
+
+import time
+import ccxt
+
+from config.settings import (
+    REST_POLLS_PER_CANDLE, REST_POLL_MIN_INTERVAL_MS, REST_POLL_MAX_INTERVAL_MS,
+    REST_POLL_CLOSE_DELAY_MS, REST_WEIGHT_LIMIT, REST_WEIGHT_BACKOFF_RATIO
+)
+
+class RestPoller:
+    """
+    캔들 경계에 맞춘 적응형 폴링 스케줄
+    
+    진행 중인 캔들은 타임프레임의 1/REST_POLLS_PER_CANDLE 간격(최소/최대 간격으로 제한)으로
+    갱신하되, 캔들 마감 직후(경계 + REST_POLL_CLOSE_DELAY_MS)에는 반드시 한 번 폴링함.
+    사용된 요청 가중치가 한도에 가까워지면 간격을 늘리고, 429/418 응답 시 지수 백오프함.
+    """
+    
+    def __init__(self, timeframe):
+        self.timeframe = timeframe
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.base_interval_ms = min(
+            max(self.timeframe_ms // REST_POLLS_PER_CANDLE, REST_POLL_MIN_INTERVAL_MS),
+            REST_POLL_MAX_INTERVAL_MS
+        )
+        self.weight_factor = 1.0
+        self.retry_at_ms = 0
+        self.failures = 0
+    
+    def note_weight(self, used_weight):
+        """응답 헤더의 사용 가중치를 반영해 폴링 간격 배율 조정"""
+        if used_weight is None:
+            return
+        ratio = used_weight / REST_WEIGHT_LIMIT
+        if ratio < REST_WEIGHT_BACKOFF_RATIO:
+            self.weight_factor = 1.0
+        else:
+            # 한도에 가까울수록 간격을 최대 8배까지 늘림
+            span = max(1.0 - REST_WEIGHT_BACKOFF_RATIO, 1e-6)
+            self.weight_factor = 1.0 + 7.0 * min((ratio - REST_WEIGHT_BACKOFF_RATIO) / span, 1.0)
+    
+    def note_success(self):
+        self.failures = 0
+    
+    def note_rate_limited(self, retry_after_s=None, now_ms=None):
+        """429/418 응답 처리: Retry-After가 있으면 따르고, 없으면 지수 백오프"""
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        self.failures += 1
+        if retry_after_s is not None:
+            delay_ms = int(retry_after_s * 1000)
+        else:
+            delay_ms = min(self.base_interval_ms * (2 ** self.failures), REST_POLL_MAX_INTERVAL_MS * 4)
+        self.retry_at_ms = now_ms + delay_ms
+    
+    def next_delay_ms(self, now_ms=None):
+        """다음 폴링까지 대기 시간 (밀리초)"""
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        if self.retry_at_ms > now_ms:
+            return self.retry_at_ms - now_ms
+        
+        interval = int(self.base_interval_ms * self.weight_factor)
+        # 다음 캔들 마감 직후 시각을 넘기지 않도록 정렬 (가중치 백오프 중에도 마감 캔들은 놓치지 않음)
+        next_close = now_ms - now_ms % self.timeframe_ms + self.timeframe_ms + REST_POLL_CLOSE_DELAY_MS
+        if now_ms % self.timeframe_ms < REST_POLL_CLOSE_DELAY_MS:
+            next_close -= self.timeframe_ms
+        return max(min(interval, next_close - now_ms), 0)
@@ -0,0 +1,198 @@
+"""
+USDⓈ-M 전체 시장을 대상으로 CCI/볼린저 밴드 조건을 스캔하는 모듈
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import traceback
+import ccxt
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.request_scheduler import PRIORITY_POLL, PRIORITY_BACKFILL
+from utils.calculations import bollinger_bands_matrix, cci_matrix
+from config.settings import (
+    SCANNER_LIMIT, SCANNER_CONDITIONS,
+    BOLLINGER_WINDOW, BOLLINGER_STD, CCI_WINDOW
+)
+
+class ScanMatrix:
+    """
+    심볼 x 시간 OHLCV 행렬
+    모든 심볼이 같은 타임프레임의 공통 시간 격자(최근 length개 캔들)를 공유하며,
+    데이터가 없는 칸은 NaN. 새 캔들이 마감되면 격자를 왼쪽으로 밀어 길이를 유지함.
+    """
+    
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, symbols, timeframe_ms, length):
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.timeframe_ms = timeframe_ms
+        self.length = length
+        self.timestamps = None
+        self.data = np.full((len(self.FIELDS), len(self.symbols), length), np.nan)
+    
+    def field(self, name):
+        return self.data[self.FIELDS.index(name)]
+    
+    def _ensure_grid(self, last_timestamp):
+        """격자의 마지막 시각이 last_timestamp 이상이 되도록 격자 이동"""
+        if self.timestamps is None:
+            self.timestamps = last_timestamp - self.timeframe_ms * np.arange(self.length - 1, -1, -1, dtype=np.int64)
+            return
+        shift = int((last_timestamp - self.timestamps[-1]) // self.timeframe_ms)
+        if shift <= 0:
+            return
+        if shift >= self.length:
+            self.data[:] = np.nan
+        else:
+            self.data[:, :, :-shift] = self.data[:, :, shift:]
+            self.data[:, :, -shift:] = np.nan
+        self.timestamps = self.timestamps + shift * self.timeframe_ms
+    
+    def update(self, symbol, rows):
+        """심볼 하나의 캔들([[ts, o, h, l, c, v], ...])을 격자에 기록"""
+        if symbol not in self.index or not len(rows):
+            return
+        rows = np.asarray(rows, dtype=float).reshape(-1, 6)
+        self._ensure_grid(int(rows[:, 0].max()))
+        columns = (rows[:, 0].astype(np.int64) - self.timestamps[0]) // self.timeframe_ms
+        valid = (columns >= 0) & (columns < self.length)
+        self.data[:, self.index[symbol], columns[valid]] = rows[valid, 1:].T
+
+def rank_scan_results(matrix, conditions=SCANNER_CONDITIONS, cci_window=CCI_WINDOW,
+                      bollinger_window=BOLLINGER_WINDOW, bollinger_std=BOLLINGER_STD):
+    """
+    행렬 전체에 대해 CCI/볼린저 밴드를 벡터화 계산하고 심볼별 최신 값과 조건 충족 여부 반환
+    
+    Returns:
+    list: 심볼별 결과 딕셔너리 (조건 충족 우선, |CCI| 내림차순)
+    """
+    high, low, close = matrix.field('high'), matrix.field('low'), matrix.field('close')
+    cci = cci_matrix(high, low, close, window=cci_window)[:, -1]
+    _, upper, lower = bollinger_bands_matrix(close, window=bollinger_window, num_std=bollinger_std)
+    upper, lower = upper[:, -1], lower[:, -1]
+    last_close = close[:, -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (close[:, -1] / close[:, -2] - 1) * 100
+        percent_b = (last_close - lower) / (upper - lower)
+    
+    matched = np.zeros(len(matrix.symbols), dtype=object)
+    matched[:] = ''
+    labels = []
+    if conditions.get('cci_above') is not None:
+        labels.append((cci >= conditions['cci_above'], f"CCI≥{conditions['cci_above']}"))
+    if conditions.get('cci_below') is not None:
+        labels.append((cci <= conditions['cci_below'], f"CCI≤{conditions['cci_below']}"))
+    if conditions.get('outside_bands'):
+        labels.append((last_close > upper, "BB 상단 돌파"))
+        labels.append((last_close < lower, "BB 하단 이탈"))
+    for mask, label in labels:
+        matched[mask] = [f"{m}, {label}" if m else label for m in matched[mask]]
+    
+    order = np.lexsort((-np.nan_to_num(np.abs(cci), nan=-1.0), matched == ''))
+    return [
+        {
+            'symbol': matrix.symbols[i],
+            'close': float(last_close[i]),
+            'change': float(change[i]),
+            'cci': float(cci[i]),
+            'percent_b': float(percent_b[i]),
+            'matched': matched[i],
+        }
+        for i in order if not np.isnan(last_close[i])
+    ]
+
+class ScannerSignals(QObject):
+    progress = pyqtSignal(int, int)
+    results_ready = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+class MarketScanner:
+    """
+    전체 USDⓈ-M 시장 스캐너
+    처음에는 모든 심볼의 캔들을 백필 우선순위로 요청 스케줄러에 넣어 행렬을 만들고,
+    이후에는 캔들이 마감될 때마다 심볼별 최근 캔들만 폴링 우선순위로 받아 행렬을 갱신함
+    """
+    
+    def __init__(self, exchange_manager, timeframe, limit=SCANNER_LIMIT):
+        self.exchange_manager = exchange_manager
+        self.timeframe = timeframe
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.limit = limit
+        self.conditions = dict(SCANNER_CONDITIONS)
+        self.signals = ScannerSignals()
+        self.matrix = None
+        self._job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scanner')
+        self._futures = {}  # 아직 완료되지 않은 요청 (종료 시 취소)
+        self._lock = threading.Lock()
+    
+    def start_full_scan(self):
+        """전체 시장 목록을 로드하고 모든 심볼 스캔 (백그라운드)"""
+        self._job_executor.submit(self._run_job, self._full_scan)
+    
+    def start_refresh(self):
+        """마감된 캔들만 받아 결과 갱신 (백그라운드)"""
+        self._job_executor.submit(self._run_job, self._refresh)
+    
+    def rerank(self):
+        """요청 없이 현재 조건으로 기존 행렬의 결과만 다시 계산 (백그라운드, 진행 중인 작업 뒤에 실행)"""
+        if self.matrix is not None:
+            self._job_executor.submit(self._run_job, self._emit_results)
+    
+    def _run_job(self, job):
+        try:
+            job()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.error.emit(f"스캐너 오류: {type(e).__name__} - {e}")
+    
+    def _fetch_into_matrix(self, matrix, symbols, limit, priority):
+        """심볼별 캔들을 요청 스케줄러로 받아 행렬에 기록 (행렬 갱신은 이 스레드에서만 수행)"""
+        futures = {
+            self.exchange_manager.submit_ohlcv_rows(symbol, self.timeframe, limit, priority=priority): symbol
+            for symbol in symbols
+        }
+        self._futures = futures
+        for done, future in enumerate(as_completed(futures), start=1):
+            symbol = futures[future]
+            if future.cancelled():
+                continue
+            try:
+                matrix.update(symbol, future.result())
+            except Exception as e:
+                print(f"스캐너: {symbol} 데이터를 가져오지 못했습니다: {e}")
+            if done % 10 == 0 or done == len(futures):
+                self.signals.progress.emit(done, len(futures))
+    
+    def _full_scan(self):
+        symbols = self.exchange_manager.get_usdm_symbols()
+        print(f"스캐너: {len(symbols)}개 심볼 스캔을 시작합니다 ({self.timeframe}, {self.limit}개 캔들).")
+        matrix = ScanMatrix(symbols, self.timeframe_ms, self.limit)
+        self._fetch_into_matrix(matrix, symbols, self.limit, PRIORITY_BACKFILL)
+        with self._lock:
+            self.matrix = matrix
+        self._emit_results()
+    
+    def _refresh(self):
+        with self._lock:
+            matrix = self.matrix
+        if matrix is None:
+            self._full_scan()
+            return
+        # 마감된 캔들과 새로 시작된 캔들만 필요
+        self._fetch_into_matrix(matrix, matrix.symbols, 2, PRIORITY_POLL)
+        self._emit_results()
+    
+    def _emit_results(self):
+        with self._lock:
+            if self.matrix is None:
+                return
+            results = rank_scan_results(self.matrix, self.conditions)
+        self.signals.results_ready.emit(results)
+    
+    def shutdown(self):
+        self._job_executor.shutdown(wait=False)
+        for future in list(self._futures):
+            future.cancel()
@@ -0,0 +1,60 @@
+"""
+종료 시 화면 상태와 최근 캔들을 저장하고 다음 실행 시 즉시 복원하는 세션 스냅샷 모듈
+"""
+
+import json
+import os
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+
+class SessionSnapshot:
+    """
+    세션 스냅샷 (.npz 파일 하나)
+    
+    state: 심볼, 타임프레임, 보이는 범위, 지표 표시 여부 등 JSON으로 직렬화되는 딕셔너리
+    timestamps: 캔들 타임스탬프 int64 배열 (ms), values: (N, 5) float 배열 (open, high, low, close, volume)
+    """
+    
+    def __init__(self, state, timestamps, values):
+        self.state = state
+        self.timestamps = timestamps
+        self.values = values
+    
+    def rows(self):
+        """캔들 저장소 upsert()용 [[ts, o, h, l, c, v], ...] 배열"""
+        return np.column_stack((self.timestamps.astype(float), self.values))
+    
+    def save(self, path):
+        """임시 파일에 쓴 뒤 교체 (종료 도중 중단되어도 이전 스냅샷 유지)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        state = dict(self.state, version=SNAPSHOT_VERSION)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, state=np.array(json.dumps(state)),
+                     timestamps=self.timestamps.astype(np.int64), values=self.values.astype(np.float64))
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path):
+        """
+        스냅샷 읽기
+        
+        Returns:
+        SessionSnapshot | None: 파일이 없거나 형식이 맞지 않으면 None
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                state = json.loads(str(data['state']))
+                timestamps = data['timestamps']
+                values = data['values']
+        except Exception as e:
+            print(f"세션 스냅샷을 읽을 수 없습니다 ({path}): {e}")
+            return None
+        if state.get('version') != SNAPSHOT_VERSION or values.ndim != 2 or values.shape != (len(timestamps), 5):
+            return None
+        return cls(state, timestamps, values)
@@ -0,0 +1,157 @@
+"""
+프로세스 간 캔들 전달을 위한 공유 메모리 링 버퍼를 정의하는 모듈
+"""
+
+from multiprocessing import shared_memory
+import numpy as np
+
+# 헤더 (int64 x 8): [시퀀스, 캔들 수, 최신 슬롯 인덱스, 용량, 누적 추가 캔들 수, 예약...]
+_HEADER_FIELDS = 8
+_HEADER_BYTES = _HEADER_FIELDS * 8
+_SEQ, _COUNT, _HEAD, _CAPACITY, _APPENDED = 0, 1, 2, 3, 4
+# 행 형식: [timestamp(ms), open, high, low, close, volume]
+ROW_WIDTH = 6
+
+def _attach_untracked(name):
+    """
+    기존 공유 메모리에 연결 (생성한 프로세스만 unlink 하도록 resource_tracker 등록을 피함)
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        return shm
+
+class SharedCandleRing:
+    """
+    단일 writer / 다수 reader 캔들 링 버퍼
+    
+    writer(수집 프로세스)는 최신 캔들을 갱신하거나 다음 슬롯에 추가하고,
+    reader(GUI 프로세스)는 같은 메모리를 NumPy 배열로 매핑하여 복사 없이 접근함.
+    쓰기 중에는 시퀀스 값이 홀수가 되며(seqlock), reader는 시퀀스가 바뀌지 않은
+    상태에서 읽은 값만 사용함.
+    """
+    
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        self.capacity = int(self.header[_CAPACITY])
+        self.rows = np.ndarray((self.capacity, ROW_WIDTH), dtype=np.float64,
+                               buffer=shm.buf, offset=_HEADER_BYTES)
+    
+    @classmethod
+    def create(cls, capacity):
+        """새 링 버퍼 생성 (생성한 쪽이 unlink 책임을 가짐)"""
+        shm = shared_memory.SharedMemory(create=True, size=_HEADER_BYTES + capacity * ROW_WIDTH * 8)
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_HEAD] = -1
+        header[_CAPACITY] = capacity
+        del header
+        return cls(shm, owner=True)
+    
+    @classmethod
+    def attach(cls, name):
+        """다른 프로세스가 만든 링 버퍼에 연결"""
+        return cls(_attach_untracked(name), owner=False)
+    
+    @property
+    def name(self):
+        return self.shm.name
+    
+    @property
+    def sequence(self):
+        return int(self.header[_SEQ])
+    
+    def write(self, candles):
+        """
+        캔들 배치 기록 (writer 전용)
+        최신 캔들과 타임스탬프가 같으면 덮어쓰고, 더 새로우면 다음 슬롯에 추가함.
+        최근 몇 개 슬롯 안의 과거 캔들(마감 캔들의 최종 값 등)도 제자리에서 갱신함.
+        """
+        batch = np.asarray(candles, dtype=np.float64).reshape(-1, ROW_WIDTH)
+        if len(batch) == 0:
+            return
+        batch = batch[np.argsort(batch[:, 0], kind='stable')]
+        header = self.header
+        header[_SEQ] += 1  # 홀수: 쓰기 중
+        try:
+            for row in batch:
+                count = int(header[_COUNT])
+                head = int(header[_HEAD])
+                if count and row[0] <= self.rows[head, 0]:
+                    for back in range(min(count, 4)):
+                        slot = (head - back) % self.capacity
+                        if self.rows[slot, 0] == row[0]:
+                            self.rows[slot] = row
+                            break
+                    continue
+                head = (head + 1) % self.capacity
+                self.rows[head] = row
+                header[_HEAD] = head
+                header[_COUNT] = min(count + 1, self.capacity)
+                header[_APPENDED] += 1
+        finally:
+            header[_SEQ] += 1  # 짝수: 쓰기 완료
+    
+    def read_latest(self, n, retries=100):
+        """
+        최신 캔들 최대 n개를 시간순으로 복사하여 반환 (reader 전용)
+        
+        Returns:
+        numpy.ndarray: (k, 6) 배열, 일관된 스냅샷을 얻지 못하면 None
+        """
+        header = self.header
+        for _ in range(retries):
+            seq_before = int(header[_SEQ])
+            if seq_before % 2:
+                continue
+            count = int(header[_COUNT])
+            head = int(header[_HEAD])
+            k = min(n, count)
+            indices = (np.arange(head - k + 1, head + 1)) % self.capacity
+            rows = self.rows[indices].copy()
+            if int(header[_SEQ]) == seq_before:
+                return rows
+        return None
+    
+    def read_since(self, appended, retries=100):
+        """
+        누적 추가 수가 appended였던 시점 이후의 캔들만 복사하여 반환 (reader 전용)
+        그 시점의 최신 캔들(진행 중 캔들로 이후 갱신될 수 있음)부터 포함하며, appended가 0이면 링 전체를 읽음
+        
+        Returns:
+        tuple: ((k, 6) 배열, 현재 누적 추가 수) - 일관된 스냅샷을 얻지 못하면 배열은 None
+        """
+        header = self.header
+        for _ in range(retries):
+            seq_before = int(header[_SEQ])
+            if seq_before % 2:
+                continue
+            total = int(header[_APPENDED])
+            count = int(header[_COUNT])
+            head = int(header[_HEAD])
+            k = count if appended == 0 else min(total - appended + 1, count)
+            indices = (np.arange(head - k + 1, head + 1)) % self.capacity
+            rows = self.rows[indices].copy()
+            if int(header[_SEQ]) == seq_before:
+                return rows, total
+        return None, appended
+    
+    def close(self):
+        """매핑 해제 (생성한 쪽이면 공유 메모리도 삭제)"""
+        # NumPy 뷰가 버퍼를 참조하면 close()가 실패하므로 먼저 해제
+        self.header = None
+        self.rows = None
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
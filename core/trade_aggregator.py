@@ -0,0 +1,138 @@
+"""
+체결(trade) 스트림을 초 단위 OHLCV 캔들로 집계하는 모듈
+"""
+
+from collections import deque
+import numpy as np
+
+from config.settings import TRADE_LATE_WINDOW_MS, TRADE_MAX_GAP_FILL
+
+# 체결 집계로 만드는 초 단위 타임프레임 (거래소 kline으로 제공되지 않음)
+TRADE_TIMEFRAMES = {'1s': 1_000, '5s': 5_000, '15s': 15_000}
+
+def trades_to_arrays(trades):
+    """ccxt 체결 딕셔너리 리스트 -> (타임스탬프 int64, 가격, 수량) 배열"""
+    timestamps = np.fromiter((t['timestamp'] for t in trades), dtype=np.int64, count=len(trades))
+    prices = np.fromiter((t['price'] for t in trades), dtype=float, count=len(trades))
+    amounts = np.fromiter((t['amount'] for t in trades), dtype=float, count=len(trades))
+    return timestamps, prices, amounts
+
+class TradeAggregator:
+    """
+    체결을 bucket_ms 단위 캔들로 증분 집계
+    
+    - 배치 안의 체결은 타임스탬프로 정렬한 뒤 버킷별로 reduceat 집계하고, 기존 버킷 상태와 병합함
+    - 순서가 뒤바뀐 체결: 버킷별 첫/마지막 체결 시각을 보관해 open/close를 시각 기준으로 결정
+    - 늦게 도착한 체결: 가장 최근 체결 시각(watermark)에서 late_window_ms 이내의 버킷은 계속 갱신하고,
+      그보다 오래된 버킷에 속한 체결은 버림 (late_dropped로 집계)
+    - 체결이 없는 버킷은 직전 종가로 채운 거래량 0 캔들로 생성 (이후 늦은 체결이 오면 대체됨)
+    - 같은 체결 ID가 다시 전달되면 무시함
+    """
+    
+    def __init__(self, bucket_ms, late_window_ms=TRADE_LATE_WINDOW_MS, max_gap_fill=TRADE_MAX_GAP_FILL):
+        self.bucket_ms = bucket_ms
+        self.late_window_ms = late_window_ms
+        self.max_gap_fill = max_gap_fill
+        # 버킷 시작 -> [첫 체결 시각, 마지막 체결 시각, open, high, low, close, volume]
+        self.buckets = {}
+        self.watermark = None
+        self.last_bucket = None
+        self.late_dropped = 0
+        self._seen_ids = set()
+        self._seen_order = deque()
+    
+    def _is_duplicate(self, trade_id):
+        if trade_id is None:
+            return False
+        if trade_id in self._seen_ids:
+            return True
+        self._seen_ids.add(trade_id)
+        self._seen_order.append(trade_id)
+        if len(self._seen_order) > 10000:
+            self._seen_ids.discard(self._seen_order.popleft())
+        return False
+    
+    def _merge(self, bucket, first_ts, last_ts, o, h, l, c, v):
+        state = self.buckets.get(bucket)
+        if state is None or state[6] == 0:
+            # 새 버킷 또는 빈 버킷 채움 캔들 -> 체결 값으로 대체
+            self.buckets[bucket] = [first_ts, last_ts, o, h, l, c, v]
+            return
+        if first_ts < state[0]:
+            state[0], state[2] = first_ts, o
+        if last_ts >= state[1]:
+            state[1], state[5] = last_ts, c
+        state[3] = max(state[3], h)
+        state[4] = min(state[4], l)
+        state[6] += v
+    
+    def add_trades(self, trades):
+        """
+        체결 배치 반영
+        
+        Returns:
+        list: 변경/생성된 캔들 [[bucket_ts(ms), open, high, low, close, volume], ...] (타임스탬프 순)
+        """
+        trades = [t for t in trades if t.get('timestamp') is not None and not self._is_duplicate(t.get('id'))]
+        if not trades:
+            return []
+        timestamps, prices, amounts = trades_to_arrays(trades)
+        order = np.argsort(timestamps, kind='stable')
+        timestamps, prices, amounts = timestamps[order], prices[order], amounts[order]
+        
+        batch_max = int(timestamps[-1])
+        self.watermark = batch_max if self.watermark is None else max(self.watermark, batch_max)
+        horizon = self.watermark - self.late_window_ms
+        
+        # 늦은 체결 중 이미 확정된 버킷에 속하는 것은 버림
+        buckets = timestamps - timestamps % self.bucket_ms
+        accepted = buckets + self.bucket_ms > horizon
+        if self.last_bucket is not None:
+            accepted |= buckets >= self.last_bucket
+        self.late_dropped += int((~accepted).sum())
+        if not accepted.all():
+            timestamps, prices, amounts, buckets = (
+                timestamps[accepted], prices[accepted], amounts[accepted], buckets[accepted]
+            )
+            if len(timestamps) == 0:
+                return []
+        
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(buckets)] - 1
+        highs = np.maximum.reduceat(prices, starts)
+        lows = np.minimum.reduceat(prices, starts)
+        volumes = np.add.reduceat(amounts, starts)
+        
+        changed = set()
+        for i, (start, end) in enumerate(zip(starts, ends)):
+            bucket = int(buckets[start])
+            self._merge(
+                bucket, int(timestamps[start]), int(timestamps[end]),
+                float(prices[start]), float(highs[i]), float(lows[i]), float(prices[end]), float(volumes[i])
+            )
+            changed.add(bucket)
+        
+        changed |= self._fill_gaps(int(buckets[-1]))
+        self._evict(horizon)
+        return [[bucket] + self.buckets[bucket][2:] for bucket in sorted(changed) if bucket in self.buckets]
+    
+    def _fill_gaps(self, newest_bucket):
+        """직전 최신 버킷과 새 최신 버킷 사이의 빈 버킷을 직전 종가로 채움"""
+        filled = set()
+        if self.last_bucket is not None and newest_bucket > self.last_bucket:
+            previous = self.buckets.get(self.last_bucket)
+            missing = (newest_bucket - self.last_bucket) // self.bucket_ms - 1
+            if previous is not None and 0 < missing <= self.max_gap_fill:
+                close = previous[5]
+                for bucket in range(self.last_bucket + self.bucket_ms, newest_bucket, self.bucket_ms):
+                    if bucket not in self.buckets:
+                        self.buckets[bucket] = [float('inf'), float('-inf'), close, close, close, close, 0.0]
+                        filled.add(bucket)
+        if self.last_bucket is None or newest_bucket > self.last_bucket:
+            self.last_bucket = newest_bucket
+        return filled
+    
+    def _evict(self, horizon):
+        """늦은 체결 허용 구간을 벗어난 버킷 상태 제거 (최신 버킷은 직전 종가 참조용으로 유지)"""
+        for bucket in [b for b in self.buckets if b + self.bucket_ms <= horizon and b != self.last_bucket]:
+            del self.buckets[bucket]
@@ -0,0 +1,138 @@
+"""
+watch_trades 체결 스트림을 초 단위 캔들로 집계해 전달하는 워커를 정의하는 모듈
+"""
+
+import asyncio
+import threading
+import time
+import traceback
+import ccxt
+import numpy as np
+
+from core.data_worker import Worker
+from core.trade_aggregator import TradeAggregator, TRADE_TIMEFRAMES, trades_to_arrays
+from utils.latency import CandleBatch
+from config.settings import TRADE_EMIT_INTERVAL_MS
+
+class TradeWorker(Worker):
+    """
+    체결 기반 초 단위 캔들 워커 (1s/5s/15s)
+    Worker와 같은 시그널/정지 방식을 사용하며, new_data로 kline 워커와 같은 형식의 캔들 배치를 보냄.
+    seed_trades가 주어지면 스트림 시작 전에 최근 체결을 받아 집계해 첫 배치로 보냄
+    emit_trades=True이면 trades 시그널로 원시 체결 배열도 보냄 (timeframe=None이면 캔들 집계 없이 체결만 전달)
+    체결 메시지마다 보내지 않고 집계된 캔들(버킷별 최신 상태)과 체결을 모아 TRADE_EMIT_INTERVAL_MS마다 최대 한 번 보냄
+    """
+    
+    def __init__(self, exchange, symbol, timeframe, seed_trades=None, emit_trades=False, emit_interval_ms=TRADE_EMIT_INTERVAL_MS):
+        super().__init__(exchange, symbol, timeframe)
+        self.aggregator = TradeAggregator(TRADE_TIMEFRAMES[timeframe]) if timeframe else None
+        self.seed_trades = seed_trades
+        self.emit_trades = emit_trades
+        self.emit_interval_ms = emit_interval_ms
+        self._pending_rows = {}  # 버킷 ts -> 마지막으로 집계된 캔들 행
+        self._pending_trades = []  # (timestamps, prices, amounts, is_buy) 배열 묶음
+        self._pending_event_time = None
+        self._pending_receive_time = None
+        self._last_emit = 0.0
+    
+    async def stream_async(self):
+        await self.watch_trades_loop_async()
+    
+    def _collect_trades(self, trades):
+        """체결 메시지를 집계해 보낼 묶음에 추가 (간격이 지났으면 바로 전송)"""
+        if not self._is_running:
+            return
+        if self._pending_receive_time is None:
+            self._pending_receive_time = time.time()
+        if self.emit_trades:
+            timestamps, prices, amounts = trades_to_arrays(trades)
+            is_buy = np.fromiter((t.get('side') == 'buy' for t in trades), dtype=bool, count=len(trades))
+            self._pending_trades.append((timestamps, prices, amounts, is_buy))
+        if self.aggregator is not None:
+            for row in self.aggregator.add_trades(trades):
+                self._pending_rows[row[0]] = row
+            event_time = max(t['timestamp'] for t in trades) / 1000
+            self._pending_event_time = max(event_time, self._pending_event_time or 0.0)
+        if (time.time() - self._last_emit) * 1000 >= self.emit_interval_ms:
+            self._flush()
+    
+    def _flush(self):
+        """모아 둔 체결과 캔들을 한 번에 전송"""
+        if not self._is_running or self._pending_receive_time is None:
+            return
+        self._last_emit = time.time()
+        if self._pending_trades:
+            parts = self._pending_trades
+            self._pending_trades = []
+            self.signals.trades.emit(tuple(
+                parts[0][i] if len(parts) == 1 else np.concatenate([part[i] for part in parts]) for i in range(4)
+            ))
+        if self._pending_rows:
+            rows = [self._pending_rows[ts] for ts in sorted(self._pending_rows)]
+            self._pending_rows = {}
+            self.signals.new_data.emit(CandleBatch(rows, event_time=self._pending_event_time, receive_time=self._pending_receive_time))
+        self._pending_event_time = None
+        self._pending_receive_time = None
+    
+    async def flush_loop_async(self):
+        """새 체결이 뜸해도 모아 둔 묶음이 간격 이상 머물지 않도록 주기적으로 전송"""
+        while self._is_running:
+            await asyncio.sleep(self.emit_interval_ms / 1000)
+            self._flush()
+    
+    async def watch_trades_loop_async(self):
+        thread_id = threading.get_ident()
+        print(f"Starting watch_trades_loop_async for {self.symbol} ({self.timeframe} candles) in thread {thread_id}")
+        try:
+            if not self.exchange or not self.exchange.has.get('watchTrades'):
+                error_msg = "ccxtpro exchange object not initialized or does not support watch_trades."
+                print(f"ERROR: {error_msg}")
+                self.signals.error.emit(error_msg)
+                return
+            
+            if self.seed_trades:
+                # 요청 스케줄러를 거치는 동기 REST 호출이므로 기본 실행기에서 실행
+                try:
+                    trades = await asyncio.get_running_loop().run_in_executor(None, self.seed_trades)
+                    if trades:
+                        self._collect_trades(trades)
+                        self._flush()
+                        print(f"{len(trades)}개의 최근 체결로 {self.timeframe} 캔들을 초기화했습니다.")
+                except Exception as e:
+                    print(f"최근 체결 로드 실패 ({self.symbol}): {e}")
+            
+            flush_task = asyncio.create_task(self.flush_loop_async())
+            while self._is_running:
+                try:
+                    trades = await self.exchange.watch_trades(self.symbol)
+                    if self._is_running and trades:
+                        self._collect_trades(trades)
+                except asyncio.CancelledError:
+                    print(f"watch_trades_loop_async for {self.symbol} in thread {thread_id} was cancelled.")
+                    self._is_running = False
+                    break
+                except (ccxt.NetworkError, ccxt.ExchangeError) as e:
+                    if not self._is_running:
+                        break
+                    error_msg = f"{type(e).__name__} in watch_trades_loop_async ({self.symbol}): {e}"
+                    print(f"WARNING: {error_msg}")
+                    self.signals.error.emit(error_msg)
+                    await asyncio.sleep(5)
+                except Exception as e:
+                    if self._is_running:
+                        error_msg = f"Error in watch_trades_loop_async ({self.symbol}, thread {thread_id}): {type(e).__name__} - {e}"
+                        print(error_msg)
+                        traceback.print_exc()
+                        self.signals.error.emit(error_msg)
+                        self._is_running = False
+                    break
+            
+            flush_task.cancel()
+            if self.aggregator is not None and self.aggregator.late_dropped:
+                print(f"{self.symbol}: 늦게 도착해 버린 체결 {self.aggregator.late_dropped}건")
+        finally:
+            try:
+                await self.close_exchange_async()
+            except Exception as e_close:
+                print(f"Error closing exchange for {self.symbol} in watch_trades_loop_async: {type(e_close).__name__} - {e_close}")
+            print(f"Exited watch_trades_loop_async for {self.symbol} in thread {thread_id}.")
@@ -0,0 +1,220 @@
+"""
+가격대별 거래량(볼륨 프로파일)과 캔들별 풋프린트를 증분 집계하는 모듈
+"""
+
+import numpy as np
+
+from config.settings import PROFILE_STEP_RATIO, PROFILE_MAX_CANDLES, PROFILE_MAX_BINS
+
+class VolumeProfile:
+    """
+    캔들 x 가격 구간 거래량 행렬과 캔들 방향 누적합(prefix sum)
+    
+    - 체결 스트림 시작 이후의 캔들(exact_from 이후)은 체결마다 매수/매도 구간에 더하는 정확한 풋프린트
+    - 그 이전 캔들은 OHLCV 거래량을 고가~저가 구간에 균등 분배한 추정치
+    - 두 행렬 모두 cum[i] = 0..i-1번째 캔들 합계를 유지하므로 임의 구간 프로파일은
+      cum[hi] - cum[lo]로 체결을 다시 훑지 않고 구함. 최신 캔들에 체결이 더해지면 누적합은 마지막 행만 바뀜
+    - 가격 구간 수는 max_bins 이하로 유지: 구간 폭은 로드된 가격 범위에서 정하고, 가격이 범위를 벗어나
+      상한을 넘으면 구간 폭을 정수배로 넓혀 인접 구간을 합침 (거래량 합계와 누적합 관계는 그대로 유지됨)
+    """
+    
+    def __init__(self, candle_ms, step_ratio=PROFILE_STEP_RATIO, max_candles=PROFILE_MAX_CANDLES, max_bins=PROFILE_MAX_BINS):
+        self.candle_ms = candle_ms
+        self.step_ratio = step_ratio
+        self.max_candles = max_candles
+        self.max_bins = max_bins
+        self.price_step = None
+        self.first_bin = 0
+        self.bins = 0
+        self.exact_from = None  # 체결로 집계하는 첫 캔들 타임스탬프 (ms)
+        self.version = 0
+        # 체결 기반 풋프린트
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.buy = np.empty((0, 0), dtype=np.float32)
+        self.sell = np.empty((0, 0), dtype=np.float32)
+        self.cum = np.zeros((1, 0), dtype=float)
+        # OHLCV 기반 추정치
+        self.estimate_timestamps = np.empty(0, dtype=np.int64)
+        self.estimate_cum = np.zeros((1, 0), dtype=float)
+    
+    def _init_grid(self, price, low, high):
+        """첫 데이터로 구간 폭 결정 (가격 비율 폭과, 가격 범위가 상한의 절반에 들어가는 폭 중 큰 값)"""
+        if self.price_step is None:
+            self.price_step = max(price * self.step_ratio, (high - low) / (self.max_bins // 2))
+            self.first_bin = int(price // self.price_step)
+    
+    def _rebin(self, factor):
+        """구간 폭을 factor배로 넓히고 새 구간에 속하는 기존 열들을 합침"""
+        if self.bins:
+            new_bins = (self.first_bin + np.arange(self.bins)) // factor
+            starts = np.flatnonzero(np.r_[True, np.diff(new_bins) > 0])
+            self.buy = np.add.reduceat(self.buy, starts, axis=1)
+            self.sell = np.add.reduceat(self.sell, starts, axis=1)
+            self.cum = np.add.reduceat(self.cum, starts, axis=1)
+            self.estimate_cum = np.add.reduceat(self.estimate_cum, starts, axis=1)
+            self.first_bin, self.bins = int(new_bins[0]), len(starts)
+        else:
+            self.first_bin //= factor
+        self.price_step *= factor
+        self.version += 1
+    
+    def _ensure_prices(self, low, high):
+        """가격 [low, high]가 들어가도록 모든 행렬의 열을 확장 (여유분 포함, 구간 수가 상한을 넘으면 병합)"""
+        lo = min(int(low // self.price_step), self.first_bin)
+        hi = max(int(high // self.price_step) + 1, self.first_bin + self.bins)
+        if hi - lo > self.max_bins:
+            self._rebin(-(-(hi - lo) // self.max_bins))
+            return self._ensure_prices(low, high)
+        if lo == self.first_bin and hi == self.first_bin + self.bins:
+            return
+        margin = min(max((hi - lo) // 4, 8), (self.max_bins - (hi - lo)) // 2)
+        lo = lo - margin if lo < self.first_bin else lo
+        hi = hi + margin if hi > self.first_bin + self.bins else hi
+        left, right = self.first_bin - lo, hi - (self.first_bin + self.bins)
+        pad = ((0, 0), (left, right))
+        self.buy = np.pad(self.buy, pad)
+        self.sell = np.pad(self.sell, pad)
+        self.cum = np.pad(self.cum, pad)
+        self.estimate_cum = np.pad(self.estimate_cum, pad)
+        self.first_bin, self.bins = lo, hi - lo
+    
+    def _bin_index(self, prices):
+        return (np.asarray(prices, dtype=float) // self.price_step).astype(np.int64)
+    
+    def set_candle_estimates(self, timestamps, highs, lows, volumes):
+        """exact_from 이전 캔들의 추정 프로파일을 OHLCV로 다시 계산 (차분 배열로 벡터화)"""
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if self.exact_from is not None:
+            keep = timestamps < self.exact_from
+            timestamps, highs, lows, volumes = timestamps[keep], highs[keep], lows[keep], volumes[keep]
+        if len(timestamps) > self.max_candles:
+            timestamps, highs, lows, volumes = (
+                timestamps[-self.max_candles:], highs[-self.max_candles:],
+                lows[-self.max_candles:], volumes[-self.max_candles:]
+            )
+        if len(timestamps) == 0:
+            self.estimate_timestamps = np.empty(0, dtype=np.int64)
+            self.estimate_cum = np.zeros((1, self.bins), dtype=float)
+            self.version += 1
+            return
+        
+        self._init_grid(float(np.median(lows)), float(np.min(lows)), float(np.max(highs)))
+        self._ensure_prices(float(np.min(lows)), float(np.max(highs)))
+        lo_bins, hi_bins = self._bin_index(lows), self._bin_index(highs)
+        lo_bins, hi_bins = lo_bins - self.first_bin, hi_bins - self.first_bin
+        
+        per_bin = np.asarray(volumes, dtype=float) / (hi_bins - lo_bins + 1)
+        rows = np.arange(len(timestamps))
+        diff = np.zeros((len(timestamps), self.bins + 1), dtype=float)
+        np.add.at(diff, (rows, lo_bins), per_bin)
+        np.add.at(diff, (rows, hi_bins + 1), -per_bin)
+        matrix = np.cumsum(diff[:, :-1], axis=1)
+        
+        self.estimate_timestamps = timestamps
+        self.estimate_cum = np.vstack((np.zeros((1, self.bins)), np.cumsum(matrix, axis=0)))
+        self.version += 1
+    
+    def _ensure_candle(self, bucket):
+        """bucket 캔들 행이 있으면 인덱스 반환, 최신 캔들 이후면 새 행 추가"""
+        if len(self.timestamps) and bucket <= self.timestamps[-1]:
+            i = int(np.searchsorted(self.timestamps, bucket))
+            if i < len(self.timestamps) and self.timestamps[i] == bucket:
+                return i
+            # 체결이 없었던 과거 캔들 (늦은 체결) -> 정렬 위치에 삽입
+            self.timestamps = np.insert(self.timestamps, i, bucket)
+            self.buy = np.insert(self.buy, i, 0, axis=0)
+            self.sell = np.insert(self.sell, i, 0, axis=0)
+            self.cum = np.insert(self.cum, i + 1, self.cum[i], axis=0)
+            return i
+        self.timestamps = np.append(self.timestamps, bucket)
+        zeros = np.zeros((1, self.bins), dtype=np.float32)
+        self.buy = np.vstack((self.buy, zeros))
+        self.sell = np.vstack((self.sell, zeros))
+        self.cum = np.vstack((self.cum, self.cum[-1:]))
+        return len(self.timestamps) - 1
+    
+    def _trim(self):
+        """보관 캔들 수 제한 (가장 오래된 캔들부터 제거하고 누적합 기준 이동)"""
+        extra = len(self.timestamps) - self.max_candles
+        if extra <= 0:
+            return
+        self.timestamps = self.timestamps[extra:]
+        self.buy = self.buy[extra:]
+        self.sell = self.sell[extra:]
+        self.cum = self.cum[extra:] - self.cum[extra]
+    
+    def add_trades(self, timestamps, prices, amounts, is_buy):
+        """
+        체결 배치 반영
+        체결 스트림의 첫 체결이 속한 캔들은 일부만 관측되므로 그 다음 캔들부터 집계함
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if len(timestamps) == 0:
+            return
+        prices = np.asarray(prices, dtype=float)
+        amounts = np.asarray(amounts, dtype=float)
+        is_buy = np.asarray(is_buy, dtype=bool)
+        buckets = timestamps - timestamps % self.candle_ms
+        if self.exact_from is None:
+            self.exact_from = int(buckets.min()) + self.candle_ms
+            # 정확한 집계로 넘어가는 캔들부터는 추정치를 제외
+            n = int(np.searchsorted(self.estimate_timestamps, self.exact_from))
+            self.estimate_timestamps = self.estimate_timestamps[:n]
+            self.estimate_cum = self.estimate_cum[:n + 1]
+        keep = buckets >= self.exact_from
+        if not keep.any():
+            return
+        buckets, prices, amounts, is_buy = buckets[keep], prices[keep], amounts[keep], is_buy[keep]
+        
+        self._init_grid(float(prices[0]), float(prices.min()), float(prices.max()))
+        self._ensure_prices(float(prices.min()), float(prices.max()))
+        bins = self._bin_index(prices) - self.first_bin
+        
+        first_changed = None
+        for bucket in np.unique(buckets):
+            row = self._ensure_candle(int(bucket))
+            first_changed = row if first_changed is None else min(first_changed, row)
+        rows = np.searchsorted(self.timestamps, buckets)
+        np.add.at(self.buy, (rows[is_buy], bins[is_buy]), amounts[is_buy])
+        np.add.at(self.sell, (rows[~is_buy], bins[~is_buy]), amounts[~is_buy])
+        
+        # 변경된 첫 캔들 이후의 누적합만 다시 계산 (실시간이면 마지막 행 하나)
+        i = first_changed
+        self.cum[i + 1:] = self.cum[i] + np.cumsum(self.buy[i:] + self.sell[i:], axis=0)
+        self._trim()
+        self.version += 1
+    
+    def profile(self, start_ms, end_ms):
+        """
+        [start_ms, end_ms] 구간 캔들의 가격대별 거래량
+        
+        Returns:
+        tuple: (구간 하단 가격 배열, 거래량 배열) - 데이터가 없으면 빈 배열
+        """
+        if self.bins == 0:
+            return np.empty(0), np.empty(0)
+        total = np.zeros(self.bins, dtype=float)
+        for timestamps, cum in ((self.timestamps, self.cum), (self.estimate_timestamps, self.estimate_cum)):
+            lo = np.searchsorted(timestamps, start_ms)
+            hi = np.searchsorted(timestamps, end_ms, side='right')
+            if hi > lo:
+                total += cum[hi] - cum[lo]
+        prices = (self.first_bin + np.arange(self.bins)) * self.price_step
+        return prices, total
+    
+    def footprints(self, start_ms, end_ms):
+        """
+        [start_ms, end_ms] 구간 체결 기반 캔들들의 풋프린트
+        
+        Returns:
+        tuple: (캔들 타임스탬프 배열, 가격 배열, 매수 (캔들 x 가격), 매도 (캔들 x 가격))
+               - 구간 안에서 한 번이라도 거래가 있던 가격 구간만 포함
+        """
+        lo = np.searchsorted(self.timestamps, start_ms)
+        hi = np.searchsorted(self.timestamps, end_ms, side='right')
+        buy, sell = self.buy[lo:hi], self.sell[lo:hi]
+        if hi <= lo:
+            return self.timestamps[lo:hi], np.empty(0), buy, sell
+        active = np.flatnonzero((buy > 0).any(axis=0) | (sell > 0).any(axis=0))
+        prices = (self.first_bin + active) * self.price_step
+        return self.timestamps[lo:hi], prices, buy[:, active], sell[:, active]
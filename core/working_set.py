@@ -0,0 +1,69 @@
+"""
+최근에 본 차트의 피드 구독과 뷰 상태를 백그라운드에 유지하는 LRU 작업 집합 모듈
+"""
+
+from collections import OrderedDict
+
+from config.settings import WARM_CHART_COUNT, WARM_MAX_BYTES
+
+class WarmChart:
+    """작업 집합에 보관된 차트 하나 (허브 피드 구독 + 창별 뷰 상태)"""
+    
+    def __init__(self, feed, data_df, x_range, history_exhausted):
+        self.feed = feed
+        self.data_df = data_df
+        self.version = feed.candle_store.version  # data_df를 만든 시점의 저장소 버전
+        self.x_range = x_range
+        self.history_exhausted = history_exhausted
+    
+    @property
+    def nbytes(self):
+        return self.feed.candle_store.nbytes + int(self.data_df.memory_usage(index=True).sum())
+
+class ChartWorkingSet:
+    """
+    (심볼, 타임프레임) 차트의 LRU 작업 집합
+    
+    창이 다른 차트로 전환할 때 이전 피드를 해제하지 않고 park()로 보관하면 허브 구독이 유지되어
+    스트림이 계속 캔들 저장소를 갱신하고, 같은 시리즈의 지표 결과도 허브의 지표 캐시에 남음.
+    take()로 다시 꺼내면 네트워크 요청이나 재계산 없이 뷰만 다시 연결할 수 있음.
+    보관 수(연결 예산)와 메모리 합계가 한도를 넘으면 가장 오래 사용하지 않은 차트부터 구독을 해제함
+    """
+    
+    def __init__(self, hub, max_charts=WARM_CHART_COUNT, max_bytes=WARM_MAX_BYTES):
+        self.hub = hub
+        self.max_charts = max_charts
+        self.max_bytes = max_bytes
+        self._charts = OrderedDict()  # (심볼, 타임프레임) -> WarmChart
+    
+    def __len__(self):
+        return len(self._charts)
+    
+    def keys(self):
+        return list(self._charts)
+    
+    def park(self, chart):
+        """차트 보관 (이미 있으면 교체) 후 한도 적용"""
+        previous = self._charts.pop(chart.feed.key, None)
+        if previous is not None and previous.feed is not chart.feed:
+            self.hub.unsubscribe(previous.feed)
+        self._charts[chart.feed.key] = chart
+        self._enforce()
+    
+    def take(self, symbol, timeframe):
+        """보관된 차트 꺼내기 (구독은 호출한 쪽으로 넘어감), 없으면 None"""
+        return self._charts.pop((symbol, timeframe), None)
+    
+    def _enforce(self):
+        total = sum(chart.nbytes for chart in self._charts.values())
+        while self._charts and (len(self._charts) > self.max_charts or total > self.max_bytes):
+            key, chart = self._charts.popitem(last=False)
+            total -= chart.nbytes
+            self.hub.unsubscribe(chart.feed)
+            print(f"작업 집합에서 {key[0]} {key[1]} 차트를 해제했습니다.")
+    
+    def clear(self):
+        """모든 보관 차트 구독 해제"""
+        while self._charts:
+            _, chart = self._charts.popitem(last=False)
+            self.hub.unsubscribe(chart.feed)
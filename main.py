@@ -9,6 +9,6 @@ from ui.app import MainWindow
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     pg.setConfigOptions(antialias=True)
-    main_win = MainWindow()
+    main_win = MainWindow(restore_session=True)
     main_win.show()
     sys.exit(app.exec()) 
\ No newline at end of file
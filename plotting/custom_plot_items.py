@@ -2,15 +2,29 @@
 커스텀 pyqtgraph 플롯 아이템(캔들스틱, 날짜 축 등)을 정의하는 모듈
 """
 
+import numpy as np
 import pyqtgraph as pg
-from PyQt6.QtCore import QRectF, QPointF
+from PyQt6.QtCore import QRectF
 from PyQt6.QtGui import QPainter # QBrush, QPen are used via pg.mkBrush/mkPen
 from datetime import datetime
+from functools import lru_cache
+import math
+import time
+
+def _rects_path(left, right, bottom, top):
+    """사각형들을 하나의 QPainterPath로 생성 (사각형마다 닫힌 5점 경로)"""
+    xs = np.column_stack((left, right, right, left, left)).ravel()
+    ys = np.column_stack((bottom, bottom, top, top, bottom)).ravel()
+    connect = np.tile(np.array([1, 1, 1, 1, 0], dtype=np.int32), len(left))
+    return pg.arrayToQPath(xs, ys, connect=connect)
 
 # CandlestickItem class
 class CandlestickItem(pg.GraphicsObject):
     # Timeframe seconds mapping
     TIMEFRAME_SECONDS = {
+        '1s': 1,
+        '5s': 5,
+        '15s': 15,
         '1m': 60,
         '3m': 180,
         '5m': 300,
@@ -26,13 +40,36 @@ class CandlestickItem(pg.GraphicsObject):
         '1w': 604800
     }
     
+    # 캔들 그리기에 필요한 필드
+    FIELDS = ('time', 'open', 'high', 'low', 'close')
+
     def __init__(self, data, timeframe='1h'):
         super().__init__()
-        self.data = data  # data is a list of dicts: {'time': t, 'open': o, 'high': h, 'low': l, 'close': c}
         self.timeframe = timeframe
         self.update_bar_width()  # Set bar_width_seconds based on timeframe
+        # 캔들마다 새로 만들지 않도록 펜/브러시를 미리 생성
+        self.outline_pen = pg.mkPen('w')
+        self.bull_brush = pg.mkBrush('g')
+        self.bear_brush = pg.mkBrush('r')
+        self._bounds = QRectF()
+        self.paint_callback = None  # 페인트 시 호출 (지연 추적용)
+        self.set_arrays(data)
         self.generatePicture()
     
+    def set_arrays(self, data):
+        """
+        캔들 데이터를 필드별 NumPy 배열로 변환하여 저장
+        data는 {'time', 'open', 'high', 'low', 'close'} 딕셔너리의 리스트이거나
+        같은 키를 가진 배열 매핑(dict, DataFrame 등)
+        """
+        if data is None or (isinstance(data, (list, tuple)) and len(data) == 0):
+            self.arrays = {k: np.empty(0, dtype=float) for k in self.FIELDS}
+        elif isinstance(data, (list, tuple)):
+            self.arrays = {k: np.fromiter((d[k] for d in data), dtype=float, count=len(data)) for k in self.FIELDS}
+        else:
+            self.arrays = {k: np.asarray(data[k], dtype=float) for k in self.FIELDS}
+        self.count = len(self.arrays['time'])
+    
     def update_bar_width(self):
         """Calculate bar width in seconds based on timeframe"""
         tf_seconds = self.TIMEFRAME_SECONDS.get(self.timeframe, 3600)  # Default to 1h if unknown
@@ -44,9 +81,9 @@ class CandlestickItem(pg.GraphicsObject):
         if timeframe != self.timeframe:
             self.timeframe = timeframe
             self.update_bar_width()
-            if self.data:  # Only regenerate if we have data
-                self.generatePicture()
+            if self.count:  # Only regenerate if we have data
                 self.prepareGeometryChange()
+                self.generatePicture()
                 self.update()
             return True
         return False
@@ -54,80 +91,267 @@ class CandlestickItem(pg.GraphicsObject):
     def generatePicture(self):
         picture = pg.QtGui.QPicture()
         p = pg.QtGui.QPainter(picture)
-        p.setPen(pg.mkPen('w')) # Default pen for outlines
+        p.setPen(self.outline_pen) # Default pen for outlines
 
-        if not self.data:
+        if not self.count:
             p.end()
             self.picture = picture
+            self._bounds = QRectF()
             return
 
-        for d in self.data:
-            time_val = d['time'] # Use actual timestamp for x-coordinate
-            open_price = d['open']
-            high_price = d['high']
-            low_price = d['low']
-            close_price = d['close']
-
-            # Draw wick (high-low line)
-            p.drawLine(QPointF(time_val, low_price), QPointF(time_val, high_price))
-
-            # Draw body (open-close rectangle)
-            if open_price < close_price: # Bullish candle
-                p.setBrush(pg.mkBrush('g'))
-            else: # Bearish candle
-                p.setBrush(pg.mkBrush('r'))
-            
-            body_top = max(open_price, close_price)
-            body_bottom = min(open_price, close_price)
-            p.drawRect(QRectF(time_val - self.bar_width_seconds / 2, body_bottom, self.bar_width_seconds, body_top - body_bottom))
+        times = self.arrays['time']
+        opens = self.arrays['open']
+        highs = self.arrays['high']
+        lows = self.arrays['low']
+        closes = self.arrays['close']
+        half_width = self.bar_width_seconds / 2
+
+        # 심지 (high-low 선): 모든 캔들을 'pairs' 경로 하나로 그림
+        wick_x = np.repeat(times, 2)
+        wick_y = np.column_stack((lows, highs)).ravel()
+        p.drawPath(pg.arrayToQPath(wick_x, wick_y, connect='pairs'))
+
+        # 몸통 (open-close 사각형): 상승/하락별로 경로 하나씩
+        body_bottom = np.minimum(opens, closes)
+        body_top = np.maximum(opens, closes)
+        bullish = opens < closes
+        for mask, brush in ((bullish, self.bull_brush), (~bullish, self.bear_brush)):
+            if not mask.any():
+                continue
+            p.setBrush(brush)
+            left = times[mask] - half_width
+            p.drawPath(_rects_path(left, left + self.bar_width_seconds, body_bottom[mask], body_top[mask]))
         
         p.end()
         self.picture = picture
 
+        min_time = float(times.min())
+        max_time = float(times.max())
+        min_low = float(lows.min())
+        max_high = float(highs.max())
+        self._bounds = QRectF(min_time - half_width, min_low,
+                              max_time - min_time + self.bar_width_seconds, max_high - min_low)
+
     def paint(self, painter, option, widget=None):
         self.picture.play(painter)
+        if self.paint_callback is not None:
+            self.paint_callback()
 
     def boundingRect(self):
-        if not self.data:
-            return QRectF()
-        
-        # Ensure data is not empty before trying to access min/max
-        if not all(isinstance(d, dict) and all(k in d for k in ('time', 'low', 'high')) for d in self.data):
-            # print("Warning: CandlestickItem.boundingRect received malformed data.") # Debugging
-            return QRectF() # Return empty if data is malformed or not ready
-        
-        try:
-            min_time = min(d['time'] for d in self.data)
-            max_time = max(d['time'] for d in self.data)
-            min_low = min(d['low'] for d in self.data)
-            max_high = max(d['high'] for d in self.data)
-        except (ValueError, TypeError) as e: # Handle cases where data might be temporarily empty or invalid
-            # print(f"Warning: CandlestickItem.boundingRect error during min/max: {e}") # Debugging
-            return QRectF()
-
-        return QRectF(min_time - self.bar_width_seconds / 2, min_low, 
-                      max_time - min_time + self.bar_width_seconds, max_high - min_low)
+        # generatePicture에서 계산해 둔 경계를 그대로 반환
+        return QRectF(self._bounds)
 
     def setData(self, data):
-        self.data = data
-        self.generatePicture()
         self.prepareGeometryChange() # Important for QGraphicsObject when bounds change
+        self.set_arrays(data)
+        self.generatePicture()
         self.update() # Triggers a repaint
 
+class VolumeProfileItem(pg.GraphicsObject):
+    """
+    가격대별 거래량 막대와 캔들별 풋프린트를 그리는 오버레이
+    
+    - 프로파일: 보이는 X 범위의 오른쪽 끝에 붙은 가로 막대 (길이는 뷰 폭 대비 비율)
+    - 풋프린트: 캔들 중심에서 왼쪽은 매도, 오른쪽은 매수 거래량 막대 (캔들 폭의 절반까지)
+    막대 종류별로 QPainterPath 하나씩 만들어 QPicture에 담아 둠
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.profile_brush = pg.mkBrush(100, 150, 255, 70)
+        self.buy_brush = pg.mkBrush(0, 200, 0, 120)
+        self.sell_brush = pg.mkBrush(220, 0, 0, 120)
+        self.no_pen = pg.mkPen(None)
+        self.picture = pg.QtGui.QPicture()
+        self._bounds = QRectF()
+    
+    def setData(self, price_step, profile=None, view_x=None, width_fraction=0.2,
+                footprints=None, candle_seconds=60):
+        """
+        Parameters:
+        price_step (float): 가격 구간 폭
+        profile (tuple): (구간 하단 가격 배열, 거래량 배열)
+        view_x (tuple): 현재 보이는 X 범위 (초)
+        footprints (tuple): VolumeProfile.footprints() 결과 (타임스탬프는 ms)
+        candle_seconds (float): 캔들 하나의 시간 폭 (초)
+        """
+        self.prepareGeometryChange()
+        picture = pg.QtGui.QPicture()
+        p = pg.QtGui.QPainter(picture)
+        p.setPen(self.no_pen)
+        bounds = QRectF()
+        
+        if profile is not None and view_x is not None and len(profile[1]) and profile[1].max() > 0:
+            prices, volumes = profile
+            mask = volumes > 0
+            prices, volumes = prices[mask], volumes[mask]
+            right = view_x[1]
+            left = right - (view_x[1] - view_x[0]) * width_fraction * volumes / volumes.max()
+            p.setBrush(self.profile_brush)
+            p.drawPath(_rects_path(left, np.full(len(left), right), prices, prices + price_step))
+            bounds = bounds.united(QRectF(float(left.min()), float(prices.min()),
+                                          float(right - left.min()), float(prices.max() - prices.min() + price_step)))
+        
+        if footprints is not None and len(footprints[1]):
+            timestamps, prices, buy, sell = footprints
+            scale = max(float(buy.max()), float(sell.max())) or 1.0
+            half = candle_seconds * 0.45
+            centers = np.repeat(timestamps / 1000.0, len(prices))
+            bottoms = np.tile(prices, len(timestamps))
+            tops = bottoms + price_step * 0.9
+            for values, sign, brush in ((buy.ravel(), 1, self.buy_brush), (sell.ravel(), -1, self.sell_brush)):
+                mask = values > 0
+                if not mask.any():
+                    continue
+                ends = centers[mask] + sign * half * values[mask] / scale
+                p.setBrush(brush)
+                p.drawPath(_rects_path(np.minimum(centers[mask], ends), np.maximum(centers[mask], ends),
+                                       bottoms[mask], tops[mask]))
+            bounds = bounds.united(QRectF(float(timestamps[0] / 1000.0 - half), float(prices.min()),
+                                          float((timestamps[-1] - timestamps[0]) / 1000.0 + 2 * half),
+                                          float(prices.max() - prices.min() + price_step)))
+        
+        p.end()
+        self.picture = picture
+        self._bounds = bounds
+        self.update()
+    
+    def clear(self):
+        self.prepareGeometryChange()
+        self.picture = pg.QtGui.QPicture()
+        self._bounds = QRectF()
+        self.update()
+    
+    def paint(self, painter, option, widget=None):
+        self.picture.play(painter)
+    
+    def boundingRect(self):
+        return QRectF(self._bounds)
+
+# DateAxisItem 눈금 간격 후보 (초 단위, 월 단위)
+# 월 단위 간격은 선택용 근사치(초)와 실제 월 수를 함께 가짐
+_MONTH_SECONDS = 30 * 86400
+TICK_SPACINGS = [
+    (1, 0), (5, 0), (15, 0), (30, 0),
+    (60, 0), (5 * 60, 0), (15 * 60, 0), (30 * 60, 0),
+    (3600, 0), (2 * 3600, 0), (4 * 3600, 0), (6 * 3600, 0), (12 * 3600, 0),
+    (86400, 0), (2 * 86400, 0), (604800, 0), (2 * 604800, 0),
+    (_MONTH_SECONDS, 1), (3 * _MONTH_SECONDS, 3), (6 * _MONTH_SECONDS, 6), (12 * _MONTH_SECONDS, 12),
+]
+# 1970-01-01은 목요일이므로 주 단위 눈금은 월요일(1970-01-05)에 맞춤
+WEEK_ANCHOR_OFFSET = 4 * 86400
+
+
+def _local_utc_offset(value):
+    """주어진 시각의 로컬 타임존 UTC 오프셋(초)"""
+    try:
+        return time.localtime(value).tm_gmtoff
+    except (OverflowError, OSError, ValueError):
+        return 0
+
+
+def _month_ticks(min_val, max_val, months):
+    """min_val ~ max_val 구간의 월 경계(로컬 시간 1일 0시) 눈금 생성"""
+    try:
+        start = datetime.fromtimestamp(min_val)
+    except (OverflowError, OSError, ValueError):
+        return []
+    index = start.year * 12 + start.month - 1
+    index = -(-index // months) * months  # months 배수로 올림
+    values = []
+    while True:
+        year, month = divmod(index, 12)
+        if year < 1 or year > 9999:
+            break
+        ts = datetime(year, month + 1, 1).timestamp()
+        if ts > max_val:
+            break
+        if ts >= min_val:
+            values.append(ts)
+        index += months
+    return values
+
+
+def _local_to_timestamp(local_seconds):
+    """로컬 벽시계 시각(UTC로 해석한 초)을 타임스탬프로 변환 (그 시각의 일광 절약 시간 오프셋 적용)"""
+    try:
+        return time.mktime(tuple(time.gmtime(local_seconds))[:8] + (-1,))
+    except (OverflowError, OSError, ValueError):
+        return local_seconds
+
+
+def _snapped_ticks(min_val, max_val, seconds, months):
+    """
+    분/시간/일/주/월 경계에 맞춘 눈금 위치 계산
+    경계는 로컬 벽시계 시각에서 맞춘 뒤 눈금마다 타임스탬프로 되돌리므로
+    일광 절약 시간 전환을 걸치는 구간에서도 로컬 자정/정시에 눈금이 놓임
+    """
+    if months:
+        return _month_ticks(min_val, max_val, months)
+    anchor = WEEK_ANCHOR_OFFSET if seconds % 604800 == 0 else 0
+    local_min = min_val + _local_utc_offset(min_val)
+    local_max = max_val + _local_utc_offset(max_val)
+    local = math.ceil((local_min - anchor) / seconds) * seconds + anchor
+    values = []
+    while local <= local_max:
+        value = _local_to_timestamp(local)
+        # 전환 시점에 없는/중복되는 벽시계 시각은 건너뜀
+        if min_val <= value <= max_val and (not values or value > values[-1]):
+            values.append(value)
+        local += seconds
+    return values
+
+
+@lru_cache(maxsize=4096)
+def _format_tick(value, spacing):
+    """(값, 간격) 단위로 캐시되는 눈금 문자열 포맷팅"""
+    try:
+        dt = datetime.fromtimestamp(value)
+    except (OverflowError, OSError, ValueError):
+        return ''
+    if spacing >= 12 * _MONTH_SECONDS:
+        return dt.strftime('%Y')
+    if spacing >= _MONTH_SECONDS:
+        return dt.strftime('%Y-%m')
+    if spacing >= 86400:
+        return dt.strftime('%m-%d')
+    if dt.hour == 0 and dt.minute == 0 and dt.second == 0:
+        # 일중 간격에서 날짜가 바뀌는 눈금은 날짜로 표시
+        return dt.strftime('%m-%d')
+    if spacing >= 60:
+        return dt.strftime('%H:%M')
+    return dt.strftime('%H:%M:%S')
+
+
 # DateAxisItem class
 class DateAxisItem(pg.AxisItem):
+    # 라벨 하나가 차지하는 최소 픽셀 폭
+    MIN_TICK_PIXELS = 80
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setLabel(text='Time', units=None)
         self.enableAutoSIPrefix(False)
 
+    def tickValues(self, minVal, maxVal, size):
+        """보이는 구간 길이에 맞는 간격을 골라 달력 경계에 스냅된 눈금 반환"""
+        if maxVal <= minVal or size <= 0:
+            return []
+        span = maxVal - minVal
+        max_ticks = max(size / self.MIN_TICK_PIXELS, 1.0)
+
+        major_index = len(TICK_SPACINGS) - 1
+        for i, (seconds, _) in enumerate(TICK_SPACINGS):
+            if span / seconds <= max_ticks:
+                major_index = i
+                break
+
+        seconds, months = TICK_SPACINGS[major_index]
+        levels = [(seconds, _snapped_ticks(minVal, maxVal, seconds, months))]
+        if major_index > 0:
+            minor_seconds, minor_months = TICK_SPACINGS[major_index - 1]
+            levels.append((minor_seconds, _snapped_ticks(minVal, maxVal, minor_seconds, minor_months)))
+        return levels
+
     def tickStrings(self, values, scale, spacing):
-        strings = []
-        for v_int in values:
-            v = float(v_int) 
-            try:
-                dt = datetime.fromtimestamp(v)
-                strings.append(dt.strftime('%Y-%m-%d\n%H:%M:%S'))
-            except Exception as e:
-                strings.append('') 
-        return strings 
\ No newline at end of file
+        return [_format_tick(float(v), float(spacing)) for v in values]
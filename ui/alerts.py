@@ -0,0 +1,200 @@
+"""
+가격/지표 알림 기능을 제공하는 모듈
+"""
+
+import time
+from functools import partial
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton
+from PyQt6.QtCore import pyqtSlot
+
+from core.request_scheduler import PRIORITY_BACKFILL
+from utils.alerts import AlertEngine
+from utils.calculations import ComputationContext, bollinger_bands, cci
+from config.settings import ALERT_RULES, ALERT_MAX_MESSAGES, ALERT_FEED_TIMEFRAME
+
+class AlertsMixin:
+    """
+    알림 기능을 제공하는 Mixin 클래스
+    틱마다 가격 규칙을, 지표 결과가 반영될 때마다 CCI/볼린저 규칙을 증분 평가하고
+    발동한 알림을 message_area에 표시함.
+    표시 중인 심볼은 차트 피드와 지표 엔진 결과로, 그 밖에 규칙이 있는 심볼은 허브에서
+    ALERT_FEED_TIMEFRAME 피드를 구독해 각 피드의 배치마다 그 심볼의 규칙만 평가함
+    """
+    
+    def init_alerts(self):
+        """알림 엔진 초기화 및 설정 파일의 기본 규칙 등록"""
+        self.alert_engine = AlertEngine()
+        self.alert_feeds = {}  # 심볼 -> (MarketFeed, 연결된 슬롯)
+        for symbol, text in ALERT_RULES:
+            try:
+                self.alert_engine.add_rule_text(symbol, text)
+            except ValueError as e:
+                print(f"알림 규칙 등록 실패: {e}")
+    
+    def build_alert_panel(self):
+        """message_area와 규칙 입력창을 묶은 우측 알림 패널 생성"""
+        self.message_area.document().setMaximumBlockCount(ALERT_MAX_MESSAGES)
+        self.message_area.setText(
+            "알림 규칙 예시:\n"
+            "  price > 65000\n"
+            "  cci < -100 repeat\n"
+            "  bb outside\n"
+            "list: 규칙 목록 / del <번호>: 규칙 삭제\n"
+        )
+        
+        self.alert_input = QLineEdit()
+        self.alert_input.setPlaceholderText("알림 규칙 입력 (현재 심볼)")
+        self.alert_input.returnPressed.connect(self.handle_alert_input)
+        
+        self.alert_add_button = QPushButton("추가")
+        self.alert_add_button.clicked.connect(self.handle_alert_input)
+        
+        input_layout = QHBoxLayout()
+        input_layout.setContentsMargins(0, 0, 0, 0)
+        input_layout.addWidget(self.alert_input)
+        input_layout.addWidget(self.alert_add_button)
+        
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(1)
+        layout.addWidget(self.message_area, stretch=1)
+        layout.addLayout(input_layout)
+        
+        panel = QWidget()
+        panel.setLayout(layout)
+        return panel
+    
+    def append_alert_message(self, text):
+        self.message_area.append(f"[{time.strftime('%H:%M:%S')}] {text}")
+        self.message_area.ensureCursorVisible()
+    
+    def handle_alert_input(self):
+        """입력창의 규칙 추가 / list / del 명령 처리"""
+        text = self.alert_input.text().strip()
+        if not text:
+            return
+        self.alert_input.clear()
+        
+        command = text.split()
+        if command[0].lower() == 'list':
+            rules = self.alert_engine.rules_for(self.symbol)
+            if not rules:
+                self.append_alert_message(f"{self.symbol} 등록된 알림 없음")
+            for rule in rules:
+                self.append_alert_message(rule.describe())
+            return
+        if command[0].lower() == 'del' and len(command) == 2 and command[1].lstrip('#').isdigit():
+            rule = self.alert_engine.remove_rule(int(command[1].lstrip('#')))
+            self.append_alert_message(f"삭제됨: {rule.describe()}" if rule else f"규칙 {command[1]} 없음")
+            self.sync_alert_feeds()
+            return
+        
+        try:
+            rule = self.alert_engine.add_rule_text(self.symbol, text)
+        except ValueError:
+            self.append_alert_message(f"알 수 없는 규칙: {text}")
+            return
+        self.append_alert_message(f"등록됨: {rule.describe()}")
+        self.sync_alert_feeds()
+        
+        # 지표 규칙이 추가되면 표시 여부와 무관하게 다음 계산부터 해당 지표를 요청
+        if rule.series != 'price' and len(self.candle_store):
+            self.plot_data(auto_range=False)
+    
+    def alert_indicator_requests(self, length):
+        """알림 평가에 필요한 지표 요청 (화면에 표시되지 않는 지표도 포함)"""
+        requests = {}
+        if self.alert_engine.needs_series(self.symbol, 'bollinger') and length >= self.bollinger_window:
+            requests['bollinger'] = ('bollinger', {'window': self.bollinger_window, 'num_std': self.bollinger_std})
+        if self.alert_engine.needs_series(self.symbol, 'cci') and length >= self.cci_window:
+            requests['cci'] = ('cci', {'window': self.cci_window})
+        return requests
+    
+    def report_alerts(self, fired):
+        for alert in fired:
+            self.append_alert_message(f"알림 {alert['rule'].describe()} (현재 {alert['value']:g})")
+    
+    def check_price_alerts(self, price):
+        """틱마다 호출: 직전 가격과 현재 가격 사이의 가격 규칙만 평가"""
+        self.report_alerts(self.alert_engine.update_value(self.symbol, 'price', float(price)))
+    
+    def check_indicator_alerts(self, indicators):
+        """지표 결과가 반영될 때 호출: 최신 CCI 값과 볼린저 밴드 이탈 여부 평가"""
+        if 'cci' in indicators and len(indicators['cci']['cci']):
+            value = float(indicators['cci']['cci'][-1])
+            self.report_alerts(self.alert_engine.update_value(self.symbol, 'cci', value))
+        if 'bollinger' in indicators and not self.data_df.empty:
+            bands = indicators['bollinger']
+            close = float(self.data_df['close'].iloc[-1])
+            self.report_alerts(self.alert_engine.update_bands(
+                self.symbol, close, float(bands['upper'][-1]), float(bands['lower'][-1])
+            ))
+    
+    def sync_alert_feeds(self):
+        """
+        규칙이 있는 심볼 중 표시 중이 아닌 심볼의 피드 구독을 맞춤
+        (거래소 연결 준비 이후, 규칙 추가/삭제 및 차트 전환 시 호출)
+        """
+        if not self.exchange_ready:
+            return
+        wanted = self.alert_engine.symbols() - {self.symbol}
+        for symbol in list(self.alert_feeds):
+            if symbol not in wanted:
+                feed, slot = self.alert_feeds.pop(symbol)
+                feed.signals.new_data.disconnect(slot)
+                self.hub.unsubscribe(feed)
+        for symbol in wanted - set(self.alert_feeds):
+            feed = self.hub.subscribe(symbol, ALERT_FEED_TIMEFRAME)
+            slot = partial(self.handle_alert_feed_batch, symbol)
+            feed.signals.new_data.connect(slot)
+            self.alert_feeds[symbol] = (feed, slot)
+            # 지표 규칙은 윈도우만큼의 캔들이 필요하므로 비어 있는 저장소는 백필 우선순위로 채움
+            window = max(self.cci_window, self.bollinger_window)
+            if len(feed.candle_store) < window and self.rest_exchange:
+                future = self.exchange_manager.submit_ohlcv_rows(
+                    symbol, ALERT_FEED_TIMEFRAME, window + 1, priority=PRIORITY_BACKFILL
+                )
+                future.add_done_callback(lambda f, symbol=symbol: self.alert_warmup_ready.emit((symbol, f)))
+    
+    def stop_alert_feeds(self):
+        for feed, slot in self.alert_feeds.values():
+            feed.signals.new_data.disconnect(slot)
+            self.hub.unsubscribe(feed)
+        self.alert_feeds.clear()
+    
+    @pyqtSlot(object)
+    def apply_alert_warmup(self, result):
+        """지표 규칙용 백필 캔들을 피드 저장소에 병합 (그 사이 구독이 해제됐으면 무시)"""
+        symbol, future = result
+        if symbol not in self.alert_feeds or future.cancelled() or future.exception() is not None:
+            return
+        rows = future.result()
+        if rows:
+            self.alert_feeds[symbol][0].merge_batch(rows)
+    
+    def handle_alert_feed_batch(self, symbol, batch):
+        """표시 중이 아닌 심볼의 피드 배치: 가격 규칙과 (필요하면) 최근 윈도우로 계산한 지표 규칙 평가"""
+        if not batch:
+            return
+        self.report_alerts(self.alert_engine.update_value(symbol, 'price', float(batch[-1][4])))
+        self.evaluate_window_alerts(symbol, self.alert_feeds[symbol][0].candle_store)
+    
+    def evaluate_window_alerts(self, symbol, store):
+        """저장소의 최근 윈도우만으로 지표 규칙 평가 (지표 결과가 최신 캔들을 포함하지 않을 때 사용)"""
+        needs_cci = self.alert_engine.needs_series(symbol, 'cci')
+        needs_bands = self.alert_engine.needs_series(symbol, 'bollinger')
+        if not needs_cci and not needs_bands:
+            return
+        window = max(self.cci_window, self.bollinger_window)
+        if len(store) < window:
+            return
+        values = store.values[-window:]
+        ctx = ComputationContext({'high': values[:, 1], 'low': values[:, 2], 'close': values[:, 3]})
+        if needs_cci:
+            value = float(cci(ctx, self.cci_window)[-1])
+            self.report_alerts(self.alert_engine.update_value(symbol, 'cci', value))
+        if needs_bands:
+            _, upper, lower = bollinger_bands(ctx, self.bollinger_window, self.bollinger_std)
+            self.report_alerts(self.alert_engine.update_bands(
+                symbol, float(values[-1, 3]), float(upper[-1]), float(lower[-1])
+            ))
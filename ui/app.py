@@ -4,31 +4,58 @@
 
 import pandas as pd
 from PyQt6.QtWidgets import QMainWindow, QVBoxLayout, QWidget, QLabel, QTextEdit, QComboBox, QPushButton, QHBoxLayout, QSplitter
-from PyQt6.QtCore import QTimer, Qt, pyqtSlot, QThread
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
 import pyqtgraph as pg
 import sys
 import traceback
 
-from core.exchange import ExchangeManager
-from core.data_worker import Worker, WorkerSignals
+from core.market_data_hub import MarketDataHub
+from core.working_set import ChartWorkingSet, WarmChart
+from core.session_snapshot import SessionSnapshot
+from core.request_scheduler import PRIORITY_INTERACTIVE
+from core.candle_store import CandleStore, rows_to_frame
+from core.trade_aggregator import TRADE_TIMEFRAMES
+from core.indicator_worker import IndicatorEngine
 from plotting.custom_plot_items import CandlestickItem, DateAxisItem
 from utils.stream import Stream
 from ui.chart import ChartMixin
+from ui.helpers import format_candle_time
 from ui.indicators import IndicatorsMixin
+from ui.latency import LatencyMixin
+from ui.alerts import AlertsMixin
+from ui.history import HistoryMixin
+from ui.depth import DepthMixin
+from ui.volume_profile import VolumeProfileMixin
+from ui.prefetch import PrefetchMixin
+from ui.paper_trading import PaperTradingMixin
+from ui.scanner import ScannerWindow
+from ui.chart_grid import ChartGridWindow
 from ui.styles import BOLLINGER_BUTTON_ACTIVE_STYLE, CCI_BUTTON_ACTIVE_STYLE, CONSOLE_STYLE
 from config.settings import (
-    DEFAULT_EXCHANGE_ID, DEFAULT_SYMBOL, DEFAULT_TIMEFRAME, DEFAULT_LIMIT,
+    DEFAULT_SYMBOL, DEFAULT_TIMEFRAME, DEFAULT_LIMIT,
     BOLLINGER_WINDOW, BOLLINGER_STD, CCI_WINDOW,
-    SHOW_BOLLINGER, SHOW_CCI
+    SHOW_BOLLINGER, SHOW_CCI, INDICATOR_OVERLAYS, SESSION_SNAPSHOT_PATH, SESSION_SNAPSHOT_CANDLES
 )
 
-class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
+# 사용자가 연 추가 창 (닫힐 때까지 참조 유지)
+_extra_windows = []
+
+class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin, LatencyMixin, AlertsMixin, HistoryMixin, DepthMixin, VolumeProfileMixin, PrefetchMixin, PaperTradingMixin):
     """
     애플리케이션의 메인 윈도우 클래스
-    ChartMixin과 IndicatorsMixin을 상속받아 차트와 지표 관련 기능 구현
+    ChartMixin, IndicatorsMixin, LatencyMixin, AlertsMixin, HistoryMixin, DepthMixin, VolumeProfileMixin, PrefetchMixin,
+    PaperTradingMixin을 상속받아 차트, 지표, 지연 추적, 알림, 이력 페이징, 호가 히트맵, 모의 매매 기능 구현
+    
+    restore_session이면 종료 시 세션 스냅샷을 저장하고, 시작 시 스냅샷을 거래소 연결 전에 바로 그린 뒤
+    연결이 준비되면 그 이후 캔들만 받아 맞춤
     """
     
-    def __init__(self):
+    session_delta_ready = pyqtSignal(object)  # (MarketFeed, Future) - 스케줄러 스레드에서 전달
+    alert_warmup_ready = pyqtSignal(object)  # (심볼, Future) - 알림 지표 규칙용 백필 캔들
+    paper_warmup_ready = pyqtSignal(object)  # ((심볼, 타임프레임), Future) - 모의 매매 CCI 워밍업 캔들
+    initial_load_ready = pyqtSignal(object)  # (MarketFeed, Future) - 초기 REST 캔들
+    
+    def __init__(self, symbol=DEFAULT_SYMBOL, timeframe=DEFAULT_TIMEFRAME, restore_session=False):
         super().__init__()
         self.setWindowTitle("Binance Chart")
         self.setGeometry(100, 100, 1000, 850)
@@ -37,13 +64,27 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         self.original_stdout = sys.__stdout__
         self.original_stderr = sys.__stderr__
 
-        # 데이터 및 상태 초기화
+        # 시장 데이터 허브 (거래소 연결, 스트림, 캔들 저장소, 지표 캐시를 모든 창이 공유)
+        # 거래소 초기화는 허브가 백그라운드에서 수행하며, 준비되면 on_exchange_ready()에서 연결
+        self.hub = MarketDataHub.instance().acquire()
+        self.exchange_manager = self.hub.exchange_manager
+        self.rest_exchange = None
+        self.exchange = None
+        self.exchange_ready = False
+        
+        # 최근에 본 차트 작업 집합 (전환 시 피드 구독과 뷰 상태를 유지)
+        self.chart_working_set = ChartWorkingSet(self.hub)
+        
+        # 데이터 및 상태 초기화 (캔들 저장소는 피드 구독 시 허브의 공유 저장소로 교체)
+        self.market_feed = None
+        self.candle_store = CandleStore()
         self.data_df = pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        self.detailed_candle_data = []
+        self.display_candles = None  # 캔들 아이템에 전달한 레벨 구간 (필드별 배열, plot_data에서 갱신)
+        self.display_window = (float('-inf'), float('inf'))
         
         # 설정값 초기화
-        self.symbol = DEFAULT_SYMBOL
-        self.timeframe = DEFAULT_TIMEFRAME
+        self.symbol = symbol
+        self.timeframe = timeframe
         self.limit = DEFAULT_LIMIT
         
         # 지표 설정 초기화
@@ -53,6 +94,18 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         self.bollinger_std = BOLLINGER_STD
         self.cci_window = CCI_WINDOW
         
+        # 세션 스냅샷 (심볼/타임프레임/지표 표시 상태는 UI 생성 전에 적용)
+        self.session_enabled = restore_session
+        self.session_snapshot = SessionSnapshot.load(SESSION_SNAPSHOT_PATH) if restore_session else None
+        if self.session_snapshot is not None:
+            state = self.session_snapshot.state
+            self.symbol = state.get('symbol', self.symbol)
+            self.timeframe = state.get('timeframe', self.timeframe)
+            self.show_bollinger = state.get('show_bollinger', self.show_bollinger)
+            self.show_cci = state.get('show_cci', self.show_cci)
+        self.session_delta_ready.connect(self.apply_session_delta)
+        self.initial_load_ready.connect(self.apply_initial_load)
+        
         # 크로스헤어 및 가격선 초기화
         self.init_crosshairs()
         self.init_price_line()
@@ -61,10 +114,28 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         # 지표 관련 변수 초기화
         self.init_indicator_variables()
         
-        # 거래소 연결 초기화
-        self.exchange_manager = ExchangeManager(DEFAULT_EXCHANGE_ID)
-        self.rest_exchange = self.exchange_manager.rest_exchange
-        self.exchange = self.exchange_manager.ws_exchange
+        # 틱 지연 추적 초기화
+        self.init_latency_tracking()
+        
+        # 알림 엔진 초기화
+        self.init_alerts()
+        self.alert_warmup_ready.connect(self.apply_alert_warmup)
+        
+        # 호가 히트맵 상태 초기화
+        self.init_depth_variables()
+        
+        # 볼륨 프로파일 상태 초기화
+        self.init_volume_profile()
+        
+        # 유휴 시간 선행 로드 초기화
+        self.init_prefetch()
+        
+        # 페이퍼 트레이딩 초기화
+        self.init_paper_trading()
+        self.paper_warmup_ready.connect(self.apply_paper_warmup)
+        
+        # 과거 이력 페이징 초기화
+        self.init_history()
         
         # UI 초기화 - 차트 위젯 생성
         self.init_ui()
@@ -78,8 +149,14 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         # 윈도우 제목 업데이트
         self.setWindowTitle(f"{self.symbol} - {self.timeframe} Chart")
         
-        # WebSocket 또는 REST API 초기화
-        self.init_data_connection()
+        # 세션 스냅샷이 있으면 거래소 연결을 기다리지 않고 바로 표시
+        if self.session_snapshot is not None:
+            self.render_session_snapshot()
+        
+        # 거래소 연결이 준비되면 피드 구독 (이미 준비된 허브면 즉시)
+        self.hub.ready.connect(self.on_exchange_ready)
+        if self.hub.is_ready:
+            self.on_exchange_ready()
         
         # 볼린저 밴드와 CCI 버튼 스타일 초기 설정
         if self.show_bollinger:
@@ -139,7 +216,18 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         self.cci_plot_item = None
         self.cci_curve = None
         self.cci_current_line = None
+        self.cci_reference_lines = []
         self.cci_data = []
+        self.indicators_at_latest = True  # 마지막으로 요청한 지표 구간이 최신 기본 캔들을 포함하는지 (알림 평가 여부)
+        
+        # 레지스트리 기반 추가 오버레이 지표 (키 -> (지표 이름, 파라미터, 색상))
+        self.indicator_overlays = dict(INDICATOR_OVERLAYS)
+        self.overlay_curves = {}
+        
+        # 지표 계산 엔진 (GUI 스레드 밖에서 계산 후 시그널로 결과 전달)
+        self.indicator_engine = IndicatorEngine(cache=self.hub.indicator_cache)
+        self.indicator_engine.signals.results_ready.connect(self.apply_indicator_results)
+        self.indicator_engine.signals.error.connect(self.append_log)
     
     def init_ui(self):
         """UI 컴포넌트 초기화"""
@@ -162,7 +250,7 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         
         # 타임프레임 콤보박스
         self.timeframe_combo = QComboBox()
-        self.timeframe_combo.addItems(['1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '12h', '1d', '3d', '1w'])
+        self.timeframe_combo.addItems(['1s', '5s', '15s', '1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '12h', '1d', '3d', '1w'])
         self.timeframe_combo.setCurrentText(self.timeframe)
         
         # 차트 로드 버튼
@@ -192,6 +280,38 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         self.cci_button.setChecked(self.show_cci)
         self.cci_button.clicked.connect(self.toggle_cci)
         
+        # 호가 히트맵 버튼
+        self.depth_button = QPushButton("호가 히트맵")
+        self.depth_button.setCheckable(True)
+        self.depth_button.setChecked(False)
+        self.depth_button.clicked.connect(self.toggle_depth)
+        
+        # 볼륨 프로파일 버튼
+        self.volume_profile_button = QPushButton("볼륨 프로파일")
+        self.volume_profile_button.setCheckable(True)
+        self.volume_profile_button.setChecked(False)
+        self.volume_profile_button.clicked.connect(self.toggle_volume_profile)
+        
+        # 페이퍼 트레이딩 버튼
+        self.paper_trading_button = QPushButton("모의 매매")
+        self.paper_trading_button.setCheckable(True)
+        self.paper_trading_button.setChecked(False)
+        self.paper_trading_button.clicked.connect(self.toggle_paper_trading)
+        
+        # 관심 종목 격자 버튼
+        self.grid_button = QPushButton("격자")
+        self.grid_button.clicked.connect(self.open_chart_grid)
+        self.grid_window = None
+        
+        # 새 차트 창 버튼 (같은 시장 데이터 허브를 공유)
+        self.new_window_button = QPushButton("새 창")
+        self.new_window_button.clicked.connect(self.open_new_window)
+        
+        # 시장 스캐너 버튼
+        self.scanner_button = QPushButton("스캐너")
+        self.scanner_button.clicked.connect(self.open_scanner)
+        self.scanner_window = None
+        
         # 컨트롤 레이아웃에 위젯 추가
         controls_layout.addWidget(QLabel("Symbol:"))
         controls_layout.addWidget(self.symbol_combo)
@@ -202,7 +322,14 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         controls_layout.addWidget(self.auto_scale_button)
         controls_layout.addWidget(self.bollinger_button)
         controls_layout.addWidget(self.cci_button)
+        controls_layout.addWidget(self.depth_button)
+        controls_layout.addWidget(self.volume_profile_button)
+        controls_layout.addWidget(self.paper_trading_button)
+        controls_layout.addWidget(self.scanner_button)
+        controls_layout.addWidget(self.grid_button)
+        controls_layout.addWidget(self.new_window_button)
         controls_layout.addStretch(1)
+        controls_layout.addWidget(self.latency_label)
         
         # 메인 레이아웃에 컨트롤 레이아웃 추가
         main_layout.addLayout(controls_layout)
@@ -232,6 +359,9 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         # 메인 차트 위젯 (캔들차트)
         self.main_chart_widget = pg.GraphicsLayoutWidget()
         
+        # 호가 히트맵 위젯 (기본 숨김)
+        self.depth_chart_widget = pg.GraphicsLayoutWidget()
+        
         # CCI 차트 위젯
         self.cci_chart_widget = pg.GraphicsLayoutWidget()
         
@@ -247,18 +377,19 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
                 border: 1px solid #505050;
             }
         """)
-        self.message_area.setText("나중에\n사용하도록\n미리\n비워놓음")
+        self.alert_panel = self.build_alert_panel()
         
         # 차트 영역에 메인 차트와 CCI 차트 추가
         self.charts_area.addWidget(self.main_chart_widget)
+        self.charts_area.addWidget(self.depth_chart_widget)
         self.charts_area.addWidget(self.cci_chart_widget)
         
-        # 차트 영역 비율 설정 (메인 차트 : CCI 차트 = 3:1)
-        self.charts_area.setSizes([750, 250])
+        # 차트 영역 비율 설정 (메인 차트 : 호가 히트맵 : CCI 차트 = 3:1:1, 히트맵은 표시될 때만 공간 차지)
+        self.charts_area.setSizes([750, 250, 250])
         
         # 상단 영역에 차트 영역과 메시지 영역 추가
         self.top_area.addWidget(self.charts_area)
-        self.top_area.addWidget(self.message_area)
+        self.top_area.addWidget(self.alert_panel)
         
         # 상단 영역 비율 설정 (차트 영역 : 메시지 영역 = 7:3)
         self.top_area.setSizes([700, 300])
@@ -299,58 +430,182 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         
         print("콘솔이 초기화되었습니다. 표준 출력 및 에러가 콘솔에 리디렉션됩니다.")
     
+    @pyqtSlot()
+    def on_exchange_ready(self):
+        """거래소 연결 준비 완료 - 이력 로더 생성, 피드 구독, 스냅샷 이후 데이터 동기화"""
+        if self.exchange_ready:
+            return
+        self.exchange_ready = True
+        self.rest_exchange = self.exchange_manager.rest_exchange
+        self.exchange = self.exchange_manager.ws_exchange
+        self.init_history_loader()
+        
+        state = self.session_snapshot.state if self.session_snapshot is not None else {}
+        self.init_data_connection()
+        
+        # 표시 중이 아닌 심볼의 알림 규칙 평가용 피드 구독
+        self.sync_alert_feeds()
+        
+        # 스트림이 필요한 패널은 연결 이후에 복원
+        if state.get('show_depth'):
+            self.depth_button.setChecked(True)
+            self.toggle_depth()
+        if state.get('show_volume_profile'):
+            self.volume_profile_button.setChecked(True)
+            self.toggle_volume_profile()
+        self.note_chart_activity()
+    
+    def render_session_snapshot(self):
+        """저장된 캔들과 보이는 범위를 즉시 표시 (거래소 연결 전, 임시 저장소 사용)"""
+        snapshot = self.session_snapshot
+        self.candle_store.enable_pyramid(self.timeframe)
+        self.candle_store.upsert(snapshot.rows())
+        self.data_df = self.candle_store.to_frame()
+        self.plot_data(auto_range=not snapshot.state.get('x_range'))
+        if snapshot.state.get('x_range'):
+            self.plot_item.setXRange(*snapshot.state['x_range'], padding=0)
+        if snapshot.state.get('y_range'):
+            self.plot_item.setYRange(*snapshot.state['y_range'], padding=0)
+        if snapshot.state.get('auto_scale'):
+            self.auto_scale_button.setChecked(True)
+            self.toggle_auto_scale()
+        print(f"세션 스냅샷에서 {self.symbol} {self.timeframe} 캔들 {len(snapshot.timestamps)}개를 복원했습니다.")
+    
+    def reconcile_session_snapshot(self):
+        """
+        스냅샷 캔들을 피드 저장소에 넣고 그 이후 캔들만 백그라운드로 요청
+        
+        Returns:
+        bool: 스냅샷을 사용했으면 True (초기 REST 로드 생략)
+        """
+        snapshot, self.session_snapshot = self.session_snapshot, None
+        if snapshot is None or not len(snapshot.timestamps):
+            return False
+        if (snapshot.state.get('symbol'), snapshot.state.get('timeframe')) != (self.symbol, self.timeframe):
+            return False
+        
+        if not self.market_feed.history_loaded:
+            self.candle_store.upsert(snapshot.rows())
+            self.market_feed.history_loaded = True
+            if self.market_feed.persisted_until is None:
+                # 스냅샷의 마지막 캔들은 저장 당시 진행 중이었으므로 마감된 뒤에 기록
+                self.market_feed.persisted_until = int(snapshot.timestamps[-1])
+        self.data_df = self.candle_store.to_frame()
+        self.plot_data(auto_range=False)
+        
+        # 체결 집계 타임프레임은 REST kline이 없으므로 스트림(최근 체결 시드)에 맡김
+        if self.rest_exchange and self.timeframe not in TRADE_TIMEFRAMES:
+            feed = self.market_feed
+            feed.delta_pending = True
+            future = self.exchange_manager.submit_ohlcv_rows(
+                self.symbol, self.timeframe, self.limit,
+                since=int(snapshot.timestamps[-1]), priority=PRIORITY_INTERACTIVE,
+            )
+            future.add_done_callback(lambda f: self.session_delta_ready.emit((feed, f)))
+        return True
+    
+    @pyqtSlot(object)
+    def apply_session_delta(self, result):
+        """
+        스냅샷 이후 캔들 병합 (공백이 한 번의 요청보다 길면 최근 캔들 전체를 다시 로드)
+        결과와 상관없이 피드의 마감 캔들 기록 보류를 해제함
+        """
+        feed, future = result
+        feed.delta_pending = False
+        if feed is not self.market_feed or future.cancelled():
+            return
+        if future.exception() is not None:
+            print(f"세션 스냅샷 동기화 실패: {future.exception()}")
+            return
+        rows = future.result() or []
+        if len(rows) >= self.limit:
+            print("세션 스냅샷 이후 공백이 길어 최근 캔들을 다시 로드합니다.")
+            self.candle_store.clear()
+            self.market_feed.history_loaded = False
+            self.initial_load_rest()
+            return
+        self.market_feed.merge_batch(rows)
+        print(f"세션 스냅샷 이후 캔들 {len(rows)}개를 동기화했습니다.")
+    
+    def save_session_snapshot(self):
+        """현재 화면 상태와 최근 캔들을 세션 스냅샷으로 저장"""
+        if not self.session_enabled or len(self.candle_store) == 0:
+            return
+        view_range = self.plot_item.getViewBox().viewRange()
+        state = {
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'x_range': list(view_range[0]),
+            'y_range': list(view_range[1]),
+            'show_bollinger': self.show_bollinger,
+            'show_cci': self.show_cci,
+            'show_depth': self.show_depth,
+            'show_volume_profile': self.show_volume_profile,
+            'auto_scale': self.auto_scale_active,
+        }
+        try:
+            SessionSnapshot(
+                state,
+                self.candle_store.timestamps[-SESSION_SNAPSHOT_CANDLES:],
+                self.candle_store.values[-SESSION_SNAPSHOT_CANDLES:],
+            ).save(SESSION_SNAPSHOT_PATH)
+            print("세션 스냅샷을 저장했습니다.")
+        except Exception as e:
+            print(f"세션 스냅샷 저장 실패: {e}")
+    
     def init_data_connection(self):
-        """데이터 연결 초기화 (WebSocket 또는 REST)"""
-        self.worker = None
-        self.thread = None
-        self.timer = None
-        
-        if self.exchange:
-            print("WebSocket 연결을 초기화합니다.")
-            self.init_worker_thread()
-            
-            if self.rest_exchange:
-                self.initial_load_rest()
-            else:
-                print("경고: 초기 차트 데이터 로드를 위한 REST API를 사용할 수 없습니다.")
+        """
+        현재 심볼/타임프레임 피드를 시장 데이터 허브에서 구독하고 초기 데이터 로드
+        작업 집합에 보관된 차트면 구독을 넘겨받아 저장된 뷰 상태로 다시 연결함 (네트워크 요청 없음)
+        """
+        if not self.exchange_ready:
+            # 준비되면 on_exchange_ready()에서 현재 심볼/타임프레임으로 다시 호출됨
+            print("거래소 연결을 준비 중입니다. 준비되면 차트를 로드합니다.")
+            self.candle_store = CandleStore()
+            self.plot_data()
+            return
+        warm = self.chart_working_set.take(self.symbol, self.timeframe)
+        self.market_feed = warm.feed if warm is not None else self.hub.subscribe(self.symbol, self.timeframe)
+        self.candle_store = self.market_feed.candle_store
+        self.market_feed.signals.new_data.connect(self.update_chart_from_websocket)
+        self.market_feed.signals.error.connect(self.handle_worker_error)
+        
+        if warm is not None and len(self.candle_store):
+            self.restore_warm_chart(warm)
+        elif self.reconcile_session_snapshot():
+            pass
         elif self.rest_exchange:
-            print("WebSocket 연결을 초기화할 수 없습니다. REST API로 폴백합니다.")
             self.initial_load_rest()
-            
-            # REST API 폴링 타이머 설정
-            self.timer = QTimer(self)
-            self.timer.timeout.connect(self.update_chart_rest)
-            self.timer.start(60000)  # 1분마다 업데이트
-            print("REST API 폴링 타이머가 시작되었습니다.")
         else:
-            print("치명적 오류: 거래소 연결을 초기화할 수 없습니다.")
-            self.append_log("치명적 오류: 거래소 연결을 초기화할 수 없습니다.")
+            print("경고: 초기 차트 데이터 로드를 위한 REST API를 사용할 수 없습니다.")
     
-    def init_worker_thread(self):
-        """WebSocket 워커 스레드 초기화"""
-        if not self.exchange:
-            print("오류: WebSocket 워커를 초기화할 수 없습니다. 거래소 객체가 초기화되지 않았습니다.")
+    def release_market_feed(self, keep_warm=False):
+        """
+        현재 피드 구독 해제 (마지막 구독이면 허브가 스트림을 정지함)
+        keep_warm이면 구독을 유지한 채 뷰 상태와 함께 작업 집합에 보관
+        (최신 구간이 제거된 저장소는 다시 연결해도 바로 쓸 수 없으므로 보관하지 않음)
+        """
+        if self.market_feed is None:
             return
-        
-        # 새 WebSocket 인스턴스 생성
-        ws_exchange = self.exchange_manager.create_ws_exchange()
-        
-        # 워커 및 스레드 생성
-        self.worker = Worker(ws_exchange, self.symbol, self.timeframe)
-        self.thread = QThread()
-        self.worker.moveToThread(self.thread)
-        
-        # 시그널 연결
-        self.worker.signals.new_data.connect(self.update_chart_from_websocket)
-        self.worker.signals.error.connect(self.handle_worker_error)
-        self.worker.signals.finished.connect(self.thread.quit)
-        self.worker.signals.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        
-        # 스레드 시작
-        self.thread.started.connect(self.worker.start_streaming)
-        self.thread.start()
-        print("WebSocket 워커 스레드가 시작되었습니다.")
+        self.market_feed.signals.new_data.disconnect(self.update_chart_from_websocket)
+        self.market_feed.signals.error.disconnect(self.handle_worker_error)
+        if keep_warm and len(self.candle_store) and not self.market_feed.live_detached:
+            x_range = tuple(self.plot_item.getViewBox().viewRange()[0])
+            self.chart_working_set.park(WarmChart(self.market_feed, self.data_df, x_range, self.history_exhausted))
+        else:
+            self.hub.unsubscribe(self.market_feed)
+        self.market_feed = None
+    
+    def restore_warm_chart(self, warm):
+        """작업 집합의 차트로 뷰만 다시 연결 (보관 이후 들어온 캔들이 있을 때만 프레임 재생성)"""
+        if warm.version == self.candle_store.version:
+            self.data_df = warm.data_df
+        else:
+            self.data_df = self.candle_store.to_frame()
+        self.history_exhausted = warm.history_exhausted
+        self.plot_data(auto_range=False)
+        self.plot_item.setXRange(*warm.x_range, padding=0)
+        print(f"작업 집합에서 {self.symbol} {self.timeframe} 차트를 다시 연결했습니다.")
     
     def initial_load_rest(self):
         """REST API를 사용하여 초기 데이터 로드"""
@@ -360,59 +615,95 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
             print("오류: REST API를 사용할 수 없습니다.")
             return
         
+        if self.market_feed.history_loaded and not self.market_feed.live_detached:
+            # 다른 창이 이미 이력을 불러온 피드 -> 공유 저장소의 캔들을 그대로 사용
+            # (알림/모의 매매 구독이 실시간·워밍업 캔들만 채운 저장소는 다시 로드)
+            self.data_df = self.candle_store.to_frame()
+            print(f"공유 저장소의 {len(self.candle_store)} 개 캔들을 사용합니다.")
+            self.plot_data(auto_range=True)
+            if len(self.candle_store) > 150:
+                self.zoom_to_recent_candles(150)
+            return
+        
+        if self.timeframe in TRADE_TIMEFRAMES:
+            self.load_local_trade_candles()
+            return
+        
+        # 유휴 시간에 선행 로드된 캔들이 있으면 그대로 사용
+        df = self.hub.prefetcher.take(self.symbol, self.timeframe) if self.limit == DEFAULT_LIMIT else None
+        if df is not None:
+            print(f"선행 로드된 캔들을 사용합니다: {self.symbol} {self.timeframe}")
+            self.apply_initial_frame(df)
+            return
+        
+        # 응답은 스케줄러 스레드에서 initial_load_ready로 전달되어 GUI 스레드에서 적용됨 (요청 중에도 화면은 응답함)
+        feed = self.market_feed
+        future = self.exchange_manager.submit_ohlcv_rows(
+            self.symbol, self.timeframe, self.limit, priority=PRIORITY_INTERACTIVE
+        )
+        future.add_done_callback(lambda f: self.initial_load_ready.emit((feed, f)))
+    
+    @pyqtSlot(object)
+    def apply_initial_load(self, result):
+        """초기 REST 캔들 적용 (그 사이 심볼/타임프레임이 바뀌었으면 무시)"""
+        feed, future = result
+        if feed is not self.market_feed or future.cancelled():
+            return
+        if future.exception() is not None:
+            print(f"초기 데이터 로드 중 오류 발생: {future.exception()}")
+            return
+        rows = future.result()
+        if not rows:
+            print(f"REST API에서 {self.symbol} {self.timeframe} 데이터를 가져올 수 없습니다.")
+            return
         try:
-            # 데이터 가져오기
-            df = self.exchange_manager.fetch_ohlcv(self.symbol, self.timeframe, self.limit)
-            
-            if df is not None and not df.empty:
-                self.data_df = df
-                print(f"{len(df)} 개의 캔들 데이터를 로드했습니다.")
-                
-                # 차트 업데이트
-                self.plot_data(auto_range=True)
-                
-                # 차트 로드 직후 자동으로 최근 150개 캔들로 확대
-                if len(df) > 150:
-                    self.zoom_to_recent_candles(150)
-                    print("자동으로 최근 150개 캔들로 확대했습니다.")
-            else:
-                print(f"REST API에서 {self.symbol} {self.timeframe} 데이터를 가져올 수 없습니다.")
+            self.apply_initial_frame(rows_to_frame(rows))
         except Exception as e:
             print(f"초기 데이터 로드 중 오류 발생: {e}")
             traceback.print_exc()
     
-    @pyqtSlot(list)
+    def apply_initial_frame(self, df):
+        """불러온 초기 캔들로 저장소를 채우고 최근 150개 캔들로 확대해 표시"""
+        self.candle_store.replace_frame(df)
+        self.market_feed.live_detached = False
+        self.market_feed.history_loaded = True
+        self.data_df = df
+        self.save_loaded_history(df)
+        print(f"{len(df)} 개의 캔들 데이터를 로드했습니다.")
+        
+        # 차트 업데이트
+        self.plot_data(auto_range=True)
+        
+        # 차트 로드 직후 자동으로 최근 150개 캔들로 확대
+        if len(df) > 150:
+            self.zoom_to_recent_candles(150)
+            print("자동으로 최근 150개 캔들로 확대했습니다.")
+    
+    @pyqtSlot(object)
     def update_chart_from_websocket(self, kline_data_list):
-        """WebSocket으로부터 받은 데이터로 차트 업데이트"""
+        """
+        피드로부터 받은 캔들 배치로 차트 업데이트
+        배치는 피드가 공유 캔들 저장소에 이미 한 번에 병합했으므로 (WebSocket, REST 폴링 공통)
+        여기서는 지표/차트 갱신과 알림 평가만 배치당 한 번 수행
+        """
         if not kline_data_list or len(kline_data_list) == 0:
             return
         
+        self.trace_dispatch(kline_data_list)
+        
+        if self.market_feed.live_detached:
+            # 과거 구간을 보는 중 최신 구간이 메모리에서 제거됨 -> 알림만 평가
+            self.check_price_alerts(kline_data_list[-1][4])
+            return
+        
         try:
-            # 데이터프레임에 새 캔들 데이터 추가/업데이트
-            timestamp_ms = kline_data_list[0][0]  # 첫 번째 데이터의 타임스탬프
-            dt = pd.to_datetime(timestamp_ms, unit='ms')
+            self.data_df = self.candle_store.to_frame()
             
-            # 기존 데이터프레임에서 같은 타임스탬프를 가진 행 찾기
-            existing = self.data_df[self.data_df['timestamp'] == dt]
+            # 가격 알림 평가 (최신 종가 기준)
+            self.check_price_alerts(kline_data_list[-1][4])
             
-            if not existing.empty:
-                # 기존 데이터 업데이트
-                self.data_df.loc[self.data_df['timestamp'] == dt, ['open', 'high', 'low', 'close', 'volume']] = [
-                    kline_data_list[0][1], kline_data_list[0][2], kline_data_list[0][3], 
-                    kline_data_list[0][4], kline_data_list[0][5]
-                ]
-            else:
-                # 새 행 추가
-                new_row = pd.DataFrame({
-                    'timestamp': [dt],
-                    'open': [kline_data_list[0][1]],
-                    'high': [kline_data_list[0][2]],
-                    'low': [kline_data_list[0][3]],
-                    'close': [kline_data_list[0][4]],
-                    'volume': [kline_data_list[0][5]]
-                })
-                self.data_df = pd.concat([self.data_df, new_row], ignore_index=True)
-                self.data_df = self.data_df.sort_values(by='timestamp').reset_index(drop=True)
+            # 새로 마감된 캔들을 로컬 이력 저장소에 기록
+            self.persist_closed_candles()
             
             # 차트 업데이트
             self.plot_data(auto_range=False)
@@ -420,28 +711,6 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
             print(f"WebSocket 데이터 처리 중 오류 발생: {e}")
             traceback.print_exc()
     
-    def update_chart_rest(self):
-        """REST API를 사용하여 차트 업데이트 (WebSocket 대체용)"""
-        if not self.rest_exchange:
-            print("REST API를 사용할 수 없습니다.")
-            return
-        
-        try:
-            # 데이터 가져오기
-            df = self.exchange_manager.fetch_ohlcv(self.symbol, self.timeframe, self.limit)
-            
-            if df is not None and not df.empty:
-                self.data_df = df
-                print(f"REST API: {len(df)} 개의 캔들 데이터를 업데이트했습니다.")
-                
-                # 차트 업데이트
-                self.plot_data(auto_range=False)
-            else:
-                print(f"REST API에서 {self.symbol} {self.timeframe} 데이터를 가져올 수 없습니다.")
-        except Exception as e:
-            print(f"REST API 데이터 업데이트 중 오류 발생: {e}")
-            traceback.print_exc()
-    
     def handle_worker_error(self, error_message):
         """워커 에러 처리"""
         self.append_log(f"워커 에러: {error_message}")
@@ -450,44 +719,52 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         """애플리케이션 종료 시 처리"""
         print("애플리케이션을 종료합니다...")
         
-        # 워커 스레드 정지
-        self.stop_worker_thread()
+        # 다음 실행 시 바로 표시할 세션 스냅샷 저장
+        self.save_session_snapshot()
+        
+        # 피드 및 작업 집합 구독 해제 (다른 창이 구독 중인 스트림은 유지됨)
+        self.release_market_feed()
+        self.chart_working_set.clear()
+        
+        # 호가 스트림 정지
+        self.stop_depth_stream()
+        
+        # 볼륨 프로파일 체결 스트림 정지
+        self.stop_profile_stream()
+        
+        # 모의 매매 및 알림 피드 구독 해제
+        self.stop_paper_trading()
+        self.stop_alert_feeds()
+        
+        # 스캐너 창 닫기
+        if self.scanner_window:
+            self.scanner_window.close()
+        
+        # 관심 종목 격자 창 닫기
+        if self.grid_window:
+            self.grid_window.close()
+        
+        # 지표 계산 스레드 풀 종료
+        self.indicator_engine.shutdown()
+        
+        # 이력 로더 종료, 마지막 창이면 허브의 스트림과 REST 요청 스케줄러도 종료
+        if self.history_loader:
+            self.history_loader.shutdown()
+        self.hub.release()
         
-        # REST API 타이머 정지
-        if self.timer and self.timer.isActive():
-            self.timer.stop()
-            print("REST API 타이머가 정지되었습니다.")
+        # 콘솔 출력 리디렉션 해제 (다른 창이 이어받은 경우는 유지)
+        if sys.stdout is self.stdout_stream:
+            sys.stdout = self.original_stdout
+        if sys.stderr is self.stderr_stream:
+            sys.stderr = self.original_stderr
+        if self in _extra_windows:
+            _extra_windows.remove(self)
         
         print("애플리케이션이 정상적으로 종료되었습니다.")
         event.accept()
     
-    def stop_worker_thread(self):
-        """워커 스레드 정지"""
-        if self.thread and self.thread.isRunning():
-            print("워커 스레드를 정지합니다...")
-            
-            if self.worker:
-                self.worker.stop()  # 워커 루프 정지 및 거래소 연결 닫기
-            
-            self.thread.quit()  # QThread에 종료 요청
-            
-            # 최대 5초 대기
-            if not self.thread.wait(5000):
-                print("워커 스레드가 제한 시간 내에 종료되지 않았습니다. 강제 종료합니다.")
-                self.thread.terminate()
-                self.thread.wait()
-            
-            print("워커 스레드가 정지되었습니다.")
-    
     def handle_load_chart_button(self):
         """차트 로드 버튼 클릭 이벤트 처리"""
-        # 기존 연결 정지
-        self.stop_worker_thread()
-        
-        # REST API 타이머 정지
-        if self.timer and self.timer.isActive():
-            self.timer.stop()
-        
         # 새 설정 가져오기
         new_symbol = self.symbol_combo.currentText()
         new_timeframe = self.timeframe_combo.currentText()
@@ -495,11 +772,17 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         # 변경사항이 없으면 그냥 반환
         if new_symbol == self.symbol and new_timeframe == self.timeframe:
             print("심볼과 타임프레임이 변경되지 않았습니다.")
-            # 이미 정지된 연결 다시 시작
-            self.init_data_connection()
             return
         
-        # 설정 업데이트
+        # 다른 선행 로드 요청 취소 (새 차트의 요청은 초기 로드와 병합되도록 유지)
+        self.note_chart_switch(new_symbol, new_timeframe)
+        
+        # 기존 피드는 작업 집합에 보관 (한도를 넘으면 가장 오래된 차트부터 구독 해제)
+        self.release_market_feed(keep_warm=True)
+        
+        # 설정 업데이트 (이전/새 심볼의 알림 기준값은 다른 피드 기준이 되므로 초기화)
+        self.alert_engine.reset(self.symbol)
+        self.alert_engine.reset(new_symbol)
         self.symbol = new_symbol
         self.timeframe = new_timeframe
         print(f"새 차트 로드: {self.symbol} {self.timeframe}")
@@ -507,19 +790,73 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         # 윈도우 제목 업데이트
         self.setWindowTitle(f"{self.symbol} - {self.timeframe} Chart")
         
-        # 데이터 초기화
+        # 창별 상태 초기화
         self.data_df = pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        self.reset_history()
         
-        # REST API로 초기 데이터 로드
-        self.initial_load_rest()
-        
-        # WebSocket 또는 REST API 타이머 다시 시작
+        # 새 피드 구독 및 초기 데이터 로드 (이미 다른 창이 구독 중이면 공유 저장소 사용)
         self.init_data_connection()
         
+        # 이전 심볼에 규칙이 있으면 알림 피드로 계속 평가, 새 심볼은 차트 피드로 평가
+        self.sync_alert_feeds()
+        
+        # 호가 히트맵 표시 중이면 새 심볼로 재시작
+        self.restart_depth_stream()
+        
+        # 볼륨 프로파일 표시 중이면 새 심볼/타임프레임으로 다시 집계
+        self.reset_volume_profile()
+        
+        # 모의 매매 중이면 새 차트도 대상에 추가하고 마커를 새 차트 기준으로 갱신
+        self.sync_paper_feeds()
+        
         # CCI 스케일 재설정 플래그 (새 심볼/타임프레임에 대한 자동 스케일을 위해)
         if hasattr(self, '_cci_scaled'):
             self._cci_scaled[f"{self.symbol}_{self.timeframe}"] = False
     
+    def open_new_window(self):
+        """현재 심볼/타임프레임으로 새 차트 창 열기 (스트림과 저장소는 허브에서 공유)"""
+        window = MainWindow(self.symbol, self.timeframe)
+        _extra_windows.append(window)
+        window.show()
+    
+    def open_scanner(self):
+        """시장 스캐너 창 열기"""
+        if self.scanner_window is None:
+            self.scanner_window = ScannerWindow(self.exchange_manager, self)
+            self.scanner_window.symbol_selected.connect(self.load_symbol_from_scanner)
+        self.scanner_window.show()
+        self.scanner_window.raise_()
+    
+    def open_chart_grid(self):
+        """관심 종목 격자 창 열기"""
+        if self.grid_window is None:
+            self.grid_window = ChartGridWindow(self)
+            self.grid_window.symbol_selected.connect(self.load_chart_from_grid)
+            self.grid_window.closed.connect(self.handle_grid_closed)
+        self.grid_window.show()
+        self.grid_window.raise_()
+    
+    def handle_grid_closed(self):
+        self.grid_window.deleteLater()
+        self.grid_window = None
+    
+    @pyqtSlot(str, str)
+    def load_chart_from_grid(self, symbol, timeframe):
+        """격자에서 더블클릭한 차트를 메인 차트로 로드"""
+        if self.symbol_combo.findText(symbol) < 0:
+            self.symbol_combo.addItem(symbol)
+        self.symbol_combo.setCurrentText(symbol)
+        self.timeframe_combo.setCurrentText(timeframe)
+        self.handle_load_chart_button()
+    
+    @pyqtSlot(str)
+    def load_symbol_from_scanner(self, symbol):
+        """스캐너에서 선택한 심볼로 차트 로드"""
+        if self.symbol_combo.findText(symbol) < 0:
+            self.symbol_combo.addItem(symbol)
+        self.symbol_combo.setCurrentText(symbol)
+        self.handle_load_chart_button()
+    
     @pyqtSlot(str)
     def append_log(self, text):
         """콘솔에 로그 추가"""
@@ -563,27 +900,29 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
     
     def update_candle_info(self, x, y):
         """캔들 정보 업데이트"""
-        if not self.detailed_candle_data:
+        i = self.closest_display_index(x)
+        if i is None:
             return
         
-        closest_candle = None
-        min_distance = float('inf')
+        # 캔들 정보 표시
+        candles = self.display_candles
+        info_text = f"Time: {format_candle_time(candles['time'][i])}\n"
+        info_text += f"O: {candles['open'][i]:.4f}  H: {candles['high'][i]:.4f}\n"
+        info_text += f"L: {candles['low'][i]:.4f}  C: {candles['close'][i]:.4f}\n"
+        info_text += f"V: {candles['volume'][i]:.2f}"
         
-        for candle in self.detailed_candle_data:
-            distance = abs(candle['time_axis_val'] - x)
-            if distance < min_distance:
-                min_distance = distance
-                closest_candle = candle
-        
-        if closest_candle:
-            # 캔들 정보 표시
-            info_text = f"Time: {closest_candle['timestamp_display']}\n"
-            info_text += f"O: {closest_candle['open']:.4f}  H: {closest_candle['high']:.4f}\n"
-            info_text += f"L: {closest_candle['low']:.4f}  C: {closest_candle['close']:.4f}\n"
-            info_text += f"V: {closest_candle['volume']:.2f}"
-            
-            self.candle_info_label.setText(info_text)
-            self.candle_info_label.setVisible(True)
+        self.candle_info_label.setText(info_text)
+        self.candle_info_label.setVisible(True)
+    
+    def closest_display_index(self, x):
+        """표시 중인 캔들 중 X(초)에 가장 가까운 캔들 인덱스 (없으면 None)"""
+        if self.display_candles is None or not len(self.display_candles['time']):
+            return None
+        times = self.display_candles['time']
+        i = int(times.searchsorted(x))
+        if i == len(times) or (i > 0 and x - times[i - 1] <= times[i] - x):
+            i -= 1
+        return i
     
     def update_cci_info(self, x, y):
         """CCI 정보 업데이트"""
@@ -601,11 +940,11 @@ class MainWindow(QMainWindow, ChartMixin, IndicatorsMixin):
         
         if closest_cci:
             # 해당 시간의 캔들 찾기
-            matching_candle = next((c for c in self.detailed_candle_data if c['time_axis_val'] == closest_cci[0]), None)
+            i = self.closest_display_index(closest_cci[0])
             
-            if matching_candle:
+            if i is not None and self.display_candles['time'][i] == closest_cci[0]:
                 # CCI 정보 표시
-                info_text = f"Time: {matching_candle['timestamp_display']}\n"
+                info_text = f"Time: {format_candle_time(closest_cci[0])}\n"
                 info_text += f"CCI: {closest_cci[1]:.2f}"
                 
                 self.cci_info_label.setText(info_text)
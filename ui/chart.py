@@ -5,9 +5,9 @@
 import pyqtgraph as pg
 from PyQt6.QtCore import Qt, QRectF, QPointF
 from PyQt6.QtGui import QColor
-import pandas as pd
 from plotting.custom_plot_items import CandlestickItem, DateAxisItem
 from ui.helpers import create_rect_from_range
+from config.settings import PYRAMID_MIN_PIXELS_PER_CANDLE, PYRAMID_WARMUP_CANDLES
 
 class ChartMixin:
     """
@@ -33,6 +33,7 @@ class ChartMixin:
         
         self.setup_main_chart()
         self.setup_cci_chart()
+        self.setup_depth_chart()
         self.setup_crosshairs()
         self.setup_price_line()
         
@@ -42,6 +43,11 @@ class ChartMixin:
         self.auto_scale_timer.setSingleShot(True)
         self.auto_scale_timer.timeout.connect(self.apply_auto_scale)
         
+        # 확대/축소가 잠시 멈춘 뒤 캔들당 픽셀 수에 맞는 피라미드 레벨로 전환
+        self.candle_level_timer = pg.QtCore.QTimer()
+        self.candle_level_timer.setSingleShot(True)
+        self.candle_level_timer.timeout.connect(self.update_candle_level)
+        
         # Connect ViewBox range change signals
         view_box = self.plot_item.getViewBox()
         view_box.sigRangeChanged.connect(self.on_range_changed)
@@ -111,11 +117,12 @@ class ChartMixin:
     
     def plot_data(self, auto_range=False):
         """데이터를 차트에 표시"""
-        if self.data_df.empty:
+        if len(self.candle_store) == 0:
             print("No data to plot.")
             if self.candlestick_item:
                 self.candlestick_item.setData([])
-            self.detailed_candle_data = [] # Clear detailed data too
+            self.display_candles = None # Clear displayed candles too
+            self.display_window = (float('-inf'), float('inf'))
             # Hide any info labels
             self.hide_chart_elements()
             
@@ -125,40 +132,25 @@ class ChartMixin:
                 print(f"Chart auto-ranged (empty chart).")
             return
 
-        plot_df_copy = self.data_df.copy()
-        
-        # Ensure 'timestamp' is datetime
-        if not pd.api.types.is_datetime64_any_dtype(plot_df_copy['timestamp']):
-            # Attempt conversion if it's numeric (e.g., ms from WebSocket not yet converted)
-            if pd.api.types.is_numeric_dtype(plot_df_copy['timestamp']):
-                plot_df_copy['timestamp'] = pd.to_datetime(plot_df_copy['timestamp'], unit='ms', errors='coerce')
-            else:
-                print("Error: Timestamp column is not in a recognized datetime format.")
-                if self.current_price_line: self.current_price_line.setVisible(False)
-                return
-        plot_df_copy.dropna(subset=['timestamp'], inplace=True) # Drop rows where conversion failed
-        
-        # This 'time_axis_val' is what CandlestickItem uses as 'time' (center of candle visual)
-        plot_df_copy['time_axis_val'] = plot_df_copy['timestamp'].apply(lambda dt: dt.timestamp())
-        plot_df_copy['timestamp_display'] = plot_df_copy['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            plot_df_copy[col] = pd.to_numeric(plot_df_copy[col], errors='coerce')
-        plot_df_copy.dropna(subset=['open', 'high', 'low', 'close', 'volume', 'time_axis_val'], inplace=True) # Ensure no NaNs for critical data
-
-        self.detailed_candle_data = plot_df_copy[[
-            'time_axis_val', 'open', 'high', 'low', 'close', 'volume', 'timestamp_display'
-        ]].to_dict('records')
-
-        candlestick_item_input_data = [
-            {'time': d['time_axis_val'], 'open': d['open'], 'high': d['high'], 'low': d['low'], 'close': d['close']}
-            for d in self.detailed_candle_data
-        ]
+        # 선택한 피라미드 레벨에서 보이는 구간(앞뒤 한 화면 + 지표 워밍업)만 잘라 캔들 아이템과 지표에 전달
+        # (전체 기본 캔들을 행 단위로 변환하지 않으므로 축소해도 처리하는 행 수가 화면 폭에 비례함)
+        display_timeframe = self.choose_display_timeframe()
+        timestamps, values = self.display_level_arrays(display_timeframe)
+        lo, hi = self.display_slice(timestamps, auto_range)
+        self.display_candles = {
+            'time': timestamps[lo:hi] / 1000.0,
+            'open': values[lo:hi, 0],
+            'high': values[lo:hi, 1],
+            'low': values[lo:hi, 2],
+            'close': values[lo:hi, 3],
+            'volume': values[lo:hi, 4],
+        }
 
         if not self.candlestick_item:
-            if candlestick_item_input_data:
+            if hi > lo:
                 # Pass the current timeframe to CandlestickItem
-                self.candlestick_item = CandlestickItem(candlestick_item_input_data, timeframe=self.timeframe)
+                self.candlestick_item = CandlestickItem(self.display_candles, timeframe=display_timeframe)
+                self.candlestick_item.paint_callback = self.trace_paint
                 self.plot_item.addItem(self.candlestick_item)
                 print(f"CandlestickItem created and added to chart with timeframe {self.timeframe}.")
                 auto_range = True  # Force auto-range when creating chart for the first time
@@ -167,23 +159,22 @@ class ChartMixin:
                 return 
         else:
             # Check if timeframe needs to be updated
-            if hasattr(self.candlestick_item, 'timeframe') and self.candlestick_item.timeframe != self.timeframe:
-                self.candlestick_item.update_timeframe(self.timeframe)
-                print(f"Updated candlestick timeframe to {self.timeframe}")
-            self.candlestick_item.setData(candlestick_item_input_data)
-        
-        if not plot_df_copy.empty and 'close' in plot_df_copy.columns:
-            latest_close_price = plot_df_copy['close'].iloc[-1]
-            if pd.notna(latest_close_price):
-                self.current_price_line.setValue(latest_close_price)
-                self.current_price_line.setVisible(True)
-            else:
-                if self.current_price_line: self.current_price_line.setVisible(False)
-        else:
-            if self.current_price_line: self.current_price_line.setVisible(False)
+            # update_timeframe()은 이전 데이터로 다시 그리므로 막대 폭만 바꾸고 setData에서 한 번만 그림
+            if hasattr(self.candlestick_item, 'timeframe') and self.candlestick_item.timeframe != display_timeframe:
+                self.candlestick_item.timeframe = display_timeframe
+                self.candlestick_item.update_bar_width()
+                print(f"Updated candlestick timeframe to {display_timeframe}")
+            self.candlestick_item.setData(self.display_candles)
+        
+        # 현재가 라인은 보이는 구간과 상관없이 최신 기본 캔들의 종가
+        self.current_price_line.setValue(float(self.candle_store.values[-1, 3]))
+        self.current_price_line.setVisible(True)
         
-        # 기술적 지표 계산 및 표시
-        self.plot_indicators(plot_df_copy)
+        # 기술적 지표 계산 및 표시 (최신 기본 캔들까지 포함한 구간일 때만 그 결과로 알림 평가)
+        self.plot_indicators(
+            self.display_candles, display_timeframe,
+            at_latest=display_timeframe == self.timeframe and hi == len(timestamps),
+        )
         
         # Only auto-range when explicitly requested (new symbol or reset view)
         # 그리고 오토스케일 기능이 켜져 있지 않은 경우에만 적용
@@ -197,22 +188,66 @@ class ChartMixin:
                 self._cci_scaled[f"{self.symbol}_{self.timeframe}"] = True
             print(f"Chart updated and auto-ranged to fit {self.symbol} price range.")
     
+    def choose_display_timeframe(self):
+        """현재 ViewBox 범위의 캔들당 픽셀 수에 맞는 피라미드 레벨 (타임프레임) 선택"""
+        pyramid = self.candle_store.pyramid
+        if pyramid is None or pyramid.base_timeframe != self.timeframe or not self.candlestick_item:
+            return self.timeframe
+        view_box = self.plot_item.getViewBox()
+        x_min, x_max = view_box.viewRange()[0]
+        return pyramid.choose_timeframe((x_max - x_min) * 1000, view_box.width(), PYRAMID_MIN_PIXELS_PER_CANDLE)
+    
+    def display_level_arrays(self, timeframe):
+        """표시할 레벨의 (타임스탬프 int64 배열, (N, 5) 배열) - 기본 레벨이면 캔들 저장소, 상위 레벨이면 피라미드 집계"""
+        if timeframe == self.timeframe:
+            return self.candle_store.timestamps, self.candle_store.values
+        return self.candle_store.pyramid.levels[timeframe]
+    
+    def display_slice(self, timestamps, auto_range=False):
+        """
+        캔들 아이템에 전달할 인덱스 구간 [lo, hi)
+        보이는 범위 앞뒤로 한 화면씩 여유를 두고, 앞쪽에는 지표 워밍업 캔들을 더 붙임.
+        전체 범위를 맞출 때(auto_range)나 첫 생성 시에는 전체 구간.
+        여유 구간 밖으로 이동하면 update_candle_level()에서 다시 잘라냄 (display_window)
+        """
+        count = len(timestamps)
+        self.display_window = (float('-inf'), float('inf'))
+        if auto_range or not self.candlestick_item or count == 0:
+            return 0, count
+        x_min, x_max = self.plot_item.getViewBox().viewRange()[0]
+        span = x_max - x_min
+        lo = int(timestamps.searchsorted((x_min - span) * 1000))
+        hi = int(timestamps.searchsorted((x_max + span) * 1000, side='right'))
+        if hi <= lo:
+            # 데이터가 없는 구간을 보는 중 -> 가장 가까운 캔들 하나만 유지
+            lo = min(lo, count - 1)
+            hi = lo + 1
+        self.display_window = (
+            x_min - span if lo > 0 else float('-inf'),
+            x_max + span if hi < count else float('inf'),
+        )
+        warmup = max(PYRAMID_WARMUP_CANDLES, self.cci_window, self.bollinger_window)
+        return max(lo - warmup, 0), hi
+    
+    def update_candle_level(self):
+        """확대/축소로 적합한 피라미드 레벨이 바뀌었거나 잘라 둔 구간 밖으로 이동했으면 캔들 다시 그리기"""
+        if not self.candlestick_item or len(self.candle_store) == 0:
+            return
+        x_min, x_max = self.plot_item.getViewBox().viewRange()[0]
+        outside = x_min < self.display_window[0] or x_max > self.display_window[1]
+        if outside or self.choose_display_timeframe() != self.candlestick_item.timeframe:
+            self.plot_data(auto_range=False)
+    
     def hide_chart_elements(self):
         """차트 요소 숨기기 (데이터가 없을 때)"""
         if self.candle_info_label: self.candle_info_label.setVisible(False) 
         if self.current_price_line: self.current_price_line.setVisible(False)
         if self.cci_info_label: self.cci_info_label.setVisible(False)
         
-        # 지표 그래프 초기화
-        if self.bollinger_upper_curve:
-            self.plot_item.removeItem(self.bollinger_upper_curve)
-            self.bollinger_upper_curve = None
-        if self.bollinger_middle_curve:
-            self.plot_item.removeItem(self.bollinger_middle_curve)
-            self.bollinger_middle_curve = None
-        if self.bollinger_lower_curve:
-            self.plot_item.removeItem(self.bollinger_lower_curve)
-            self.bollinger_lower_curve = None
+        # 지표 그래프 초기화 (진행 중인 지표 계산 결과도 무효화)
+        self.indicator_engine.invalidate()
+        self.clear_bollinger_elements()
+        self.clear_overlay_elements()
         if self.cci_curve:
             self.cci_plot_item.removeItem(self.cci_curve)
             self.cci_curve = None
@@ -223,7 +258,7 @@ class ChartMixin:
         self.plot_item.getViewBox().setLogMode(False, False)
         
         # 최근 150개 캔들로 확대
-        if self.detailed_candle_data and len(self.detailed_candle_data) > 0:
+        if len(self.candle_store) > 0:
             self.zoom_to_recent_candles(150)
             print(f"차트 뷰가 최근 150개 캔들로 초기화되었습니다.")
             self.append_log("차트 뷰가 최근 150개 캔들로 초기화되었습니다.")
@@ -264,10 +299,21 @@ class ChartMixin:
             # Use a timer to throttle updates when continuously panning/zooming
             if not self.auto_scale_timer.isActive():
                 self.auto_scale_timer.start(200)  # Apply auto-scale after 200ms without panning/zooming
+        
+        self.candle_level_timer.start(100)
+        
+        # 가장 오래된/최신 캔들 근처까지 이동하면 이력 페이지 로드
+        self.schedule_history_check()
+        
+        # 볼륨 프로파일은 보이는 범위 기준이므로 다시 그림
+        self.schedule_profile_refresh()
+        
+        # 차트 조작 중에는 선행 로드를 미룸
+        self.note_chart_activity()
     
     def apply_auto_scale(self):
         """Apply auto-scale to adjust Y-axis to fit only the visible candles"""
-        if not self.auto_scale_active or not self.candlestick_item or not self.detailed_candle_data:
+        if not self.auto_scale_active or not self.candlestick_item or self.display_candles is None:
             return
             
         view_box = self.plot_item.getViewBox()
@@ -280,19 +326,17 @@ class ChartMixin:
         # Get current visible X range (timestamps)
         x_min, x_max = view_range[0]
         
-        # Find candles within this range
-        visible_candles = [
-            d for d in self.detailed_candle_data 
-            if x_min <= d['time_axis_val'] <= x_max
-        ]
+        # Find candles within this range (표시 중인 레벨의 구간은 시간순으로 정렬되어 있음)
+        times = self.display_candles['time']
+        lo, hi = times.searchsorted(x_min), times.searchsorted(x_max, side='right')
         
-        if not visible_candles:
+        if hi <= lo:
             print("오토스케일: 보이는 영역에 데이터가 없습니다.")
             return
             
         # Find min and max prices in visible area
-        min_price = min(min(d['low'] for d in visible_candles), min(d['open'] for d in visible_candles))
-        max_price = max(max(d['high'] for d in visible_candles), max(d['close'] for d in visible_candles))
+        min_price = float(min(self.display_candles['low'][lo:hi].min(), self.display_candles['open'][lo:hi].min()))
+        max_price = float(max(self.display_candles['high'][lo:hi].max(), self.display_candles['close'][lo:hi].max()))
         
         # Add some padding (5% above and below)
         price_range = max_price - min_price
@@ -307,40 +351,32 @@ class ChartMixin:
             min_price <= self.current_price_line.value() <= max_price):
             self.current_price_line.setValue(self.current_price_line.value())
             
-        print(f"오토스케일 적용: 보이는 캔들 {len(visible_candles)}개에 맞게 Y축을 조정했습니다.")
+        print(f"오토스케일 적용: 보이는 캔들 {hi - lo}개에 맞게 Y축을 조정했습니다.")
     
     def zoom_to_recent_candles(self, num_candles=150):
         """최근 X개의 캔들만 보이도록 차트를 확대합니다"""
-        if not self.detailed_candle_data or len(self.detailed_candle_data) <= 1:
+        count = len(self.candle_store)
+        if count <= 1:
             return
-            
-        # 데이터를 시간순으로 정렬 (이미 정렬되어 있겠지만 확실히 하기 위해)
-        sorted_data = sorted(self.detailed_candle_data, key=lambda d: d['time_axis_val'])
         
         # 표시할 캔들 수가 전체 캔들 수보다 많으면 모든 캔들을 표시
-        candles_to_show = min(num_candles, len(sorted_data))
+        candles_to_show = min(num_candles, count)
         
-        if candles_to_show < len(sorted_data):
-            # 최근 X개 캔들만 선택 (리스트의 마지막 X개 요소)
-            target_candles = sorted_data[-candles_to_show:]
+        if candles_to_show < count:
+            # 최근 X개 기본 캔들만 선택 (캔들 저장소는 시간순으로 정렬되어 있음)
+            target_times = self.candle_store.timestamps[-candles_to_show:] / 1000.0
+            target_values = self.candle_store.values[-candles_to_show:]
             
             # 시간(X축) 범위 계산
-            x_min = target_candles[0]['time_axis_val']
-            x_max = target_candles[-1]['time_axis_val']
+            x_min = float(target_times[0])
+            x_max = float(target_times[-1])
             
-            # 각 캔들의 타임프레임에 따른 추가 여백 계산 (오른쪽에 여유 공간 추가)
-            if hasattr(self.candlestick_item, 'bar_width_seconds'):
-                padding = self.candlestick_item.bar_width_seconds * 5  # 캔들 5개 정도의 여유 공간
-            else:
-                # 기본값으로 마지막 캔들 간격의 5배 정도의 여유 공간
-                if len(target_candles) > 1:
-                    padding = (target_candles[-1]['time_axis_val'] - target_candles[-2]['time_axis_val']) * 5
-                else:
-                    padding = 3600  # 기본값 (1시간)
+            # 기본 타임프레임 기준 캔들 5개 정도의 여유 공간 (오른쪽)
+            padding = CandlestickItem.TIMEFRAME_SECONDS.get(self.timeframe, 3600) * 0.7 * 5
                 
             # 가격(Y축) 범위 계산
-            min_price = min(d['low'] for d in target_candles)
-            max_price = max(d['high'] for d in target_candles)
+            min_price = float(target_values[:, 2].min())
+            max_price = float(target_values[:, 1].max())
             
             # 가격 범위에 10% 여백 추가
             price_range = max_price - min_price
@@ -361,4 +397,4 @@ class ChartMixin:
         else:
             # 캔들 수가 적으면 전체 데이터 표시
             self.reset_chart_view()
-            print(f"전체 {len(sorted_data)}개 캔들이 표시됩니다 (최대 {num_candles}개 지정).") 
\ No newline at end of file
+            print(f"전체 {count}개 캔들이 표시됩니다 (최대 {num_candles}개 지정).") 
\ No newline at end of file
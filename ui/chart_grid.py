@@ -0,0 +1,228 @@
+"""
+여러 심볼을 작은 캔들 차트 격자로 동시에 보여주는 관심 종목 창을 정의하는 모듈
+"""
+
+import pyqtgraph as pg
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox,
+    QPushButton, QLineEdit, QSpinBox, QScrollArea
+)
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
+
+from core.market_data_hub import MarketDataHub
+from core.request_scheduler import PRIORITY_POLL
+from plotting.custom_plot_items import CandlestickItem, DateAxisItem
+from ui.render_scheduler import RenderScheduler
+from config.settings import (
+    DEFAULT_LIMIT, GRID_SYMBOLS, GRID_TIMEFRAME, GRID_COLUMNS, GRID_VISIBLE_CANDLES
+)
+
+class MiniChartView(pg.GraphicsLayoutWidget):
+    """
+    격자 안의 작은 캔들 차트 하나
+    
+    허브 피드를 구독하고, 새 데이터가 오면 RenderScheduler에 다시 그리기만 요청함.
+    render()는 최근 GRID_VISIBLE_CANDLES개 캔들만 CandlestickItem에 넘기고 범위를 직접 지정하므로
+    자동 범위 계산이나 마우스 상호작용 비용이 없음. 더블클릭하면 selected 시그널로 심볼을 전달함
+    """
+    
+    rows_loaded = pyqtSignal(object)  # 초기 REST 요청 Future (스케줄러 스레드에서 전달)
+    selected = pyqtSignal(str, str)
+    
+    def __init__(self, hub, scheduler, symbol, timeframe, parent=None):
+        super().__init__(parent)
+        self.hub = hub
+        self.scheduler = scheduler
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.rendered_version = None
+        self.load_future = None
+        self.setMinimumSize(160, 120)
+        
+        self.title_label = self.addLabel(f"{symbol} {timeframe}", row=0, col=0, justify='left', size='8pt')
+        self.plot = self.addPlot(row=1, col=0, axisItems={'bottom': DateAxisItem(orientation='bottom')})
+        self.plot.hideAxis('left')
+        self.plot.showAxis('right')
+        self.plot.getAxis('right').setWidth(50)
+        self.plot.setMouseEnabled(x=False, y=False)
+        self.plot.hideButtons()
+        self.plot.setMenuEnabled(False)
+        self.plot.disableAutoRange()
+        self.candlestick_item = CandlestickItem([], timeframe)
+        self.plot.addItem(self.candlestick_item)
+        
+        self.feed = hub.subscribe(symbol, timeframe)
+        self.feed.signals.new_data.connect(self.handle_new_data)
+        self.rows_loaded.connect(self.apply_initial_rows)
+        if len(self.feed.candle_store):
+            self.scheduler.mark_dirty(self)
+        elif hub.is_ready:
+            self.request_initial_rows()
+        else:
+            hub.ready.connect(self.request_initial_rows)
+    
+    @pyqtSlot()
+    def request_initial_rows(self):
+        """저장소가 비어 있으면 최근 캔들 요청 (거래소 연결 준비 이후)"""
+        if self.feed is None or len(self.feed.candle_store) or not self.hub.exchange_manager.rest_exchange:
+            return
+        self.load_future = self.hub.exchange_manager.submit_ohlcv_rows(
+            self.symbol, self.timeframe, DEFAULT_LIMIT, priority=PRIORITY_POLL
+        )
+        self.load_future.add_done_callback(self.rows_loaded.emit)
+    
+    @pyqtSlot(object)
+    def apply_initial_rows(self, future):
+        """초기 캔들 병합 (그 사이 다른 창이 채운 경우에도 upsert이므로 안전)"""
+        self.load_future = None
+        if self.feed is None or future.cancelled():
+            return
+        try:
+            rows = future.result()
+        except Exception as e:
+            print(f"{self.symbol} {self.timeframe} 초기 캔들 로드 실패: {e}")
+            return
+        if rows:
+            self.feed.candle_store.upsert(rows)
+            self.scheduler.mark_dirty(self)
+    
+    @pyqtSlot(object)
+    def handle_new_data(self, batch):
+        self.scheduler.mark_dirty(self)
+    
+    def is_render_visible(self):
+        """창이 최소화되었거나 스크롤 영역 밖이면 False"""
+        return (self.isVisible() and not self.window().isMinimized()
+                and not self.visibleRegion().isEmpty())
+    
+    def render(self):
+        """최근 캔들로 차트와 제목 갱신 (데이터 버전이 바뀐 경우에만)"""
+        store = self.feed.candle_store if self.feed else None
+        if store is None or not len(store) or store.version == self.rendered_version:
+            return
+        self.rendered_version = store.version
+        
+        timestamps = store.timestamps[-GRID_VISIBLE_CANDLES:]
+        values = store.values[-GRID_VISIBLE_CANDLES:]
+        times = timestamps / 1000.0
+        self.candlestick_item.setData({
+            'time': times, 'open': values[:, 0], 'high': values[:, 1],
+            'low': values[:, 2], 'close': values[:, 3],
+        })
+        half = self.candlestick_item.bar_width_seconds
+        self.plot.setRange(
+            xRange=(times[0] - half, times[-1] + half),
+            yRange=(values[:, 2].min(), values[:, 1].max()),
+            padding=0.02,
+        )
+        
+        last, first_open = values[-1, 3], values[0, 0]
+        change = (last / first_open - 1) * 100 if first_open else 0.0
+        color = '#00C800' if change >= 0 else '#DC0000'
+        self.title_label.setText(
+            f"{self.symbol} {self.timeframe}  <span style='color:{color}'>{last:g} ({change:+.2f}%)</span>"
+        )
+    
+    def mouseDoubleClickEvent(self, event):
+        self.selected.emit(self.symbol, self.timeframe)
+        super().mouseDoubleClickEvent(event)
+    
+    def release(self):
+        """구독 해제 및 대기 중인 초기 요청 취소"""
+        if self.load_future is not None:
+            self.load_future.cancel()
+            self.load_future = None
+        self.scheduler.discard(self)
+        if self.feed is not None:
+            self.feed.signals.new_data.disconnect(self.handle_new_data)
+            self.hub.unsubscribe(self.feed)
+            self.feed = None
+
+class ChartGridWindow(QWidget):
+    """
+    관심 종목 격자 창
+    심볼 목록과 타임프레임으로 MiniChartView 격자를 만들고, 모든 차트가 하나의 RenderScheduler를 공유함.
+    차트를 더블클릭하면 symbol_selected 시그널로 (심볼, 타임프레임)을 메인 차트에 전달함
+    """
+    
+    symbol_selected = pyqtSignal(str, str)
+    closed = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle("관심 종목 격자")
+        self.resize(1200, 800)
+        self.hub = MarketDataHub.instance().acquire()
+        self.scheduler = RenderScheduler()
+        self.views = []
+        self.init_ui()
+        self.apply_layout()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        
+        self.symbols_edit = QLineEdit(", ".join(GRID_SYMBOLS))
+        self.timeframe_combo = QComboBox()
+        self.timeframe_combo.addItems(['1m', '3m', '5m', '15m', '30m', '1h', '4h', '1d'])
+        self.timeframe_combo.setCurrentText(GRID_TIMEFRAME)
+        self.columns_spin = QSpinBox()
+        self.columns_spin.setRange(1, 8)
+        self.columns_spin.setValue(GRID_COLUMNS)
+        self.columns_spin.setPrefix("열 ")
+        self.apply_button = QPushButton("적용")
+        self.apply_button.clicked.connect(self.apply_layout)
+        self.status_label = QLabel("")
+        
+        controls.addWidget(QLabel("Symbols:"))
+        controls.addWidget(self.symbols_edit, 1)
+        controls.addWidget(QLabel("Timeframe:"))
+        controls.addWidget(self.timeframe_combo)
+        controls.addWidget(self.columns_spin)
+        controls.addWidget(self.apply_button)
+        controls.addWidget(self.status_label)
+        
+        self.grid_container = QWidget()
+        self.grid_layout = QGridLayout(self.grid_container)
+        self.grid_layout.setSpacing(2)
+        self.grid_layout.setContentsMargins(0, 0, 0, 0)
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(self.grid_container)
+        
+        layout.addLayout(controls)
+        layout.addWidget(scroll)
+        self.setLayout(layout)
+    
+    def apply_layout(self):
+        """입력한 심볼/타임프레임으로 격자 재구성 (같은 피드는 허브에서 공유되므로 재구독 비용이 작음)"""
+        symbols = [s.strip() for s in self.symbols_edit.text().split(',') if s.strip()]
+        timeframe = self.timeframe_combo.currentText()
+        columns = self.columns_spin.value()
+        
+        # 새 구독을 먼저 만든 뒤 기존 차트를 해제해 겹치는 피드의 스트림이 끊기지 않게 함
+        old_views = self.views
+        self.views = []
+        for symbol in symbols:
+            view = MiniChartView(self.hub, self.scheduler, symbol, timeframe)
+            view.selected.connect(self.symbol_selected)
+            self.views.append(view)
+        for view in old_views:
+            view.release()
+            self.grid_layout.removeWidget(view)
+            view.deleteLater()
+        for i, view in enumerate(self.views):
+            self.grid_layout.addWidget(view, i // columns, i % columns)
+        self.status_label.setText(f"{len(self.views)}개 차트")
+    
+    def closeEvent(self, event):
+        """모든 차트 구독 해제 (창을 다시 열면 새로 구성)"""
+        if self.hub is not None:
+            for view in self.views:
+                view.release()
+            self.views = []
+            self.scheduler.stop()
+            self.hub.release()
+            self.hub = None
+            self.closed.emit()
+        event.accept()
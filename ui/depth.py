@@ -0,0 +1,129 @@
+"""
+호가창 깊이 히트맵 패널 기능을 제공하는 모듈
+"""
+
+import pyqtgraph as pg
+from PyQt6.QtCore import QThread, QRectF, pyqtSlot
+
+from core.depth_ring import DepthRing
+from core.depth_worker import DepthWorker
+from config.settings import (
+    DEPTH_COLUMNS, DEPTH_ROWS, DEPTH_STEP_RATIO, DEPTH_SAMPLE_MS, DEPTH_TILE_COLUMNS, DEPTH_LEVEL_HYSTERESIS
+)
+
+class DepthMixin:
+    """
+    호가 깊이 히트맵 기능을 제공하는 Mixin 클래스
+    
+    DepthWorker가 보낸 호가 스냅샷을 DepthRing에 열 단위로 기록하고, 링의 타일마다 하나씩 둔
+    ImageItem으로 메인 차트와 X축이 연결된 패널에 표시함. 새 열이 기록된 타일만 다시 올리므로
+    갱신 비용은 링 전체가 아니라 타일 크기(DEPTH_TILE_COLUMNS x DEPTH_ROWS)에 비례함
+    """
+    
+    def init_depth_variables(self):
+        self.show_depth = False
+        self.depth_ring = None
+        self.depth_worker = None
+        self.depth_thread = None
+        self.depth_tiles = []
+        self.depth_levels = None
+    
+    def setup_depth_chart(self):
+        """히트맵 패널 생성 (메인 차트와 X축 연결, 기본 숨김)"""
+        self.depth_plot_item = self.depth_chart_widget.addPlot(row=0, col=0)
+        self.depth_plot_item.setXLink(self.chart_widget)
+        self.depth_plot_item.hideAxis('left')
+        self.depth_plot_item.showAxis('right')
+        self.depth_plot_item.getAxis('right').setLabel(text='Depth')
+        self.depth_plot_item.getAxis('bottom').setStyle(showValues=False)
+        
+        lut = pg.colormap.get('inferno').getLookupTable(nPts=256)
+        for _ in range(DEPTH_COLUMNS // DEPTH_TILE_COLUMNS):
+            tile = pg.ImageItem(axisOrder='col-major')
+            tile.setLookupTable(lut)
+            tile.setVisible(False)
+            self.depth_plot_item.addItem(tile)
+            self.depth_tiles.append(tile)
+        self.depth_chart_widget.setVisible(False)
+    
+    def toggle_depth(self):
+        """호가 히트맵 표시/숨김 토글"""
+        self.show_depth = self.depth_button.isChecked()
+        self.depth_chart_widget.setVisible(self.show_depth)
+        if self.show_depth:
+            self.start_depth_stream()
+            self.append_log("호가 히트맵을 표시합니다.")
+        else:
+            self.stop_depth_stream()
+            self.append_log("호가 히트맵을 숨깁니다.")
+    
+    def start_depth_stream(self):
+        """현재 심볼의 호가 스트림 시작 (링 버퍼 새로 생성)"""
+        self.stop_depth_stream()
+        ws_exchange = self.exchange_manager.create_ws_exchange()
+        if ws_exchange is None:
+            print("호가 스트림을 시작할 수 없습니다: WebSocket 거래소를 생성하지 못했습니다.")
+            return
+        self.depth_ring = DepthRing(DEPTH_COLUMNS, DEPTH_ROWS, DEPTH_STEP_RATIO, DEPTH_SAMPLE_MS, DEPTH_TILE_COLUMNS)
+        self.depth_levels = None
+        for tile in self.depth_tiles:
+            tile.setVisible(False)
+        self.depth_worker = DepthWorker(ws_exchange, self.symbol)
+        self.depth_thread = QThread()
+        self.depth_worker.moveToThread(self.depth_thread)
+        
+        self.depth_worker.signals.new_data.connect(self.update_depth_heatmap)
+        self.depth_worker.signals.error.connect(self.handle_worker_error)
+        self.depth_worker.signals.finished.connect(self.depth_thread.quit)
+        self.depth_worker.signals.finished.connect(self.depth_worker.deleteLater)
+        self.depth_thread.finished.connect(self.depth_thread.deleteLater)
+        
+        self.depth_thread.started.connect(self.depth_worker.start_streaming)
+        self.depth_thread.start()
+        print(f"호가 스트림을 시작했습니다: {self.symbol}")
+    
+    def stop_depth_stream(self):
+        """호가 스트림 정지"""
+        if self.depth_thread and self.depth_thread.isRunning():
+            if self.depth_worker:
+                self.depth_worker.stop()
+            self.depth_thread.quit()
+            if not self.depth_thread.wait(5000):
+                print("호가 스레드가 제한 시간 내에 종료되지 않았습니다. 강제 종료합니다.")
+                self.depth_thread.terminate()
+                self.depth_thread.wait()
+        self.depth_worker = None
+        self.depth_thread = None
+    
+    def restart_depth_stream(self):
+        """심볼 변경 시 호가 스트림 재시작 (표시 중일 때만, 타임프레임만 바뀐 경우에는 유지)"""
+        if self.show_depth and (self.depth_worker is None or self.depth_worker.symbol != self.symbol):
+            self.start_depth_stream()
+    
+    @pyqtSlot(object)
+    def update_depth_heatmap(self, snapshot):
+        """
+        호가 스냅샷을 링에 기록하고 히트맵 갱신 (내용이 바뀐 타일만 다시 올림)
+        색 범위는 최신 열 최대값이 크게 바뀔 때만 갱신하며, 이때는 모든 타일을 다시 올림
+        심볼 전환 전 워커가 큐에 남긴 스냅샷은 새 링의 가격 구간과 맞지 않으므로 버림
+        """
+        if self.depth_ring is None or self.depth_worker is None or snapshot.get('symbol') != self.depth_worker.symbol:
+            return
+        if not self.depth_ring.add_snapshot(snapshot['timestamp'], snapshot['bids'], snapshot['asks']):
+            return
+        
+        upper = float(self.depth_ring.latest_column().max()) or 1.0
+        dirty = self.depth_ring.take_dirty_tiles()
+        if self.depth_levels is None or abs(upper - self.depth_levels[1]) > DEPTH_LEVEL_HYSTERESIS * self.depth_levels[1]:
+            self.depth_levels = (0, upper)
+            dirty = range(self.depth_ring.tile_count)
+        for index in dirty:
+            columns, rect = self.depth_ring.tile(index)
+            tile = self.depth_tiles[index]
+            tile.setImage(columns, autoLevels=False, levels=self.depth_levels)
+            tile.setRect(QRectF(*rect))
+            tile.setVisible(True)
+        
+        # 가격 축은 현재 호가 범위로 유지
+        bids, asks = snapshot['bids'], snapshot['asks']
+        self.depth_plot_item.setYRange(bids[-1, 0], asks[-1, 0], padding=0)
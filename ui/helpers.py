@@ -2,6 +2,7 @@
 UI 관련 헬퍼 함수 및 유틸리티 클래스를 제공하는 모듈
 """
 
+import time
 from PyQt6.QtCore import QRectF
 from PyQt6.QtWidgets import QApplication, QMainWindow
 
@@ -22,6 +23,18 @@ def create_rect_from_range(x_range, y_range):
         y_range[1] - y_range[0]
     )
 
+def format_candle_time(seconds):
+    """
+    캔들 시각(초, epoch)을 정보 라벨용 문자열로 변환 (UTC, 캔들 DataFrame의 timestamp와 같은 기준)
+    
+    Parameters:
+    seconds (float): 캔들 시작 시각
+    
+    Returns:
+    str: 'YYYY-MM-DD HH:MM:SS'
+    """
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(float(seconds)))
+
 def format_ohlcv_info(candle_data):
     """
     OHLCV 데이터로부터 정보 텍스트 포맷팅
@@ -0,0 +1,201 @@
+"""
+차트 이동 시 과거 캔들 이력을 필요할 때 불러오는 기능을 제공하는 모듈
+"""
+
+import time
+import pyqtgraph as pg
+from PyQt6.QtCore import pyqtSlot
+
+from core.candle_store import frame_to_rows
+from core.history_loader import HistoryLoader
+from plotting.custom_plot_items import CandlestickItem
+from config.settings import HISTORY_PREFETCH_CANDLES, HISTORY_MAX_CANDLES, TRADE_LATE_WINDOW_MS
+
+class HistoryMixin:
+    """
+    이력 페이징 기능을 제공하는 Mixin 클래스
+    
+    보이는 범위가 가장 오래된 캔들에 가까워지면 이전 페이지를 불러와 앞에 붙이고,
+    캔들 수가 HISTORY_MAX_CANDLES를 넘으면 보이는 범위에서 먼 구간을 버림.
+    최신 구간을 버린 동안(live_detached)에는 실시간 캔들을 저장소에 병합하지 않으며,
+    오른쪽 끝으로 다시 이동하면 이후 페이지를 불러와 최신 캔들까지 이어 붙임
+    캔들 저장소와 live_detached/persisted_until 상태는 시장 데이터 허브의 피드가 소유하며,
+    다른 창과 공유 중인 저장소는 구독 창 수 x HISTORY_MAX_CANDLES를 한도로 최신 구간을 유지한 채
+    오래된 쪽만 잘라냄 (각 창은 최신 캔들에서 이 한도 안쪽까지만 이전 페이지를 불러옴)
+    """
+    
+    def init_history(self):
+        """페이징 상태 초기화 (이력 로더는 거래소 연결 준비 이후 init_history_loader()에서 생성)"""
+        self.history_loader = None
+        self.history_pending = False
+        self.history_exhausted = False
+        
+        # 이동/확대 중 요청이 몰리지 않도록 범위 변경이 잠시 멈춘 뒤에 확인
+        self.history_timer = pg.QtCore.QTimer()
+        self.history_timer.setSingleShot(True)
+        self.history_timer.timeout.connect(self.check_history_paging)
+    
+    def init_history_loader(self):
+        """이력 로더 생성 (REST API를 사용할 수 있을 때만)"""
+        if self.history_loader is not None or not self.rest_exchange:
+            return
+        self.history_loader = HistoryLoader(self.exchange_manager)
+        self.history_loader.signals.page_ready.connect(self.apply_history_page)
+        self.history_loader.signals.error.connect(self.append_log)
+    
+    def reset_history(self):
+        """심볼/타임프레임 변경 시 페이징 상태 초기화"""
+        self.history_pending = False
+        self.history_exhausted = False
+    
+    def save_loaded_history(self, df):
+        """REST로 받은 초기 캔들 중 마감된 캔들을 로컬 이력 저장소에 기록"""
+        if self.history_loader is None or len(df) < 2:
+            return
+        rows = frame_to_rows(df)[:-1]
+        self.history_loader.save_closed(self.symbol, self.timeframe, rows)
+        self.market_feed.persisted_until = int(rows[-1, 0]) + 1
+    
+    def load_local_trade_candles(self):
+        """체결 집계 타임프레임(1s/5s/15s)의 초기 데이터로 로컬 저장소의 최근 캔들 로드 (이후는 TradeWorker가 채움)"""
+        if self.history_loader is None:
+            return
+        self.market_feed.history_loaded = True  # 로컬 이력이 없어도 이후는 체결 스트림이 채움
+        rows = self.history_loader.store.load_before(self.symbol, self.timeframe, int(time.time() * 1000), self.limit)
+        if len(rows) == 0:
+            print(f"{self.symbol} {self.timeframe}: 로컬 이력이 없어 체결 스트림으로 새로 집계합니다.")
+            return
+        self.candle_store.upsert(rows)
+        self.data_df = self.candle_store.to_frame()
+        self.market_feed.persisted_until = int(rows[-1, 0]) + 1
+        print(f"로컬 이력에서 {len(rows)} 개의 {self.timeframe} 캔들을 로드했습니다.")
+        self.plot_data(auto_range=True)
+    
+    def persist_closed_candles(self):
+        """
+        실시간으로 병합된 캔들 중 새로 마감된 캔들을 로컬 이력 저장소에 기록
+        (체결 집계 캔들은 늦은 체결 허용 구간이 지난 뒤에 기록)
+        """
+        if self.history_loader is None or len(self.candle_store) == 0 or self.market_feed.delta_pending:
+            return  # 세션 스냅샷 이후 공백이 채워지기 전에 기록하면 그 구간을 건너뛰게 됨
+        tf_ms = CandlestickItem.TIMEFRAME_SECONDS.get(self.timeframe, 3600) * 1000
+        closed_before = int(time.time() * 1000) - tf_ms - TRADE_LATE_WINDOW_MS
+        timestamps = self.candle_store.timestamps
+        start = 0 if self.market_feed.persisted_until is None else timestamps.searchsorted(self.market_feed.persisted_until)
+        stop = timestamps.searchsorted(closed_before, side='right')
+        if stop <= start:
+            return
+        rows = [
+            [int(ts)] + values.tolist()
+            for ts, values in zip(timestamps[start:stop], self.candle_store.values[start:stop])
+        ]
+        self.history_loader.save_closed(self.symbol, self.timeframe, rows)
+        self.market_feed.persisted_until = int(timestamps[stop - 1]) + 1
+    
+    def schedule_history_check(self):
+        if self.history_loader is not None and not self.history_timer.isActive():
+            self.history_timer.start(150)
+    
+    def check_history_paging(self):
+        """보이는 범위가 로드된 구간의 끝에 가까우면 다음 페이지 요청"""
+        if self.history_loader is None or self.history_pending or len(self.candle_store) == 0:
+            return
+        x_min, x_max = self.plot_item.getViewBox().viewRange()[0]
+        tf_seconds = CandlestickItem.TIMEFRAME_SECONDS.get(self.timeframe, 3600)
+        margin = HISTORY_PREFETCH_CANDLES * tf_seconds
+        first = self.candle_store.first_timestamp / 1000
+        last = self.candle_store.last_timestamp / 1000
+        
+        # 보이는 구간만으로 보관 한도를 채우면 새 페이지를 붙여도 바로 잘려나가므로 더 불러오지 않음
+        if (x_max - x_min) / tf_seconds >= HISTORY_MAX_CANDLES:
+            return
+        shared_budget = HISTORY_MAX_CANDLES * self.market_feed.refcount
+        within_budget = self.market_feed.refcount <= 1 or (last - x_min) / tf_seconds < shared_budget
+        if x_min < first + margin and not self.history_exhausted and within_budget:
+            direction, anchor = 'older', self.candle_store.first_timestamp
+        elif self.market_feed.live_detached and x_max > last - margin:
+            direction, anchor = 'newer', self.candle_store.last_timestamp
+        else:
+            return
+        self.history_pending = True
+        self.history_loader.request_page(self.symbol, self.timeframe, anchor, direction)
+    
+    @pyqtSlot(object)
+    def apply_history_page(self, page):
+        """불러온 이력 페이지를 캔들 저장소에 병합 (뷰 범위는 유지)"""
+        if page['symbol'] != self.symbol or page['timeframe'] != self.timeframe:
+            return  # 심볼 전환 이전의 요청
+        self.history_pending = False
+        if page['source'] == 'error':
+            return
+        
+        rows = page['rows']
+        if page['direction'] == 'older':
+            first_before = self.candle_store.first_timestamp
+            self.candle_store.upsert(rows)
+            if self.candle_store.first_timestamp == first_before:
+                # 상장 이전까지 도달
+                self.history_exhausted = True
+                print(f"{self.symbol} {self.timeframe}: 더 이전 캔들이 없습니다.")
+        else:
+            self.candle_store.upsert(rows)
+            if len(rows) < self.history_loader.page_size:
+                # 최신 캔들까지 이어짐 -> 실시간 캔들 병합 재개
+                self.market_feed.live_detached = False
+        
+        if len(rows):
+            print(f"이력 {page['direction']} 페이지 로드: {len(rows)}개 캔들 ({page['source']})")
+            self.evict_far_candles(keep=(int(rows[0][0]), int(rows[-1][0])))
+        self.data_df = self.candle_store.to_frame()
+        self.plot_data(auto_range=False)
+        
+        # 연속 이동 중이면 이어서 다음 페이지 확인
+        self.schedule_history_check()
+    
+    def evict_far_candles(self, keep=None):
+        """
+        캔들 수가 한도를 넘으면 보이는 범위를 중심으로 한도만큼만 남김
+        keep: 방금 병합한 페이지의 (첫 ts, 마지막 ts) - 이 구간은 버리지 않도록 남길 범위를 그쪽으로 옮김
+        """
+        if self.market_feed.refcount > 1:
+            self.evict_shared_candles(keep)
+            return
+        count = len(self.candle_store)
+        if count <= HISTORY_MAX_CANDLES:
+            return
+        x_min, x_max = self.plot_item.getViewBox().viewRange()[0]
+        timestamps = self.candle_store.timestamps
+        center = (timestamps.searchsorted(x_min * 1000) + timestamps.searchsorted(x_max * 1000)) // 2
+        start = min(max(center - HISTORY_MAX_CANDLES // 2, 0), count - HISTORY_MAX_CANDLES)
+        if keep is not None:
+            keep_start = timestamps.searchsorted(keep[0])
+            keep_stop = timestamps.searchsorted(keep[1], side='right')
+            start = min(max(start, keep_stop - HISTORY_MAX_CANDLES), keep_start)
+        stop = start + HISTORY_MAX_CANDLES
+        
+        self.candle_store.keep_range(start, stop)
+        if start > 0:
+            # 현재 첫 캔들 이전 구간을 실제로 버린 경우에만 다시 불러올 수 있게 함
+            self.history_exhausted = False
+        if stop < count:
+            self.market_feed.live_detached = True
+        print(f"캔들 {count - HISTORY_MAX_CANDLES}개를 메모리에서 제거했습니다. (보관 {HISTORY_MAX_CANDLES}개)")
+    
+    def evict_shared_candles(self, keep=None):
+        """
+        다른 창과 공유 중인 저장소의 메모리 제한 (구독 창 수 x HISTORY_MAX_CANDLES)
+        다른 창의 실시간 갱신이 끊기지 않도록 최신 구간은 남기고, 이 창의 보이는 범위와 방금 병합한 페이지 이전만 잘라냄
+        """
+        count = len(self.candle_store)
+        budget = HISTORY_MAX_CANDLES * self.market_feed.refcount
+        if count <= budget:
+            return
+        timestamps = self.candle_store.timestamps
+        start = min(count - budget, timestamps.searchsorted(self.plot_item.getViewBox().viewRange()[0][0] * 1000))
+        if keep is not None:
+            start = min(start, timestamps.searchsorted(keep[0]))
+        if start <= 0:
+            return
+        self.candle_store.keep_range(start, count)
+        self.history_exhausted = False
+        print(f"공유 저장소에서 캔들 {start}개를 메모리에서 제거했습니다. (보관 {count - start}개)")
@@ -3,10 +3,10 @@
 """
 
 import pyqtgraph as pg
-from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtCore import Qt, QRectF, pyqtSlot
 from PyQt6.QtGui import QColor
 
-from utils.calculations import calculate_bollinger_bands, calculate_cci
+from core.indicator_worker import make_snapshot
 from utils.signals import detect_cci_signals
 from ui.styles import BOLLINGER_BUTTON_ACTIVE_STYLE, CCI_BUTTON_ACTIVE_STYLE
 
@@ -35,15 +35,7 @@ class IndicatorsMixin:
             self.append_log("볼린저 밴드를 숨깁니다.")
             
             # 볼린저 밴드 곡선 제거
-            if self.bollinger_upper_curve:
-                self.plot_item.removeItem(self.bollinger_upper_curve)
-                self.bollinger_upper_curve = None
-            if self.bollinger_middle_curve:
-                self.plot_item.removeItem(self.bollinger_middle_curve)
-                self.bollinger_middle_curve = None
-            if self.bollinger_lower_curve:
-                self.plot_item.removeItem(self.bollinger_lower_curve)
-                self.bollinger_lower_curve = None
+            self.clear_bollinger_elements()
         
         # 데이터가 있으면 차트 다시 그리기
         if not self.data_df.empty:
@@ -99,6 +91,10 @@ class IndicatorsMixin:
         if self.cci_current_line:
             self.cci_plot_item.removeItem(self.cci_current_line)
             self.cci_current_line = None
+        # CCI 기준선 제거
+        for line in self.cci_reference_lines:
+            self.cci_plot_item.removeItem(line)
+        self.cci_reference_lines = []
         # CCI 크로스헤어 숨기기
         if self.cci_crosshair_v and self.cci_crosshair_v.isVisible():
             self.cci_crosshair_v.setVisible(False)
@@ -110,152 +106,199 @@ class IndicatorsMixin:
         # CCI 데이터 초기화
         self.cci_data = []
     
-    def plot_indicators(self, df):
-        """기술적 지표 계산 및 표시"""
-        if self.show_bollinger:
-            self.plot_bollinger_bands(df)
-        
-        if self.show_cci:
-            self.plot_cci(df)
-    
-    def plot_bollinger_bands(self, df):
-        """볼린저 밴드 계산 및 표시"""
-        if len(df) < self.bollinger_window:
-            return
-            
-        # 기존 볼린저 밴드 제거
+    def clear_bollinger_elements(self):
+        """볼린저 밴드 곡선 제거"""
         if self.bollinger_upper_curve:
             self.plot_item.removeItem(self.bollinger_upper_curve)
+            self.bollinger_upper_curve = None
         if self.bollinger_middle_curve:
             self.plot_item.removeItem(self.bollinger_middle_curve)
+            self.bollinger_middle_curve = None
         if self.bollinger_lower_curve:
             self.plot_item.removeItem(self.bollinger_lower_curve)
-            
-        # 볼린저 밴드 계산
-        middle_band, upper_band, lower_band = calculate_bollinger_bands(
-            df, window=self.bollinger_window, num_std=self.bollinger_std
-        )
+            self.bollinger_lower_curve = None
+    
+    def indicator_requests(self, length):
+        """
+        현재 표시/알림 설정에 필요한 지표 요청 (결과 키 -> (레지스트리 지표 이름, 파라미터))
         
-        if middle_band is not None:
-            # X값으로 timestamp 사용
-            x_values = df['time_axis_val'].values
-            
+        Parameters:
+        length (int): 캔들 수 (윈도우보다 짧으면 해당 지표 제외)
+        """
+        requests = {}
+        if self.show_bollinger and length >= self.bollinger_window:
+            requests['bollinger'] = ('bollinger', {'window': self.bollinger_window, 'num_std': self.bollinger_std})
+        if self.show_cci and length >= self.cci_window:
+            requests['cci'] = ('cci', {'window': self.cci_window})
+        # 설정에 등록된 추가 오버레이 지표 (EMA, VWAP 등)
+        for key, (name, params, _) in self.indicator_overlays.items():
+            requests[key] = (name, params)
+        # 알림 평가에만 필요한 지표 (화면에 표시되지 않는 경우)
+        for key, request in self.alert_indicator_requests(length).items():
+            requests.setdefault(key, request)
+        return requests
+    
+    def plot_indicators(self, candles, timeframe, at_latest=True):
+        """
+        기술적 지표 계산 요청
+        계산은 IndicatorEngine의 워커 스레드에서 수행되고,
+        결과는 apply_indicator_results()에서 GUI 스레드로 반영됨
+        
+        Parameters:
+        candles (dict): plot_data()가 캔들 아이템에 전달한 레벨 구간 ('time', 'open', ..., 'volume' 배열)
+        timeframe (str): 구간의 타임프레임 (피라미드 레벨이면 기본 타임프레임과 다름, 결과 캐시 식별자)
+        at_latest (bool): 기본 타임프레임의 최신 캔들까지 포함하는지 여부 - 아니면 결과로 알림을 평가하지 않고
+                          저장소의 최근 윈도우로 따로 평가함
+        """
+        self.indicators_at_latest = at_latest
+        if not at_latest:
+            self.evaluate_window_alerts(self.symbol, self.candle_store)
+        requests = self.indicator_requests(len(candles['time']))
+        
+        if not requests:
+            # 이전에 제출된 요청의 결과가 뒤늦게 반영되지 않도록 무효화
+            self.indicator_engine.invalidate()
+            return
+        
+        columns = dict(candles, time_axis_val=candles['time'])
+        self.indicator_engine.submit(make_snapshot(columns), requests, self.symbol, timeframe)
+    
+    @pyqtSlot(object)
+    def apply_indicator_results(self, result):
+        """워커 스레드에서 계산된 지표 결과를 기존 플롯 아이템에 반영"""
+        if self.indicator_engine.is_stale(result['version']):
+            return  # 더 새로운 데이터가 이미 도착함
+        
+        x_values = result['x']
+        indicators = result['indicators']
+        
+        if self.show_bollinger and 'bollinger' in indicators:
+            bands = indicators['bollinger']
+            self.update_bollinger_curves(x_values, bands['middle'], bands['upper'], bands['lower'])
+        
+        if self.show_cci and 'cci' in indicators:
+            self.update_cci_curve(x_values, indicators['cci']['cci'])
+        
+        for key in self.indicator_overlays:
+            if key in indicators:
+                self.update_overlay_curves(key, x_values, indicators[key])
+        
+        if self.indicators_at_latest:
+            self.check_indicator_alerts(indicators)
+        self.trace_indicators()
+    
+    def update_overlay_curves(self, key, x_values, outputs):
+        """레지스트리 기반 오버레이 지표 곡선 갱신 (출력마다 곡선 하나)"""
+        _, _, color = self.indicator_overlays[key]
+        for output, values in outputs.items():
+            curve = self.overlay_curves.get((key, output))
+            if curve is None:
+                curve = pg.PlotDataItem(pen=pg.mkPen(color=color, width=1), name=f"{key} {output}")
+                self.plot_item.addItem(curve)
+                self.overlay_curves[(key, output)] = curve
+            curve.setData(x_values, values)
+    
+    def clear_overlay_elements(self):
+        """오버레이 지표 곡선 제거"""
+        for curve in self.overlay_curves.values():
+            self.plot_item.removeItem(curve)
+        self.overlay_curves = {}
+    
+    def update_bollinger_curves(self, x_values, middle_band, upper_band, lower_band):
+        """볼린저 밴드 곡선 데이터 갱신 (곡선이 없으면 한 번만 생성)"""
+        if self.bollinger_middle_curve is None:
             # 중간 밴드 (SMA)
             self.bollinger_middle_curve = pg.PlotDataItem(
-                x_values, middle_band.values,
                 pen=pg.mkPen(color='w', width=1),
                 name="BB Middle"
             )
             self.plot_item.addItem(self.bollinger_middle_curve)
-            
+        if self.bollinger_upper_curve is None:
             # 상단 밴드
             self.bollinger_upper_curve = pg.PlotDataItem(
-                x_values, upper_band.values,
                 pen=pg.mkPen(color='b', width=1, style=Qt.PenStyle.DashLine),
                 name="BB Upper"
             )
             self.plot_item.addItem(self.bollinger_upper_curve)
-            
+        if self.bollinger_lower_curve is None:
             # 하단 밴드
             self.bollinger_lower_curve = pg.PlotDataItem(
-                x_values, lower_band.values,
                 pen=pg.mkPen(color='b', width=1, style=Qt.PenStyle.DashLine),
                 name="BB Lower"
             )
             self.plot_item.addItem(self.bollinger_lower_curve)
-            
-            print(f"볼린저 밴드 계산됨 (주기: {self.bollinger_window})")
-    
-    def plot_cci(self, df):
-        """CCI 계산 및 표시"""
-        if len(df) < self.cci_window:
-            return
-            
-        # 기존 CCI 곡선 제거
-        if self.cci_curve:
-            self.cci_plot_item.removeItem(self.cci_curve)
-            self.cci_curve = None
-        # CCI 현재값 라인 제거
-        if self.cci_current_line:
-            self.cci_plot_item.removeItem(self.cci_current_line)
-            self.cci_current_line = None
         
-        # CCI 계산
-        cci_values = calculate_cci(df, window=self.cci_window)
+        self.bollinger_middle_curve.setData(x_values, middle_band)
+        self.bollinger_upper_curve.setData(x_values, upper_band)
+        self.bollinger_lower_curve.setData(x_values, lower_band)
         
-        if cci_values is not None:
-            # X값으로 timestamp 사용
-            x_values = df['time_axis_val'].values
-            
-            # CCI 데이터 저장 (mouse_moved_on_chart에서 사용하기 위함)
-            self.cci_data = list(zip(x_values, cci_values.values))
-            
-            # CCI 곡선
+        print(f"볼린저 밴드 계산됨 (주기: {self.bollinger_window})")
+    
+    def ensure_cci_items(self):
+        """CCI 곡선과 기준선(0, ±100)을 한 번만 생성"""
+        if self.cci_curve is None:
             self.cci_curve = pg.PlotDataItem(
-                x_values, cci_values.values,
                 pen=pg.mkPen(color='y', width=1),
                 name="CCI"
             )
             self.cci_plot_item.addItem(self.cci_curve)
-            
-            # 0선 추가
-            zero_line = pg.InfiniteLine(
-                pos=0, angle=0,
-                pen=pg.mkPen(color='w', width=1, style=Qt.PenStyle.DotLine)
-            )
-            self.cci_plot_item.addItem(zero_line)
-            
-            # +100, -100 선 추가 (CCI의 과매수/과매도 기준선)
-            plus_100_line = pg.InfiniteLine(
-                pos=100, angle=0,
-                pen=pg.mkPen(color='r', width=1, style=Qt.PenStyle.DotLine)
-            )
-            minus_100_line = pg.InfiniteLine(
-                pos=-100, angle=0,
-                pen=pg.mkPen(color='g', width=1, style=Qt.PenStyle.DotLine)
-            )
-            self.cci_plot_item.addItem(plus_100_line)
-            self.cci_plot_item.addItem(minus_100_line)
-            
-            # 현재 CCI 값 표시
-            self.display_current_cci(df, cci_values)
-            
-            # CCI 스케일 자동 조정 - 처음 표시될 때만 또는 새 심볼/타임프레임 로드 시에만 적용
-            self.update_cci_scale()
-            
-            print(f"CCI 지표 계산됨 (주기: {self.cci_window})")
+        
+        if not self.cci_reference_lines:
+            # 0선 및 +100, -100 선 (CCI의 과매수/과매도 기준선)
+            for pos, color in ((0, 'w'), (100, 'r'), (-100, 'g')):
+                line = pg.InfiniteLine(
+                    pos=pos, angle=0,
+                    pen=pg.mkPen(color=color, width=1, style=Qt.PenStyle.DotLine)
+                )
+                self.cci_plot_item.addItem(line)
+                self.cci_reference_lines.append(line)
+    
+    def update_cci_curve(self, x_values, cci_values):
+        """CCI 곡선 데이터 갱신"""
+        self.ensure_cci_items()
+        
+        # CCI 데이터 저장 (mouse_moved_on_chart에서 사용하기 위함)
+        self.cci_data = list(zip(x_values, cci_values))
+        
+        self.cci_curve.setData(x_values, cci_values)
+        
+        # 현재 CCI 값 표시
+        self.display_current_cci(cci_values)
+        
+        # CCI 스케일 자동 조정 - 처음 표시될 때만 또는 새 심볼/타임프레임 로드 시에만 적용
+        self.update_cci_scale()
+        
+        print(f"CCI 지표 계산됨 (주기: {self.cci_window})")
     
-    def display_current_cci(self, df, cci_values):
+    def display_current_cci(self, cci_values):
         """현재 CCI 값을 차트에 표시"""
         # 현재 CCI 값이 있는 경우에만 표시
         if len(cci_values) > 0:
-            latest_cci = cci_values.values[-1]
+            latest_cci = cci_values[-1]
             
-            # 기존 CCI 현재값 라인 제거
-            if self.cci_current_line:
-                self.cci_plot_item.removeItem(self.cci_current_line)
+            if self.cci_current_line is None:
+                # CCI 현재값 라인은 한 번만 생성하고 이후에는 위치만 갱신 (라벨은 값 포맷으로 자동 갱신)
+                self.cci_current_line = pg.InfiniteLine(
+                    angle=0, 
+                    movable=False, 
+                    pen=pg.mkPen(QColor(0, 120, 255, 200), width=1, style=Qt.PenStyle.DashLine),
+                    label='CCI: {value:.2f}',
+                    labelOpts={
+                        'position': 0.97, 
+                        'color': (255, 255, 255),
+                        'fill': (0, 120, 255, 150),
+                        'anchor': (1, 0.5),
+                        'movable': True 
+                    }
+                )
+                self.cci_plot_item.addItem(self.cci_current_line)
+                
+                # 라벨의 Z값 설정 (다른 아이템보다 위에 표시)
+                if hasattr(self.cci_current_line, 'label') and isinstance(self.cci_current_line.label, pg.TextItem):
+                    self.cci_current_line.label.setZValue(20)
             
-            # 새 CCI 현재값 라인 생성
-            self.cci_current_line = pg.InfiniteLine(
-                angle=0, 
-                movable=False, 
-                pen=pg.mkPen(QColor(0, 120, 255, 200), width=1, style=Qt.PenStyle.DashLine),
-                label=f'CCI: {latest_cci:.2f}',
-                labelOpts={
-                    'position': 0.97, 
-                    'color': (255, 255, 255),
-                    'fill': (0, 120, 255, 150),
-                    'anchor': (1, 0.5),
-                    'movable': True 
-                }
-            )
             self.cci_current_line.setPos(latest_cci)
             self.cci_current_line.setVisible(True)
-            self.cci_plot_item.addItem(self.cci_current_line)
-            
-            # 라벨의 Z값 설정 (다른 아이템보다 위에 표시)
-            if hasattr(self.cci_current_line, 'label') and isinstance(self.cci_current_line.label, pg.TextItem):
-                self.cci_current_line.label.setZValue(20)
     
     def update_cci_scale(self):
         """CCI 차트 스케일 업데이트"""
@@ -263,4 +306,4 @@ class IndicatorsMixin:
             self.cci_plot_item.autoRange()
             if not hasattr(self, '_cci_scaled'):
                 self._cci_scaled = {}
-            self._cci_scaled[f"{self.symbol}_{self.timeframe}"] = True 
\ No newline at end of file
+            self._cci_scaled[f"{self.symbol}_{self.timeframe}"] = True
@@ -0,0 +1,69 @@
+"""
+틱 지연 추적 및 실시간 표시 기능을 제공하는 모듈
+"""
+
+import html
+import time
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QLabel
+
+from utils.latency import LatencyTracker
+from config.settings import LATENCY_READOUT_INTERVAL_MS
+
+class LatencyMixin:
+    """
+    틱 지연 추적 기능을 제공하는 Mixin 클래스
+    new_data -> update_chart_from_websocket -> plot_data -> 지표 반영/캔들 페인트 경로의 단계별 시각을 기록
+    """
+    
+    def init_latency_tracking(self):
+        """지연 추적기와 실시간 표시 라벨 초기화 (init_ui 이전에 호출)"""
+        self.latency_tracker = LatencyTracker()
+        self.latency_label = QLabel("지연: -")
+        self.latency_label.setMinimumWidth(260)
+        self._latency_trace = None  # 아직 페인트되지 않은 최신 틱의 trace
+        self._latency_timer = QTimer(self)
+        self._latency_timer.timeout.connect(self.update_latency_readout)
+        self._latency_timer.start(LATENCY_READOUT_INTERVAL_MS)
+    
+    def _record_latency(self, stage, latency_ms):
+        warning = self.latency_tracker.record(self.symbol, stage, latency_ms)
+        if warning:
+            print(warning)
+    
+    def trace_dispatch(self, batch):
+        """GUI 스레드에서 캔들 배치 처리를 시작할 때 호출"""
+        trace = getattr(batch, 'trace', None)
+        if trace is None:
+            return
+        trace['dispatch'] = time.time()
+        trace['indicators_pending'] = True
+        trace['paint_pending'] = True
+        if trace['event'] is not None:
+            self._record_latency('network', (trace['receive'] - trace['event']) * 1000)
+        self._record_latency('dispatch', (trace['dispatch'] - trace['receive']) * 1000)
+        self._latency_trace = trace
+    
+    def trace_indicators(self):
+        """지표 계산 결과가 GUI에 반영되었을 때 호출"""
+        trace = self._latency_trace
+        if trace is None or not trace.get('indicators_pending'):
+            return
+        trace['indicators_pending'] = False
+        self._record_latency('indicators', (time.time() - trace['dispatch']) * 1000)
+    
+    def trace_paint(self):
+        """캔들 아이템이 페인트될 때 호출 (CandlestickItem.paint_callback)"""
+        trace = self._latency_trace
+        if trace is None or not trace.get('paint_pending'):
+            return
+        trace['paint_pending'] = False
+        now = time.time()
+        self._record_latency('paint', (now - trace['dispatch']) * 1000)
+        origin = trace['event'] if trace['event'] is not None else trace['receive']
+        self._record_latency('total', (now - origin) * 1000)
+    
+    def update_latency_readout(self):
+        """실시간 지연 표시 갱신 (라벨에 마우스를 올리면 단계별 히스토그램 표시)"""
+        self.latency_label.setText(self.latency_tracker.summary_text(self.symbol))
+        self.latency_label.setToolTip(f"<pre>{html.escape(self.latency_tracker.histogram_text(self.symbol))}</pre>")
@@ -0,0 +1,182 @@
+"""
+CCI 신호 기반 페이퍼 트레이딩(모의 매매) 기능을 제공하는 모듈
+"""
+
+import time
+from functools import partial
+import pyqtgraph as pg
+from PyQt6.QtCore import pyqtSlot
+
+from core.request_scheduler import PRIORITY_BACKFILL
+from utils.paper_trading import PaperTradingEngine
+from config.settings import (
+    PAPER_SYMBOLS, PAPER_TIMEFRAME, PAPER_EVALUATE, PAPER_INITIAL_EQUITY, PAPER_ORDER_NOTIONAL,
+    PAPER_FEE_RATE, PAPER_SLIPPAGE, PAPER_LATENCY_MS, PAPER_ALLOW_SHORT,
+    PAPER_CCI_OVERBOUGHT, PAPER_CCI_OVERSOLD, PAPER_WARMUP_CANDLES, PAPER_MAX_MARKERS, PAPER_EQUITY_POINTS
+)
+
+class PaperTradingMixin:
+    """
+    페이퍼 트레이딩 기능을 제공하는 Mixin 클래스
+    
+    현재 차트와 PAPER_SYMBOLS의 피드를 허브에서 구독해 캔들 배치마다 PaperTradingEngine에 전달하고,
+    신호/체결은 message_area에, 현재 차트의 체결 마커와 포지션/자산은 메인 차트에 표시함.
+    차트를 바꿔도 이전 차트의 장부는 모의 매매를 끌 때까지 계속 구독해 평가함
+    """
+    
+    def init_paper_trading(self):
+        self.paper_trading = False
+        self.paper_engine = None
+        self.paper_feeds = {}  # (심볼, 타임프레임) -> (MarketFeed, 연결된 슬롯)
+        self.paper_marker_item = None
+        self.paper_label = None
+    
+    def toggle_paper_trading(self):
+        """모의 매매 시작/정지 토글 (정지하면 장부와 구독을 모두 정리)"""
+        if self.paper_trading_button.isChecked():
+            if not self.exchange_ready:
+                self.paper_trading_button.setChecked(False)
+                self.append_alert_message("거래소 연결을 준비 중입니다. 잠시 후 모의 매매를 시작하세요.")
+                return
+            self.start_paper_trading()
+        else:
+            self.stop_paper_trading()
+    
+    def start_paper_trading(self):
+        self.paper_trading = True
+        self.paper_engine = PaperTradingEngine(
+            evaluate=PAPER_EVALUATE, initial_equity=PAPER_INITIAL_EQUITY, order_notional=PAPER_ORDER_NOTIONAL,
+            fee_rate=PAPER_FEE_RATE, slippage=PAPER_SLIPPAGE, latency_ms=PAPER_LATENCY_MS,
+            allow_short=PAPER_ALLOW_SHORT, cci_window=self.cci_window,
+            overbought=PAPER_CCI_OVERBOUGHT, oversold=PAPER_CCI_OVERSOLD,
+            max_markers=PAPER_MAX_MARKERS, max_points=PAPER_EQUITY_POINTS,
+        )
+        if self.paper_marker_item is None:
+            self.paper_marker_item = pg.ScatterPlotItem(size=12, pen=pg.mkPen('w', width=1))
+            self.paper_marker_item.setZValue(10)
+            self.plot_item.addItem(self.paper_marker_item, ignoreBounds=True)
+            self.paper_label = pg.LabelItem(justify='right', color='white')
+            self.paper_label.setParentItem(self.plot_item.getViewBox())
+            self.paper_label.anchor(itemPos=(1, 0), parentPos=(1, 0), offset=(-10, 5))
+        self.paper_label.setVisible(True)
+        
+        keys = [(self.symbol, self.timeframe)] + [(symbol, PAPER_TIMEFRAME) for symbol in PAPER_SYMBOLS]
+        for symbol, timeframe in keys:
+            self.subscribe_paper_feed(symbol, timeframe)
+        self.append_alert_message(
+            f"모의 매매 시작: {len(self.paper_feeds)}개 차트, 신호 평가 '{PAPER_EVALUATE}', "
+            f"수수료 {PAPER_FEE_RATE * 100:g}%, 지연 {PAPER_LATENCY_MS}ms"
+        )
+        self.refresh_paper_overlay()
+    
+    def stop_paper_trading(self):
+        if not self.paper_trading:
+            return
+        self.paper_trading = False
+        for feed, slot in self.paper_feeds.values():
+            feed.signals.new_data.disconnect(slot)
+            self.hub.unsubscribe(feed)
+        self.paper_feeds.clear()
+        
+        for book in self.paper_engine.books.values():
+            self.append_alert_message(self.describe_paper_book(book))
+        self.append_alert_message(f"모의 매매 종료: 전체 자산 {self.paper_engine.total_equity():,.2f}")
+        self.paper_engine = None
+        if self.paper_marker_item is not None:
+            self.paper_marker_item.clear()
+            self.paper_label.setVisible(False)
+    
+    def subscribe_paper_feed(self, symbol, timeframe):
+        """장부용 피드 구독 및 CCI 워밍업 (저장소 캔들이 부족하면 REST로 백필 우선순위 요청)"""
+        key = (symbol, timeframe)
+        if key in self.paper_feeds:
+            return
+        feed = self.hub.subscribe(symbol, timeframe)
+        slot = partial(self.handle_paper_batch, key)
+        feed.signals.new_data.connect(slot)
+        self.paper_feeds[key] = (feed, slot)
+        
+        store = feed.candle_store
+        if len(store) > self.cci_window:
+            self.paper_engine.warm_up(symbol, timeframe, self.paper_rows(store.timestamps, store.values))
+        elif self.rest_exchange:
+            future = self.exchange_manager.submit_ohlcv_rows(
+                symbol, timeframe, PAPER_WARMUP_CANDLES, priority=PRIORITY_BACKFILL
+            )
+            future.add_done_callback(lambda f: self.paper_warmup_ready.emit((key, f)))
+    
+    @staticmethod
+    def paper_rows(timestamps, values):
+        return [[int(ts)] + row.tolist() for ts, row in zip(timestamps[-PAPER_WARMUP_CANDLES:], values[-PAPER_WARMUP_CANDLES:])]
+    
+    @pyqtSlot(object)
+    def apply_paper_warmup(self, result):
+        """REST 워밍업 캔들 반영 (그 사이 모의 매매를 껐거나 요청이 실패했으면 무시)"""
+        key, future = result
+        if not self.paper_trading or key not in self.paper_feeds or future.cancelled():
+            return
+        if future.exception() is not None:
+            self.append_alert_message(f"모의 매매 워밍업 실패 {key[0]} {key[1]}: {future.exception()}")
+            return
+        rows = future.result() or []
+        self.paper_engine.warm_up(key[0], key[1], rows)
+        self.refresh_paper_overlay()
+    
+    def sync_paper_feeds(self):
+        """차트 전환 후 호출: 새 차트도 모의 매매 대상에 추가"""
+        if self.paper_trading:
+            self.subscribe_paper_feed(self.symbol, self.timeframe)
+            self.refresh_paper_overlay()
+    
+    def handle_paper_batch(self, key, batch):
+        """피드 캔들 배치를 엔진에 전달하고 신호/체결 표시"""
+        if not self.paper_trading:
+            return
+        events = self.paper_engine.update(key[0], key[1], batch, time.time() * 1000)
+        for event in events:
+            self.append_alert_message(self.describe_paper_event(event))
+        if key == (self.symbol, self.timeframe):
+            self.refresh_paper_overlay(markers=bool(events))
+    
+    def describe_paper_event(self, event):
+        symbol, timeframe = event['key']
+        side = "매수" if event['side'] == 'buy' else "매도"
+        if event['type'] == 'signal':
+            return f"모의 {side} 신호 {symbol} {timeframe}: CCI {event['cci']:.1f} @ {event['price']:g}"
+        return (
+            f"모의 체결 {symbol} {timeframe} {side} {event['quantity']:.6g} @ {event['price']:g} "
+            f"(수수료 {event['fee']:.2f}, 실현 {event['realized']:+.2f}, 포지션 {event['position']:+.6g}, "
+            f"자산 {event['equity']:,.2f}, 지연 {event['latency']:.0f}ms)"
+        )
+    
+    def describe_paper_book(self, book):
+        symbol, timeframe = book.key
+        return (
+            f"{symbol} {timeframe}: 체결 {book.trades}회, 포지션 {book.position:+.6g}, "
+            f"실현 {book.realized_pnl:+.2f}, 미실현 {book.unrealized_pnl():+.2f}, "
+            f"수수료 {book.fees:.2f}, 자산 {book.equity():,.2f}"
+        )
+    
+    def refresh_paper_overlay(self, markers=True):
+        """현재 차트 장부의 체결 마커와 포지션/자산 라벨 갱신 (마커는 체결이 있을 때만 다시 설정)"""
+        if not self.paper_trading or self.paper_marker_item is None:
+            return
+        book = self.paper_engine.books.get((self.symbol, self.timeframe))
+        if book is None:
+            self.paper_marker_item.clear()
+            self.paper_label.setText("")
+            return
+        if markers:
+            self.paper_marker_item.setData([
+                {
+                    'pos': (ts / 1000, price),
+                    'symbol': 't1' if quantity > 0 else 't',
+                    'brush': pg.mkBrush('#40C040' if quantity > 0 else '#E04040'),
+                }
+                for ts, quantity, price in book.fills
+            ])
+        entry = f" @ {book.entry_price:g}" if book.position else ""
+        self.paper_label.setText(
+            f"모의 포지션 {book.position:+.6g}{entry} | 손익 {book.equity() - book.initial_equity:+.2f} | "
+            f"자산 {book.equity():,.2f} (전체 {self.paper_engine.total_equity():,.2f})"
+        )
@@ -0,0 +1,56 @@
+"""
+유휴 시간 선행 로드(다음에 열 차트 예측) 기능을 제공하는 모듈
+"""
+
+import pyqtgraph as pg
+
+from core.prefetcher import prefetch_candidates
+from core.trade_aggregator import TRADE_TIMEFRAMES
+from config.settings import DEFAULT_LIMIT, PREFETCH_IDLE_MS, PREFETCH_RECENT_SYMBOLS
+
+class PrefetchMixin:
+    """
+    선행 로드 기능을 제공하는 Mixin 클래스
+    
+    차트 로드/이동이 PREFETCH_IDLE_MS 동안 없으면 현재 심볼의 인접 타임프레임과 최근 사용한 심볼을
+    허브의 SpeculativePrefetcher로 미리 받아 둠. 이미 스트림이 있거나 작업 집합에 보관된 차트는 제외하며,
+    사용자가 차트를 전환하면 대기 중인 선행 로드 요청을 취소함
+    """
+    
+    def init_prefetch(self):
+        self.recent_symbols = []  # 최근 사용 순
+        self.prefetch_timer = pg.QtCore.QTimer()
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.timeout.connect(self.run_idle_prefetch)
+    
+    def note_chart_activity(self):
+        """사용자 조작 시 호출 - 유휴 타이머 재시작"""
+        self.prefetch_timer.start(PREFETCH_IDLE_MS)
+    
+    def note_chart_switch(self, symbol, timeframe):
+        """차트 전환 시 호출 - 다른 선행 로드 요청 취소 및 최근 심볼 갱신"""
+        self.hub.prefetcher.cancel(keep=(symbol, timeframe))
+        if self.symbol in self.recent_symbols:
+            self.recent_symbols.remove(self.symbol)
+        self.recent_symbols.insert(0, self.symbol)
+        del self.recent_symbols[PREFETCH_RECENT_SYMBOLS:]
+        self.note_chart_activity()
+    
+    def run_idle_prefetch(self):
+        """유휴 상태에서 후보 차트 선행 로드"""
+        if self.limit != DEFAULT_LIMIT:
+            return  # 창의 초기 로드 요청과 병합되지 않는 크기면 받아 두어도 쓰이지 않음
+        timeframes = [
+            self.timeframe_combo.itemText(i) for i in range(self.timeframe_combo.count())
+            if self.timeframe_combo.itemText(i) not in TRADE_TIMEFRAMES
+        ]
+        warm = set(self.chart_working_set.keys())
+        keys = [
+            key for key in prefetch_candidates(self.symbol, self.timeframe, timeframes, self.recent_symbols)
+            if key not in warm and key not in self.hub.feeds
+        ]
+        if not keys:
+            return
+        submitted = self.hub.prefetcher.prefetch(keys, self.indicator_requests(DEFAULT_LIMIT))
+        if submitted:
+            print(f"유휴 시간 선행 로드: {', '.join(f'{s} {tf}' for s, tf in keys)}")
@@ -0,0 +1,66 @@
+"""
+여러 차트의 다시 그리기를 프레임 시간 예산 안에서 나눠 수행하는 렌더 스케줄러 모듈
+"""
+
+import time
+from collections import OrderedDict
+from PyQt6.QtCore import QObject, QTimer
+
+from config.settings import RENDER_FRAME_MS, RENDER_FRAME_BUDGET_MS, RENDER_IDLE_MS
+
+class RenderScheduler(QObject):
+    """
+    중앙 렌더 스케줄러
+    
+    뷰는 데이터가 바뀌면 mark_dirty()만 호출하고, 실제 그리기(view.render())는 프레임 타이머에서
+    가장 오래 기다린 뷰부터 수행함. 한 프레임의 그리기 시간이 budget_ms를 넘으면 남은 뷰는 다음 프레임으로
+    넘기므로 차트 수와 관계없이 GUI 스레드가 한 프레임에 쓰는 시간이 제한되고, 모든 뷰가 돌아가며 예산을 나눠 씀.
+    화면에 보이지 않는 뷰(view.is_render_visible()이 False)는 건너뛰고 dirty 상태로 남겨 둠
+    """
+    
+    def __init__(self, frame_ms=RENDER_FRAME_MS, budget_ms=RENDER_FRAME_BUDGET_MS, idle_ms=RENDER_IDLE_MS):
+        super().__init__()
+        self.frame_ms = frame_ms
+        self.budget_ms = budget_ms
+        self.idle_ms = idle_ms
+        self._dirty = OrderedDict()  # 뷰 -> None (삽입 순서 = 대기 순서)
+        self.last_frame_ms = 0.0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.run_frame)
+    
+    def mark_dirty(self, view):
+        """뷰 다시 그리기 요청 (이미 대기 중이면 대기 순서 유지)"""
+        if view not in self._dirty:
+            self._dirty[view] = None
+        if not self.timer.isActive():
+            self.timer.start(self.frame_ms)
+    
+    def discard(self, view):
+        """뷰 제거 (닫힌 차트)"""
+        self._dirty.pop(view, None)
+    
+    def run_frame(self):
+        """예산 안에서 대기 중인 뷰를 순서대로 그림"""
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        rendered = 0
+        for view in list(self._dirty):
+            if rendered and time.perf_counter() >= deadline:
+                break
+            if not view.is_render_visible():
+                # 보이지 않는 뷰는 다음 프레임까지 그대로 대기 (순서는 뒤로)
+                self._dirty.move_to_end(view)
+                continue
+            del self._dirty[view]
+            view.render()
+            rendered += 1
+        self.last_frame_ms = (time.perf_counter() - start) * 1000
+        
+        if self._dirty:
+            # 그릴 수 있는 뷰가 없었으면 (모두 숨김/최소화) 느린 간격으로 다시 확인
+            self.timer.start(self.frame_ms if rendered else self.idle_ms)
+    
+    def stop(self):
+        self.timer.stop()
+        self._dirty.clear()
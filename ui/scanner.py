@@ -0,0 +1,203 @@
+"""
+전체 시장 스캐너 결과를 정렬 가능한 표로 보여주는 창을 정의하는 모듈
+"""
+
+import time
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
+    QTableWidget, QTableWidgetItem, QSpinBox, QCheckBox, QHeaderView
+)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, pyqtSlot
+
+from core.scanner import MarketScanner
+from config.settings import SCANNER_TIMEFRAME, SCANNER_CLOSE_DELAY_MS, SCANNER_CONDITIONS
+
+class ScannerWindow(QWidget):
+    """
+    CCI/볼린저 밴드 스캐너 창
+    캔들이 마감될 때마다 결과를 갱신하며, 표의 행은 심볼별로 제자리에서 갱신됨.
+    행을 더블클릭하면 symbol_selected 시그널로 해당 심볼을 메인 차트에 전달함.
+    """
+    
+    COLUMNS = ['Symbol', 'Close', 'Change %', 'CCI', 'BB %B', '조건']
+    symbol_selected = pyqtSignal(str)
+    
+    def __init__(self, exchange_manager, parent=None):
+        super().__init__(parent, Qt.WindowType.Window)
+        self.setWindowTitle("시장 스캐너")
+        self.resize(720, 600)
+        self.exchange_manager = exchange_manager
+        self.scanner = None
+        self.rows = {}  # 심볼 -> 행 번호
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.refresh)
+        
+        self.init_ui()
+    
+    def init_ui(self):
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        
+        self.timeframe_combo = QComboBox()
+        self.timeframe_combo.addItems(['5m', '15m', '30m', '1h', '4h', '1d'])
+        self.timeframe_combo.setCurrentText(SCANNER_TIMEFRAME)
+        
+        self.cci_threshold = QSpinBox()
+        self.cci_threshold.setRange(0, 500)
+        self.cci_threshold.setValue(int(SCANNER_CONDITIONS.get('cci_above') or 100))
+        self.cci_threshold.setPrefix("|CCI| ≥ ")
+        self.cci_threshold.valueChanged.connect(self.update_conditions)
+        
+        self.bands_check = QCheckBox("BB 밖")
+        self.bands_check.setChecked(bool(SCANNER_CONDITIONS.get('outside_bands')))
+        self.bands_check.toggled.connect(self.update_conditions)
+        
+        self.scan_button = QPushButton("스캔")
+        self.scan_button.clicked.connect(self.start_scan)
+        
+        self.status_label = QLabel("대기 중")
+        
+        controls.addWidget(QLabel("Timeframe:"))
+        controls.addWidget(self.timeframe_combo)
+        controls.addWidget(self.cci_threshold)
+        controls.addWidget(self.bands_check)
+        controls.addWidget(self.scan_button)
+        controls.addStretch(1)
+        controls.addWidget(self.status_label)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setSortingEnabled(True)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.cellDoubleClicked.connect(self.handle_row_double_clicked)
+        
+        layout.addLayout(controls)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+    
+    def start_scan(self):
+        """선택한 타임프레임으로 전체 스캔 시작"""
+        self.stop_scanner()
+        self.scanner = MarketScanner(self.exchange_manager, self.timeframe_combo.currentText())
+        self.scanner.signals.progress.connect(self.handle_progress)
+        self.scanner.signals.results_ready.connect(self.handle_results)
+        self.scanner.signals.error.connect(self.handle_error)
+        self.update_conditions()
+        self.table.setRowCount(0)
+        self.rows = {}
+        self.status_label.setText("시장 목록 로드 중...")
+        self.scanner.start_full_scan()
+    
+    def stop_scanner(self):
+        """
+        현재 스캐너 종료 및 시그널 연결 해제
+        연결 해제 전에 이미 큐에 들어간 시그널은 그대로 전달될 수 있으므로 슬롯에서도 보낸 스캐너를 확인함
+        """
+        if not self.scanner:
+            return
+        signals = self.scanner.signals
+        signals.progress.disconnect(self.handle_progress)
+        signals.results_ready.disconnect(self.handle_results)
+        signals.error.disconnect(self.handle_error)
+        self.scanner.shutdown()
+        self.scanner = None
+    
+    def is_current_scanner(self):
+        """시그널을 보낸 쪽이 현재 스캐너인지 여부 (교체된 스캐너의 늦은 결과 무시용)"""
+        return self.scanner is not None and self.sender() is self.scanner.signals
+    
+    def update_conditions(self):
+        """조건 변경 - 이미 받은 캔들로 결과를 바로 다시 정렬함 (새 요청 없음)"""
+        if not self.scanner:
+            return
+        threshold = self.cci_threshold.value()
+        self.scanner.conditions = {
+            'cci_above': threshold,
+            'cci_below': -threshold,
+            'outside_bands': self.bands_check.isChecked(),
+        }
+        self.scanner.rerank()
+    
+    def refresh(self):
+        if self.scanner:
+            self.status_label.setText("마감 캔들 갱신 중...")
+            self.scanner.start_refresh()
+    
+    def schedule_refresh(self):
+        """다음 캔들 마감 시각에 맞춰 갱신 예약"""
+        if not self.scanner:
+            return
+        tf_ms = self.scanner.timeframe_ms
+        now_ms = int(time.time() * 1000)
+        delay = tf_ms - now_ms % tf_ms + SCANNER_CLOSE_DELAY_MS
+        self.refresh_timer.start(delay)
+    
+    @pyqtSlot(int, int)
+    def handle_progress(self, done, total):
+        if self.is_current_scanner():
+            self.status_label.setText(f"스캔 중... {done}/{total}")
+    
+    @pyqtSlot(str)
+    def handle_error(self, message):
+        if self.is_current_scanner():
+            self.status_label.setText(message)
+    
+    def _set_cell(self, row, column, value, text=None):
+        """숫자 값은 DisplayRole에 숫자로 넣어 정렬이 숫자 기준으로 동작하도록 함"""
+        item = self.table.item(row, column)
+        if item is None:
+            item = QTableWidgetItem()
+            self.table.setItem(row, column, item)
+        if text is None:
+            item.setData(Qt.ItemDataRole.DisplayRole, value)
+        else:
+            item.setData(Qt.ItemDataRole.DisplayRole, text)
+            item.setData(Qt.ItemDataRole.UserRole, value)
+    
+    @pyqtSlot(object)
+    def handle_results(self, results):
+        """결과를 표에 반영 (기존 행은 제자리에서 갱신, 결과에서 빠진 심볼의 행은 삭제)"""
+        if not self.is_current_scanner():
+            return
+        # 갱신 중에는 정렬을 끄고 행 번호를 다시 매핑
+        self.table.setSortingEnabled(False)
+        symbols = {result['symbol'] for result in results}
+        for row in range(self.table.rowCount() - 1, -1, -1):
+            item = self.table.item(row, 0)
+            if item is None or item.text() not in symbols:
+                self.table.removeRow(row)
+        self.rows = {}
+        for row in range(self.table.rowCount()):
+            self.rows[self.table.item(row, 0).text()] = row
+        
+        for result in results:
+            row = self.rows.get(result['symbol'])
+            if row is None:
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                self.rows[result['symbol']] = row
+            self._set_cell(row, 0, result['symbol'])
+            self._set_cell(row, 1, round(result['close'], 6))
+            self._set_cell(row, 2, round(result['change'], 2))
+            self._set_cell(row, 3, round(result['cci'], 1))
+            self._set_cell(row, 4, round(result['percent_b'], 2))
+            self._set_cell(row, 5, result['matched'])
+        
+        self.table.setSortingEnabled(True)
+        matched = sum(1 for result in results if result['matched'])
+        self.status_label.setText(f"{len(results)}개 심볼, 조건 충족 {matched}개 ({time.strftime('%H:%M:%S')})")
+        self.schedule_refresh()
+    
+    def handle_row_double_clicked(self, row, column):
+        item = self.table.item(row, 0)
+        if item is not None:
+            self.symbol_selected.emit(item.text())
+    
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        self.stop_scanner()
+        event.accept()
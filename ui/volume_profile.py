@@ -0,0 +1,152 @@
+"""
+볼륨 프로파일 및 풋프린트 오버레이 기능을 제공하는 모듈
+"""
+
+import pyqtgraph as pg
+from PyQt6.QtCore import QThread, pyqtSlot
+
+from core.candle_pyramid import timeframe_to_ms
+from core.trade_worker import TradeWorker
+from core.volume_profile import VolumeProfile
+from plotting.custom_plot_items import VolumeProfileItem
+from config.settings import PROFILE_WIDTH_FRACTION, PROFILE_REFRESH_MS, PROFILE_FOOTPRINT_MAX_CANDLES
+
+class VolumeProfileMixin:
+    """
+    볼륨 프로파일 기능을 제공하는 Mixin 클래스
+    
+    전용 TradeWorker(캔들 집계 없이 체결만 전달)의 체결을 VolumeProfile에 증분 반영하고,
+    체결 스트림 이전 캔들은 캔들 저장소의 OHLCV로 추정함. 오버레이는 보이는 범위가 바뀌거나
+    체결이 들어오면 PROFILE_REFRESH_MS 간격으로 묶어서 다시 그림
+    """
+    
+    def init_volume_profile(self):
+        self.show_volume_profile = False
+        self.volume_profile = None
+        self.volume_profile_item = None
+        self.profile_worker = None
+        self.profile_thread = None
+        self._profile_estimate_key = None
+        self._profile_drawn_key = None
+        
+        self.profile_timer = pg.QtCore.QTimer()
+        self.profile_timer.setSingleShot(True)
+        self.profile_timer.timeout.connect(self.refresh_volume_profile)
+    
+    def toggle_volume_profile(self):
+        """볼륨 프로파일 표시/숨김 토글"""
+        self.show_volume_profile = self.volume_profile_button.isChecked()
+        if self.show_volume_profile:
+            if self.volume_profile_item is None:
+                self.volume_profile_item = VolumeProfileItem()
+                self.volume_profile_item.setZValue(-5)  # 캔들 뒤에 그림
+                self.plot_item.addItem(self.volume_profile_item, ignoreBounds=True)
+            self.reset_volume_profile()
+            self.append_log("볼륨 프로파일을 표시합니다.")
+        else:
+            self.stop_profile_stream()
+            self.volume_profile = None
+            if self.volume_profile_item is not None:
+                self.volume_profile_item.clear()
+            self.append_log("볼륨 프로파일을 숨깁니다.")
+    
+    def reset_volume_profile(self):
+        """
+        현재 심볼/타임프레임으로 프로파일 초기화 (표시 중일 때만)
+        타임프레임만 바뀐 경우 체결 스트림은 유지하고 집계만 새로 시작함
+        """
+        if not self.show_volume_profile:
+            return
+        self.volume_profile = VolumeProfile(timeframe_to_ms(self.timeframe))
+        self._profile_estimate_key = None
+        self._profile_drawn_key = None
+        if self.profile_worker is None or self.profile_worker.symbol != self.symbol:
+            self.start_profile_stream()
+        self.schedule_profile_refresh()
+    
+    def start_profile_stream(self):
+        """현재 심볼의 체결 스트림 시작"""
+        self.stop_profile_stream()
+        ws_exchange = self.exchange_manager.create_ws_exchange()
+        if ws_exchange is None:
+            print("체결 스트림을 시작할 수 없습니다: WebSocket 거래소를 생성하지 못했습니다.")
+            return
+        self.profile_worker = TradeWorker(ws_exchange, self.symbol, None, emit_trades=True)
+        self.profile_thread = QThread()
+        self.profile_worker.moveToThread(self.profile_thread)
+        
+        self.profile_worker.signals.trades.connect(self.handle_profile_trades)
+        self.profile_worker.signals.error.connect(self.handle_worker_error)
+        self.profile_worker.signals.finished.connect(self.profile_thread.quit)
+        self.profile_worker.signals.finished.connect(self.profile_worker.deleteLater)
+        self.profile_thread.finished.connect(self.profile_thread.deleteLater)
+        
+        self.profile_thread.started.connect(self.profile_worker.start_streaming)
+        self.profile_thread.start()
+        print(f"볼륨 프로파일 체결 스트림을 시작했습니다: {self.symbol}")
+    
+    def stop_profile_stream(self):
+        """체결 스트림 정지"""
+        if self.profile_thread and self.profile_thread.isRunning():
+            if self.profile_worker:
+                self.profile_worker.stop()
+            self.profile_thread.quit()
+            if not self.profile_thread.wait(5000):
+                print("체결 스레드가 제한 시간 내에 종료되지 않았습니다. 강제 종료합니다.")
+                self.profile_thread.terminate()
+                self.profile_thread.wait()
+        self.profile_worker = None
+        self.profile_thread = None
+    
+    @pyqtSlot(object)
+    def handle_profile_trades(self, trades):
+        """체결 배열을 프로파일에 반영 (그리기는 타이머로 묶음)"""
+        if self.volume_profile is None:
+            return
+        self.volume_profile.add_trades(*trades)
+        self.schedule_profile_refresh()
+    
+    def schedule_profile_refresh(self):
+        if self.show_volume_profile and not self.profile_timer.isActive():
+            self.profile_timer.start(PROFILE_REFRESH_MS)
+    
+    def update_profile_estimates(self):
+        """체결 스트림 이전 캔들의 추정치 갱신 (캔들 범위가 바뀐 경우에만 다시 계산)"""
+        store = self.candle_store
+        profile = self.volume_profile
+        # 체결 집계가 시작되기 전에는 마지막 캔들도 추정치이므로 캔들 변경마다 갱신
+        key = (store.first_timestamp, profile.exact_from, store.version if profile.exact_from is None else None)
+        if key == self._profile_estimate_key or not len(store):
+            return
+        self._profile_estimate_key = key
+        values = store.values
+        profile.set_candle_estimates(store.timestamps, values[:, 1], values[:, 2], values[:, 4])
+    
+    def refresh_volume_profile(self):
+        """보이는 범위의 프로파일과 (충분히 확대된 경우) 캔들별 풋프린트를 다시 그림"""
+        if not self.show_volume_profile or self.volume_profile is None or self.volume_profile_item is None:
+            return
+        self.update_profile_estimates()
+        profile = self.volume_profile
+        if profile.price_step is None:
+            return
+        
+        view_x = tuple(self.plot_item.getViewBox().viewRange()[0])
+        key = (view_x, profile.version)
+        if key == self._profile_drawn_key:
+            return
+        self._profile_drawn_key = key
+        
+        candle_ms = profile.candle_ms
+        start_ms, end_ms = int(view_x[0] * 1000), int(view_x[1] * 1000)
+        footprints = None
+        if (end_ms - start_ms) / candle_ms <= PROFILE_FOOTPRINT_MAX_CANDLES:
+            footprints = profile.footprints(start_ms - candle_ms, end_ms)
+        self.volume_profile_item.setData(
+            profile.price_step,
+            profile=profile.profile(start_ms - candle_ms, end_ms),
+            view_x=view_x,
+            width_fraction=PROFILE_WIDTH_FRACTION,
+            footprints=footprints,
+            candle_seconds=candle_ms / 1000,
+        )
@@ -0,0 +1,210 @@
+"""
+가격/지표 알림 규칙과 증분 평가 엔진을 제공하는 모듈
+
+가격·CCI처럼 값이 특정 레벨을 돌파하는 규칙은 시리즈별 정렬 리스트에 저장하고,
+틱마다 이전 값과 현재 값 사이에 있는 레벨만 bisect로 찾아 평가함.
+따라서 규칙이 수천 개여도 틱당 비용은 O(log N + 발동 개수)임.
+"""
+
+import re
+import time
+from bisect import bisect_left, bisect_right, insort
+
+ALERT_SERIES = ('price', 'cci')
+ALERT_CONDITIONS = ('above', 'below', 'outside')
+
+_RULE_PATTERN = re.compile(
+    r'^\s*(?:(?P<series>price|cci)\s*(?P<op>>=?|<=?)\s*(?P<level>[-+]?\d+(?:\.\d+)?)'
+    r'|(?P<bands>bb|bollinger)\s+outside)\s*(?P<repeat>repeat)?\s*$',
+    re.IGNORECASE
+)
+
+class AlertRule:
+    """
+    알림 규칙 하나
+    
+    series: 'price', 'cci' 또는 'bollinger'
+    condition: 'above'(상향 돌파), 'below'(하향 돌파), 'outside'(종가가 볼린저 밴드 밖으로 이탈)
+    once: True면 한 번 발동한 뒤 자동으로 제거됨
+    """
+    
+    def __init__(self, rule_id, symbol, series, condition, level=None, once=True):
+        self.id = rule_id
+        self.symbol = symbol
+        self.series = series
+        self.condition = condition
+        self.level = level
+        self.once = once
+    
+    def describe(self):
+        if self.condition == 'outside':
+            text = "종가 볼린저 밴드 이탈"
+        else:
+            direction = "상향 돌파" if self.condition == 'above' else "하향 돌파"
+            text = f"{self.series.upper()} {self.level:g} {direction}"
+        return f"#{self.id} {self.symbol} {text}" + ("" if self.once else " (반복)")
+
+def parse_alert_rule(text):
+    """
+    'price > 65000', 'cci < -100', 'bb outside', 'cci > 100 repeat' 형식의 규칙 문자열 해석
+    
+    Returns:
+    dict: add_rule()에 전달할 series, condition, level, once
+    """
+    match = _RULE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Cannot parse alert rule: '{text}'")
+    once = match.group('repeat') is None
+    if match.group('bands'):
+        return {'series': 'bollinger', 'condition': 'outside', 'level': None, 'once': once}
+    condition = 'above' if match.group('op').startswith('>') else 'below'
+    return {
+        'series': match.group('series').lower(),
+        'condition': condition,
+        'level': float(match.group('level')),
+        'once': once,
+    }
+
+class ThresholdIndex:
+    """
+    레벨 돌파 규칙을 방향별 정렬 리스트로 보관하는 인덱스
+    상향 규칙은 prev < level <= value, 하향 규칙은 value <= level < prev 구간만 검사함
+    """
+    
+    def __init__(self):
+        # 방향 -> (정렬된 (레벨, 규칙 ID) 리스트)
+        self.keys = {'above': [], 'below': []}
+    
+    def __len__(self):
+        return len(self.keys['above']) + len(self.keys['below'])
+    
+    def add(self, rule):
+        insort(self.keys[rule.condition], (rule.level, rule.id))
+    
+    def remove(self, rule):
+        keys = self.keys[rule.condition]
+        i = bisect_left(keys, (rule.level, rule.id))
+        if i < len(keys) and keys[i] == (rule.level, rule.id):
+            del keys[i]
+    
+    def crossed(self, prev, value):
+        """prev에서 value로 이동할 때 돌파된 (레벨, 규칙 ID) 목록"""
+        if value > prev:
+            keys = self.keys['above']
+            lo = bisect_right(keys, (prev, float('inf')))
+            hi = bisect_right(keys, (value, float('inf')))
+        elif value < prev:
+            keys = self.keys['below']
+            lo = bisect_left(keys, (value, -1))
+            hi = bisect_left(keys, (prev, -1))
+        else:
+            return []
+        return keys[lo:hi]
+
+class AlertEngine:
+    """
+    심볼별 알림 규칙 저장 및 증분 평가
+    
+    update_value()는 시리즈의 최신 값이 들어올 때마다 호출되며, 심볼/시리즈별 직전 값과
+    비교해 돌파된 규칙만 반환함. 첫 값은 기준값으로만 사용되고 알림을 발생시키지 않음.
+    """
+    
+    def __init__(self):
+        self.rules = {}  # 규칙 ID -> AlertRule
+        self.indexes = {}  # (심볼, 시리즈) -> ThresholdIndex
+        self.band_rules = {}  # 심볼 -> {규칙 ID: AlertRule}
+        self.last_values = {}  # (심볼, 시리즈) -> 직전 값
+        self.outside_state = {}  # 심볼 -> 직전 틱에서 종가가 밴드 밖이었는지 여부
+        self._next_id = 1
+    
+    def add_rule(self, symbol, series, condition, level=None, once=True):
+        if series not in ALERT_SERIES + ('bollinger',) or condition not in ALERT_CONDITIONS:
+            raise ValueError(f"Unsupported alert rule: {series} {condition}")
+        if (condition == 'outside') != (series == 'bollinger'):
+            raise ValueError(f"Condition '{condition}' cannot be used with series '{series}'")
+        
+        rule = AlertRule(self._next_id, symbol, series, condition, level, once)
+        self._next_id += 1
+        self.rules[rule.id] = rule
+        if series == 'bollinger':
+            self.band_rules.setdefault(symbol, {})[rule.id] = rule
+        else:
+            self.indexes.setdefault((symbol, series), ThresholdIndex()).add(rule)
+        return rule
+    
+    def add_rule_text(self, symbol, text):
+        return self.add_rule(symbol, **parse_alert_rule(text))
+    
+    def remove_rule(self, rule_id):
+        rule = self.rules.pop(rule_id, None)
+        if rule is None:
+            return None
+        if rule.series == 'bollinger':
+            self.band_rules.get(rule.symbol, {}).pop(rule.id, None)
+        else:
+            self.indexes[(rule.symbol, rule.series)].remove(rule)
+        return rule
+    
+    def rules_for(self, symbol):
+        return [rule for rule in self.rules.values() if rule.symbol == symbol]
+    
+    def symbols(self):
+        """규칙이 하나 이상 있는 심볼 집합"""
+        return {rule.symbol for rule in self.rules.values()}
+    
+    def needs_series(self, symbol, series):
+        """해당 심볼에 이 시리즈를 평가해야 하는 규칙이 있는지 여부"""
+        if series == 'bollinger':
+            return bool(self.band_rules.get(symbol))
+        return len(self.indexes.get((symbol, series), ())) > 0
+    
+    def reset(self, symbol=None):
+        """직전 값 초기화 (차트를 새로 로드할 때 오래된 값으로 인한 오발동 방지)"""
+        if symbol is None:
+            self.last_values.clear()
+            self.outside_state.clear()
+            return
+        for series in ALERT_SERIES:
+            self.last_values.pop((symbol, series), None)
+        self.outside_state.pop(symbol, None)
+    
+    def _fire(self, rule, value, fired):
+        fired.append({'rule': rule, 'value': value, 'time': time.time()})
+        if rule.once:
+            self.remove_rule(rule.id)
+    
+    def update_value(self, symbol, series, value):
+        """
+        시리즈의 최신 값 반영
+        
+        Returns:
+        list: 발동한 알림 목록 ({'rule', 'value', 'time'})
+        """
+        if value is None or value != value:  # NaN
+            return []
+        key = (symbol, series)
+        prev = self.last_values.get(key)
+        self.last_values[key] = value
+        index = self.indexes.get(key)
+        if prev is None or not index:
+            return []
+        
+        fired = []
+        for _, rule_id in index.crossed(prev, value):
+            self._fire(self.rules[rule_id], value, fired)
+        return fired
+    
+    def update_bands(self, symbol, close, upper, lower):
+        """종가와 최신 볼린저 밴드로 밴드 이탈 규칙 평가 (밴드 안 -> 밖 전환 시 발동)"""
+        if upper != upper or lower != lower:  # NaN
+            return []
+        outside = close > upper or close < lower
+        was_outside = self.outside_state.get(symbol)
+        self.outside_state[symbol] = outside
+        if not outside or was_outside is None or was_outside:
+            return []
+        
+        fired = []
+        for rule in list(self.band_rules.get(symbol, {}).values()):
+            self._fire(rule, close, fired)
+        return fired
@@ -4,6 +4,109 @@
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+class ComputationContext:
+    """
+    하나의 데이터 버전(캔들 스냅샷)에 대한 중간값 계산 캐시
+    
+    typical price, 이동 평균, 이동 표준편차 등의 중간값을 한 번만 계산하고
+    같은 컨텍스트를 사용하는 모든 지표가 재사용함. 입력 배열은 변경하지 않음.
+    """
+    
+    def __init__(self, columns):
+        """
+        Parameters:
+        columns (dict): 컬럼명 -> 같은 길이의 NumPy 배열
+        """
+        self.columns = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+        self.length = len(next(iter(self.columns.values()))) if self.columns else 0
+        self._cache = {}
+    
+    @classmethod
+    def from_frame(cls, df, columns):
+        """DataFrame의 지정 컬럼으로 컨텍스트 생성"""
+        return cls({col: df[col].to_numpy(dtype=float) for col in columns})
+    
+    def _memo(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+    
+    def _empty(self):
+        return np.full(self.length, np.nan)
+    
+    def source(self, name):
+        """원본 컬럼, 내장 파생 시리즈('typical_price', 'true_range') 또는 derive()로 등록한 배열"""
+        if name == 'typical_price':
+            return self.typical_price()
+        if name == 'true_range':
+            return self.true_range()
+        derived = self._cache.get(('derived', name))
+        if derived is not None:
+            return derived
+        return self.columns[name]
+    
+    def derive(self, name, compute):
+        """파생 시리즈를 이름으로 등록 (이후 rolling_mean 등의 source 이름으로 사용 가능)"""
+        return self._memo(('derived', name), compute)
+    
+    def series(self, name):
+        return self._memo(('series', name), lambda: pd.Series(self.source(name)))
+    
+    def typical_price(self):
+        """Typical Price (TP = (high + low + close) / 3)"""
+        return self._memo(('typical_price',), lambda: (self.columns['high'] + self.columns['low'] + self.columns['close']) / 3)
+    
+    def rolling_mean(self, name, window):
+        return self._memo(('rolling_mean', name, window),
+                          lambda: self.series(name).rolling(window=window).mean().to_numpy())
+    
+    def rolling_std(self, name, window):
+        return self._memo(('rolling_std', name, window),
+                          lambda: self.series(name).rolling(window=window).std().to_numpy())
+    
+    def mean_deviation(self, name, window):
+        """
+        이동 평균으로부터의 절대 편차 평균 (트레이딩뷰 ta.dev()와 동일)
+        rolling().apply() 대신 슬라이딩 윈도우로 벡터화하여 계산
+        """
+        def compute():
+            values = self.source(name)
+            out = self._empty()
+            if window <= 0 or self.length < window:
+                return out
+            windows = sliding_window_view(values, window)
+            means = self.rolling_mean(name, window)[window - 1:]
+            out[window - 1:] = np.abs(windows - means[:, None]).mean(axis=1)
+            return out
+        return self._memo(('mean_deviation', name, window), compute)
+    
+    def ema(self, name, span):
+        return self._memo(('ema', name, span),
+                          lambda: self.series(name).ewm(span=span, adjust=False).mean().to_numpy())
+    
+    def rma(self, name, window):
+        """Wilder 이동 평균 (RSI, ATR에서 사용)"""
+        return self._memo(('rma', name, window),
+                          lambda: self.series(name).ewm(alpha=1.0 / window, adjust=False).mean().to_numpy())
+    
+    def change(self, name):
+        """직전 값과의 차이 (첫 값은 NaN)"""
+        def compute():
+            values = self.source(name)
+            out = self._empty()
+            out[1:] = np.diff(values)
+            return out
+        return self._memo(('change', name), compute)
+    
+    def true_range(self):
+        def compute():
+            high, low, close = self.columns['high'], self.columns['low'], self.columns['close']
+            prev_close = np.concatenate(([np.nan], close[:-1]))
+            ranges = np.vstack((high - low, np.abs(high - prev_close), np.abs(low - prev_close)))
+            return np.nanmax(ranges, axis=0) if self.length else self._empty()
+        return self._memo(('true_range',), compute)
 
 def calculate_bollinger_bands(df, window=20, num_std=2):
     """
@@ -19,20 +122,23 @@ def calculate_bollinger_bands(df, window=20, num_std=2):
     """
     if df.empty or 'close' not in df.columns:
         return None, None, None
-        
+    
+    ctx = ComputationContext.from_frame(df, ('close',))
+    middle, upper, lower = bollinger_bands(ctx, window, num_std)
+    return (pd.Series(middle, index=df.index),
+            pd.Series(upper, index=df.index),
+            pd.Series(lower, index=df.index))
+
+def bollinger_bands(ctx, window=20, num_std=2):
+    """컨텍스트의 공유 중간값으로 볼린저 밴드 배열 계산"""
     # 종가 데이터로 이동 평균 계산
-    middle_band = df['close'].rolling(window=window).mean()
+    middle_band = ctx.rolling_mean('close', window)
     
     # 종가의 표준편차 계산
-    std_dev = df['close'].rolling(window=window).std()
-    
-    # 상단 밴드 = 중간 밴드 + (표준편차 * num_std)
-    upper_band = middle_band + (std_dev * num_std)
+    std_dev = ctx.rolling_std('close', window)
     
-    # 하단 밴드 = 중간 밴드 - (표준편차 * num_std)
-    lower_band = middle_band - (std_dev * num_std)
-    
-    return middle_band, upper_band, lower_band
+    # 상단 밴드 = 중간 밴드 + (표준편차 * num_std), 하단 밴드 = 중간 밴드 - (표준편차 * num_std)
+    return middle_band, middle_band + std_dev * num_std, middle_band - std_dev * num_std
 
 def calculate_cci(df, window=20):
     """
@@ -48,21 +154,74 @@ def calculate_cci(df, window=20):
     if df.empty or 'high' not in df.columns or 'low' not in df.columns or 'close' not in df.columns:
         return None
     
-    # Typical Price 계산 (TP = (high + low + close) / 3)
-    df['tp'] = (df['high'] + df['low'] + df['close']) / 3
-    
-    # TP의 이동 평균
-    ma_tp = df['tp'].rolling(window=window).mean()
+    # 입력 DataFrame은 변경하지 않음 (typical price는 컨텍스트에서 계산)
+    ctx = ComputationContext.from_frame(df, ('high', 'low', 'close'))
+    return pd.Series(cci(ctx, window), index=df.index)
+
+def cci(ctx, window=20):
+    """컨텍스트의 공유 중간값으로 CCI 배열 계산"""
+    tp = ctx.typical_price()
     
     # TP와 MA 간의 편차 계산
-    deviation = df['tp'] - ma_tp
+    deviation = tp - ctx.rolling_mean('typical_price', window)
     
     # 평균 편차 계산 - 트레이딩뷰의 ta.dev() 함수와 동일하게 구현
-    # 트레이딩뷰 ta.dev() 함수는 평균으로부터의 절대 편차의 평균을 계산
-    mean_deviation = df['tp'].rolling(window=window).apply(lambda x: np.mean(np.abs(x - np.mean(x))))
+    mean_deviation = ctx.mean_deviation('typical_price', window)
     
     # CCI 계산: CCI = (TP - SMA(TP)) / (0.015 * 평균편차)
     # 0으로 나누는 오류를 방지하기 위한 처리 추가
-    cci = np.where(mean_deviation != 0, deviation / (0.015 * mean_deviation), 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(mean_deviation != 0, deviation / (0.015 * mean_deviation), 0)
+
+def _rolling_windows(matrix, window):
+    """(심볼 수, 시간) 행렬의 시간 축 슬라이딩 윈도우 뷰 - (심볼 수, 시간 - window + 1, window)"""
+    return sliding_window_view(matrix, window, axis=1)
+
+def _pad_leading(values, window, length):
+    """윈도우 결과 앞쪽에 워밍업 구간(NaN)을 붙여 원래 길이로 맞춤"""
+    out = np.full((values.shape[0], length), np.nan)
+    out[:, window - 1:] = values
+    return out
+
+def bollinger_bands_matrix(close, window=20, num_std=2):
+    """
+    여러 심볼의 볼린저 밴드를 한 번에 계산 (심볼 x 시간 행렬)
+    
+    Parameters:
+    close (numpy.ndarray): (심볼 수, 시간) 종가 행렬 (데이터가 없는 칸은 NaN)
+    window (int): 이동 평균 기간
+    num_std (float): 표준편차 승수
     
-    return pd.Series(cci, index=df.index) 
\ No newline at end of file
+    Returns:
+    tuple: (중간 밴드, 상단 밴드, 하단 밴드) - 각각 입력과 같은 모양의 행렬
+    """
+    close = np.asarray(close, dtype=float)
+    if close.ndim != 2 or close.shape[1] < window:
+        empty = np.full(close.shape, np.nan)
+        return empty, empty.copy(), empty.copy()
+    windows = _rolling_windows(close, window)
+    middle = _pad_leading(windows.mean(axis=-1), window, close.shape[1])
+    std_dev = _pad_leading(windows.std(axis=-1, ddof=1), window, close.shape[1])
+    return middle, middle + std_dev * num_std, middle - std_dev * num_std
+
+def cci_matrix(high, low, close, window=20):
+    """
+    여러 심볼의 CCI를 한 번에 계산 (심볼 x 시간 행렬, calculate_cci와 같은 정의)
+    
+    Parameters:
+    high, low, close (numpy.ndarray): (심볼 수, 시간) 행렬 (데이터가 없는 칸은 NaN)
+    window (int): CCI 계산 기간
+    
+    Returns:
+    numpy.ndarray: 입력과 같은 모양의 CCI 행렬
+    """
+    tp = (np.asarray(high, dtype=float) + np.asarray(low, dtype=float) + np.asarray(close, dtype=float)) / 3
+    if tp.ndim != 2 or tp.shape[1] < window:
+        return np.full(tp.shape, np.nan)
+    windows = _rolling_windows(tp, window)
+    means = windows.mean(axis=-1)
+    mean_deviation = np.abs(windows - means[..., None]).mean(axis=-1)
+    deviation = tp[:, window - 1:] - means
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = np.where(mean_deviation != 0, deviation / (0.015 * mean_deviation), 0)
+    return _pad_leading(values, window, tp.shape[1])
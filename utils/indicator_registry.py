@@ -0,0 +1,136 @@
+"""
+지표 레지스트리를 제공하는 모듈
+
+각 지표는 입력 컬럼, 기본 파라미터, 출력 이름을 선언하고 ComputationContext를 받아
+계산함. 같은 컨텍스트로 여러 지표를 계산하면 typical price, 이동 평균/표준편차 등
+공유 중간값은 데이터 버전마다 한 번만 계산됨.
+"""
+
+import numpy as np
+
+from utils.calculations import bollinger_bands, cci
+
+INDICATOR_REGISTRY = {}
+
+class IndicatorSpec:
+    """
+    레지스트리에 등록되는 지표 정의
+    
+    lookback(params)은 출력 한 개를 계산하는 데 필요한 과거 캔들 수를 반환하며,
+    None이면 지표가 전체 이력에 의존함(EMA 등 재귀형)을 의미함
+    """
+    
+    def __init__(self, name, compute, inputs, params, outputs, pane='main', lookback=None):
+        self.name = name
+        self.compute = compute
+        self.inputs = tuple(inputs)
+        self.params = dict(params)
+        self.outputs = tuple(outputs)
+        self.pane = pane
+        self._lookback = lookback
+    
+    def resolve_params(self, params=None):
+        """기본 파라미터에 사용자 파라미터를 덮어쓴 딕셔너리"""
+        resolved = dict(self.params)
+        if params:
+            unknown = set(params) - set(self.params)
+            if unknown:
+                raise ValueError(f"Unknown parameters for indicator '{self.name}': {sorted(unknown)}")
+            resolved.update(params)
+        return resolved
+    
+    def lookback(self, params):
+        return self._lookback(params) if self._lookback else None
+    
+    def __call__(self, ctx, params=None):
+        return self.compute(ctx, **self.resolve_params(params))
+
+def register_indicator(name, inputs, params, outputs, pane='main', lookback=None):
+    """지표 계산 함수를 레지스트리에 등록하는 데코레이터"""
+    def decorator(compute):
+        INDICATOR_REGISTRY[name] = IndicatorSpec(name, compute, inputs, params, outputs, pane, lookback)
+        return compute
+    return decorator
+
+def get_indicator(name):
+    if name not in INDICATOR_REGISTRY:
+        raise KeyError(f"Indicator '{name}' is not registered.")
+    return INDICATOR_REGISTRY[name]
+
+def required_columns(requests):
+    """요청된 지표들이 필요로 하는 입력 컬럼 집합"""
+    columns = set()
+    for name, _ in requests.values():
+        columns.update(get_indicator(name).inputs)
+    return columns
+
+def compute_indicators(ctx, requests):
+    """
+    하나의 컨텍스트로 여러 지표 계산
+    
+    Parameters:
+    ctx (ComputationContext): 공유 중간값 컨텍스트
+    requests (dict): 결과 키 -> (지표 이름, 파라미터 딕셔너리)
+    
+    Returns:
+    dict: 결과 키 -> {출력 이름: 배열}
+    """
+    return {key: get_indicator(name)(ctx, params) for key, (name, params) in requests.items()}
+
+# === 기본 지표 ===
+
+@register_indicator('bollinger', inputs=('close',), params={'window': 20, 'num_std': 2.0},
+                    outputs=('middle', 'upper', 'lower'), lookback=lambda p: p['window'])
+def _bollinger(ctx, window, num_std):
+    middle, upper, lower = bollinger_bands(ctx, window, num_std)
+    return {'middle': middle, 'upper': upper, 'lower': lower}
+
+@register_indicator('cci', inputs=('high', 'low', 'close'), params={'window': 20},
+                    outputs=('cci',), pane='sub', lookback=lambda p: p['window'])
+def _cci(ctx, window):
+    return {'cci': cci(ctx, window)}
+
+@register_indicator('sma', inputs=('close',), params={'window': 20},
+                    outputs=('sma',), lookback=lambda p: p['window'])
+def _sma(ctx, window):
+    return {'sma': ctx.rolling_mean('close', window)}
+
+@register_indicator('ema', inputs=('close',), params={'span': 20}, outputs=('ema',))
+def _ema(ctx, span):
+    return {'ema': ctx.ema('close', span)}
+
+@register_indicator('rsi', inputs=('close',), params={'window': 14}, outputs=('rsi',), pane='sub')
+def _rsi(ctx, window):
+    delta = ctx.change('close')
+    # 상승/하락폭을 파생 시리즈로 등록하여 Wilder 평균도 컨텍스트에 캐시
+    ctx.derive('gain', lambda: np.where(delta > 0, delta, 0.0))
+    ctx.derive('loss', lambda: np.where(delta < 0, -delta, 0.0))
+    avg_gain = ctx.rma('gain', window)
+    avg_loss = ctx.rma('loss', window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    rsi[:window] = np.nan
+    return {'rsi': rsi}
+
+@register_indicator('atr', inputs=('high', 'low', 'close'), params={'window': 14}, outputs=('atr',), pane='sub')
+def _atr(ctx, window):
+    atr = ctx.rma('true_range', window).copy()
+    atr[:window - 1] = np.nan
+    return {'atr': atr}
+
+@register_indicator('vwap', inputs=('time_axis_val', 'high', 'low', 'close', 'volume'),
+                    params={'session_seconds': 86400}, outputs=('vwap',))
+def _vwap(ctx, session_seconds):
+    # 세션(기본 UTC 1일) 단위로 누적되는 VWAP
+    tp = ctx.typical_price()
+    volume = ctx.columns['volume']
+    session = np.floor(ctx.columns['time_axis_val'] / session_seconds)
+    cum_pv = np.cumsum(tp * volume)
+    cum_v = np.cumsum(volume)
+    # 각 세션 시작 직전의 누적값을 빼서 세션별 누적합으로 변환
+    starts = np.flatnonzero(np.concatenate(([True], session[1:] != session[:-1])))
+    offsets = np.repeat(starts, np.diff(np.concatenate((starts, [ctx.length]))))
+    base_pv = np.where(offsets > 0, cum_pv[offsets - 1], 0.0)
+    base_v = np.where(offsets > 0, cum_v[offsets - 1], 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {'vwap': (cum_pv - base_pv) / (cum_v - base_v)}
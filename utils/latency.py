@@ -0,0 +1,97 @@
+"""
+틱 지연(거래소 이벤트 시각 -> 화면 표시) 추적을 위한 유틸리티 모듈
+"""
+
+from collections import defaultdict, deque
+import time
+import numpy as np
+
+from config.settings import LATENCY_WINDOW, LATENCY_BUDGET_MS, LATENCY_WARN_INTERVAL
+
+# 단계별 지연 (밀리초)
+#   network: 거래소 이벤트 시각 -> 소켓 수신
+#   dispatch: 소켓 수신 -> GUI 스레드 처리 시작
+#   indicators: GUI 처리 시작 -> 지표 계산 결과 반영
+#   paint: GUI 처리 시작 -> 캔들 페인트
+#   total: 이벤트 시각(없으면 수신 시각) -> 캔들 페인트
+LATENCY_STAGES = ('network', 'dispatch', 'indicators', 'paint', 'total')
+
+# 히스토그램 구간 경계 (밀리초)
+LATENCY_BINS_MS = np.array([0, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, np.inf])
+
+class CandleBatch(list):
+    """
+    워커가 GUI로 보내는 캔들 행 리스트
+    일반 리스트처럼 사용되며 trace에 단계별 시각(초, epoch)을 담음
+    """
+    
+    def __init__(self, rows, event_time=None, receive_time=None):
+        super().__init__(rows)
+        self.trace = {
+            'event': event_time,
+            'receive': receive_time if receive_time is not None else time.time(),
+        }
+
+class LatencyTracker:
+    """
+    심볼/단계별 최근 지연 샘플을 보관하고 백분위수와 히스토그램을 계산하는 클래스
+    종단 간 지연이 예산을 넘으면 경고 문자열을 반환함 (경고 간격 제한)
+    """
+    
+    def __init__(self, window=LATENCY_WINDOW, budget_ms=LATENCY_BUDGET_MS, warn_interval=LATENCY_WARN_INTERVAL):
+        self.budget_ms = budget_ms
+        self.warn_interval = warn_interval
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._last_warning = 0.0
+    
+    def record(self, symbol, stage, latency_ms):
+        """
+        지연 샘플 기록
+        
+        Returns:
+        str | None: 종단 간 지연 예산 초과 시 경고 메시지
+        """
+        self._samples[(symbol, stage)].append(latency_ms)
+        if stage == 'total' and latency_ms > self.budget_ms:
+            now = time.monotonic()
+            if now - self._last_warning >= self.warn_interval:
+                self._last_warning = now
+                return f"지연 경고: {symbol} 종단 간 지연 {latency_ms:.0f}ms (예산 {self.budget_ms:.0f}ms)"
+        return None
+    
+    def samples(self, symbol, stage):
+        return np.fromiter(self._samples.get((symbol, stage), ()), dtype=float)
+    
+    def percentiles(self, symbol, stage, q=(50, 95, 99)):
+        values = self.samples(symbol, stage)
+        if len(values) == 0:
+            return None
+        return dict(zip(q, np.percentile(values, q)))
+    
+    def histogram(self, symbol, stage, bins=LATENCY_BINS_MS):
+        """구간별 샘플 수 (bins는 구간 경계)"""
+        counts, _ = np.histogram(self.samples(symbol, stage), bins=bins)
+        return counts
+    
+    def summary_text(self, symbol):
+        """실시간 표시용 요약 문자열"""
+        total = self.percentiles(symbol, 'total', (50, 95))
+        if total is None:
+            return "지연: -"
+        parts = [f"지연 p50 {total[50]:.0f}ms / p95 {total[95]:.0f}ms"]
+        for stage in ('network', 'dispatch', 'indicators', 'paint'):
+            stage_p = self.percentiles(symbol, stage, (50,))
+            if stage_p is not None:
+                parts.append(f"{stage} {stage_p[50]:.0f}")
+        return "  ".join(parts)
+    
+    def histogram_text(self, symbol, bins=LATENCY_BINS_MS):
+        """단계별 히스토그램 표 (고정폭 글꼴용, 열은 구간 상한, 값은 샘플 수)"""
+        labels = [f"<{edge:g}" if np.isfinite(edge) else f"≥{bins[-2]:g}" for edge in bins[1:]]
+        width = max(len(label) for label in labels) + 1
+        lines = ["ms".ljust(11) + "".join(label.rjust(width) for label in labels)]
+        for stage in LATENCY_STAGES:
+            counts = self.histogram(symbol, stage, bins)
+            if counts.sum():
+                lines.append(stage.ljust(11) + "".join(str(count).rjust(width) for count in counts))
+        return "\n".join(lines) if len(lines) > 1 else "지연 샘플 없음"
@@ -0,0 +1,297 @@
+"""
+CCI 신호 기반 모의 매매(페이퍼 트레이딩) 엔진을 제공하는 모듈
+
+캔들 배치가 들어올 때마다 (심볼, 타임프레임)별 장부(PaperBook)만 증분 갱신함.
+CCI는 마감된 캔들의 typical price 윈도우만 유지해 평가 한 번에 O(window)로 계산하므로
+많은 심볼을 동시에 돌려도 배치당 비용이 작음. Qt에 의존하지 않으며 현재 시각을 인자로 받으므로
+저장된 캔들을 replay_rows()로 재생해 실시간과 같은 경로로 검증할 수 있음.
+"""
+
+from collections import deque
+
+from utils.signals import cci_signal
+
+EVALUATE_MODES = ('close', 'intra')
+
+class IncrementalCCI:
+    """
+    마감된 캔들 window - 1개의 typical price로 진행 중 캔들의 CCI 계산
+    (utils.calculations.cci와 같은 정의: (TP - SMA(TP)) / (0.015 * 평균 편차))
+    """
+    
+    def __init__(self, window=20):
+        self.window = window
+        self.closed = deque(maxlen=window - 1)
+    
+    def is_ready(self):
+        return len(self.closed) == self.window - 1
+    
+    def push(self, high, low, close):
+        """마감된 캔들 반영"""
+        self.closed.append((high + low + close) / 3)
+    
+    def value(self, high, low, close):
+        """마감된 캔들 윈도우 + 이 캔들의 CCI (워밍업 중이면 None)"""
+        if not self.is_ready():
+            return None
+        tp = (high + low + close) / 3
+        values = list(self.closed)
+        values.append(tp)
+        mean = sum(values) / self.window
+        mean_deviation = sum(abs(v - mean) for v in values) / self.window
+        return (tp - mean) / (0.015 * mean_deviation) if mean_deviation != 0 else 0.0
+
+class PaperOrder:
+    """신호로 생성되어 지연 시간 이후 다음 가격에 시장가로 체결되는 모의 주문"""
+    
+    def __init__(self, order_id, quantity, reason, submitted_ms, due_ms):
+        self.id = order_id
+        self.quantity = quantity  # 양수: 매수, 음수: 매도
+        self.reason = reason
+        self.submitted_ms = submitted_ms
+        self.due_ms = due_ms
+
+class PaperBook:
+    """
+    (심볼, 타임프레임) 하나의 신호 상태, 대기 주문, 포지션, 손익
+    
+    자산(equity) = 시작 자산 + 실현 손익 - 수수료 + 미실현 손익
+    """
+    
+    def __init__(self, key, initial_equity, cci_window, max_markers, max_points):
+        self.key = key
+        self.initial_equity = initial_equity
+        self.cci = IncrementalCCI(cci_window)
+        self.candle = None  # 진행 중 캔들 [ts, open, high, low, close]
+        self.last_cci = None  # 마지막 마감 캔들의 CCI
+        self.last_signal = None  # (캔들 ts, 신호) - 진행 중 평가에서 같은 캔들의 중복 신호 방지
+        self.orders = []
+        self.position = 0.0
+        self.entry_price = 0.0
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+        self.trades = 0
+        self.fills = deque(maxlen=max_markers)  # (캔들 ts, 체결 수량, 체결가) - 차트 마커용
+        self.equity_curve = deque(maxlen=max_points)  # (캔들 ts, 마감 시 자산)
+    
+    @property
+    def pending_quantity(self):
+        return sum(order.quantity for order in self.orders)
+    
+    @property
+    def mark_price(self):
+        return self.candle[4] if self.candle is not None else self.entry_price
+    
+    def unrealized_pnl(self, price=None):
+        price = self.mark_price if price is None else price
+        return self.position * (price - self.entry_price)
+    
+    def equity(self, price=None):
+        return self.initial_equity + self.realized_pnl - self.fees + self.unrealized_pnl(price)
+    
+    def apply_fill(self, quantity, price, fee):
+        """
+        체결 반영 (평균 진입가, 실현 손익 갱신)
+        
+        Returns:
+        float: 이 체결로 실현된 손익 (수수료 제외)
+        """
+        realized = 0.0
+        if self.position and (self.position > 0) != (quantity > 0):
+            closed = min(abs(quantity), abs(self.position))
+            realized = closed * (price - self.entry_price) * (1 if self.position > 0 else -1)
+            new_position = self.position + quantity
+            if abs(new_position) < 1e-12:
+                new_position, self.entry_price = 0.0, 0.0
+            elif (new_position > 0) != (self.position > 0):
+                self.entry_price = price  # 반대 방향으로 전환된 부분은 체결가로 새로 진입
+            self.position = new_position
+        else:
+            total = abs(self.position) + abs(quantity)
+            self.entry_price = (self.entry_price * abs(self.position) + price * abs(quantity)) / total
+            self.position += quantity
+        self.realized_pnl += realized
+        self.fees += fee
+        self.trades += 1
+        return realized
+
+class PaperTradingEngine:
+    """
+    CCI 신호로 모의 주문을 내고 체결, 포지션, 손익을 추적하는 엔진
+    
+    update()는 피드의 캔들 배치([[ts, o, h, l, c, v], ...])와 현재 시각을 받아
+    - 타임스탬프가 바뀌면 직전 캔들이 마감된 것으로 보고 CCI 윈도우에 반영 ('close' 모드는 이때 신호 평가)
+    - 'intra' 모드는 진행 중 캔들이 갱신될 때마다 신호를 평가 (캔들당 방향별 한 번)
+    - 신호 시각 + latency_ms가 지난 대기 주문을 그 이후 처음 관측되는 가격에 체결
+      (관측 가격은 새 캔들의 시가(캔들 시작 시각)와 배치의 마지막 종가(현재 시각) 두 가지뿐)
+    을 수행하고 발생한 이벤트 목록({'type': 'signal' | 'fill', ...})을 반환함.
+    매수 신호는 +order_notional 포지션, 매도 신호는 -order_notional(allow_short가 아니면 청산)을 목표로 함.
+    """
+    
+    def __init__(self, evaluate='close', initial_equity=10000.0, order_notional=1000.0,
+                 fee_rate=0.0004, slippage=0.0, latency_ms=0, allow_short=True,
+                 cci_window=20, overbought=100, oversold=-100, max_markers=200, max_points=2000):
+        if evaluate not in EVALUATE_MODES:
+            raise ValueError(f"Unsupported evaluate mode: {evaluate}")
+        self.evaluate = evaluate
+        self.initial_equity = initial_equity
+        self.order_notional = order_notional
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.latency_ms = latency_ms
+        self.allow_short = allow_short
+        self.cci_window = cci_window
+        self.overbought = overbought
+        self.oversold = oversold
+        self.max_markers = max_markers
+        self.max_points = max_points
+        self.books = {}  # (심볼, 타임프레임) -> PaperBook
+        self._next_order_id = 1
+    
+    def book(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        book = self.books.get(key)
+        if book is None:
+            book = PaperBook(key, self.initial_equity, self.cci_window, self.max_markers, self.max_points)
+            self.books[key] = book
+        return book
+    
+    def total_equity(self):
+        return sum(book.equity() for book in self.books.values())
+    
+    def reset(self):
+        self.books.clear()
+    
+    def warm_up(self, symbol, timeframe, rows):
+        """
+        과거 캔들로 CCI 윈도우 채우기 (주문 없음, 이미 워밍업된 장부는 무시)
+        마지막 행은 진행 중 캔들로 간주함
+        """
+        book = self.book(symbol, timeframe)
+        if book.cci.is_ready() or len(rows) < 2:
+            return
+        current = book.candle[0] if book.candle is not None else None
+        rows = [row for row in rows if current is None or int(row[0]) < current]
+        if current is None:
+            rows, last = rows[:-1], rows[-1]
+            book.candle = [int(last[0])] + [float(v) for v in last[1:5]]
+        book.cci = IncrementalCCI(self.cci_window)
+        for row in rows[-self.cci_window:]:
+            high, low, close = float(row[2]), float(row[3]), float(row[4])
+            book.last_cci = book.cci.value(high, low, close)
+            book.cci.push(high, low, close)
+    
+    def update(self, symbol, timeframe, rows, now_ms):
+        """
+        캔들 배치 반영
+        
+        Returns:
+        list: 이 배치에서 발생한 신호/체결 이벤트
+        """
+        book = self.book(symbol, timeframe)
+        events = []
+        for row in rows:
+            ts = int(row[0])
+            o, h, l, c = float(row[1]), float(row[2]), float(row[3]), float(row[4])
+            if book.candle is not None and ts < book.candle[0]:
+                continue  # 이미 마감 처리한 캔들의 늦은 갱신
+            if book.candle is None or ts > book.candle[0]:
+                if book.candle is not None:
+                    self._close_candle(book, ts, events)
+                book.candle = [ts, o, h, l, c]
+                self._fill_due(book, ts, o, events)
+            else:
+                book.candle[2:5] = [h, l, c]
+            if self.evaluate == 'intra':
+                self._evaluate(book, book.cci.value(h, l, c), now_ms, events)
+        if book.candle is not None:
+            self._fill_due(book, now_ms, book.candle[4], events)
+        return events
+    
+    def _close_candle(self, book, close_ms, events):
+        """직전 캔들 마감: CCI 윈도우 갱신, 'close' 모드 신호 평가, 자산 곡선 기록"""
+        ts, _, high, low, close = book.candle
+        value = book.cci.value(high, low, close)
+        if self.evaluate == 'close':
+            self._evaluate(book, value, close_ms, events)
+        if value is not None:
+            book.last_cci = value
+        book.cci.push(high, low, close)
+        book.equity_curve.append((ts, book.equity(close)))
+    
+    def _evaluate(self, book, value, now_ms, events):
+        if value is None or book.last_cci is None:
+            return
+        signal = cci_signal(book.last_cci, value, self.overbought, self.oversold)
+        if not signal or book.last_signal == (book.candle[0], signal):
+            return
+        book.last_signal = (book.candle[0], signal)
+        events.append({
+            'type': 'signal', 'key': book.key, 'side': 'buy' if signal > 0 else 'sell',
+            'cci': value, 'price': book.candle[4], 'time': now_ms,
+        })
+        
+        if signal > 0:
+            target = self.order_notional / book.candle[4]
+        else:
+            target = -self.order_notional / book.candle[4] if self.allow_short else 0.0
+        quantity = target - book.position - book.pending_quantity
+        if abs(quantity) < 1e-12 or (quantity > 0) != (signal > 0):
+            return
+        reason = f"CCI {book.last_cci:.1f} -> {value:.1f}"
+        book.orders.append(PaperOrder(self._next_order_id, quantity, reason, now_ms, now_ms + self.latency_ms))
+        self._next_order_id += 1
+    
+    def _fill_due(self, book, now_ms, price, events):
+        """지연 시간이 지난 대기 주문을 price에 체결 (슬리피지 및 수수료 반영)"""
+        if not book.orders:
+            return
+        remaining = []
+        for order in book.orders:
+            if order.due_ms > now_ms:
+                remaining.append(order)
+                continue
+            fill_price = price * (1 + self.slippage if order.quantity > 0 else 1 - self.slippage)
+            fee = abs(order.quantity) * fill_price * self.fee_rate
+            realized = book.apply_fill(order.quantity, fill_price, fee)
+            book.fills.append((book.candle[0], order.quantity, fill_price))
+            events.append({
+                'type': 'fill', 'key': book.key, 'side': 'buy' if order.quantity > 0 else 'sell',
+                'quantity': abs(order.quantity), 'price': fill_price, 'fee': fee, 'realized': realized,
+                'position': book.position, 'equity': book.equity(price), 'reason': order.reason,
+                'time': now_ms, 'latency': now_ms - order.submitted_ms,
+            })
+        book.orders = remaining
+
+def tick_batches(row, ticks, timeframe_ms):
+    """
+    마감 캔들 하나를 진행 중 갱신 ticks개로 분할 ((현재 시각, 배치) 목록)
+    종가는 시가에서 최종 종가로 선형 이동하고 고가/저가는 마지막 갱신에서 최종값이 됨
+    k번째 갱신의 시각은 캔들 시작 + timeframe_ms * k / ticks - 1 (마지막 갱신은 마감 직전)
+    """
+    ts, open_price, high, low, close, volume = row[:6]
+    batches = []
+    for k in range(1, ticks + 1):
+        fraction = k / ticks
+        price = open_price + (close - open_price) * fraction
+        partial = [ts, open_price, high if k == ticks else max(open_price, price),
+                   low if k == ticks else min(open_price, price), price, volume * fraction]
+        batches.append((int(ts + timeframe_ms * fraction) - 1, [partial]))
+    return batches
+
+def replay_rows(engine, symbol, timeframe, rows, timeframe_ms, ticks=1):
+    """
+    저장된 캔들을 재생 (각 캔들을 tick_batches()의 진행 중 갱신 ticks개로 전달)
+    
+    대기 주문은 신호 시각 + latency_ms 이후 처음 관측되는 가격에 체결됨. 'close' 모드 신호는 다음 캔들이
+    시작될 때 평가되므로 ticks=1이면 latency_ms가 0일 때 다음 캔들 시가, 0보다 크면 다음 캔들의
+    (마감 직전) 종가에 체결됨. ticks를 늘리면 시가에서 종가로 가는 선형 경로 중 지연 이후 첫 갱신 가격에 체결됨
+    
+    Returns:
+    list: 재생 중 발생한 모든 이벤트
+    """
+    events = []
+    for row in rows:
+        for now_ms, batch in tick_batches(row, ticks, timeframe_ms):
+            events.extend(engine.update(symbol, timeframe, batch, now_ms))
+    return events
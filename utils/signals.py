@@ -1,12 +1,25 @@
 """
 기술적 지표 기반 매매신호 감지 함수를 제공하는 모듈
 
-현재 애플리케이션에서는 매매 신호 기능이 비활성화되어 있으며,
-이 모듈의 함수들은 나중에 매매 신호 기능을 구현할 때 사용될 예정입니다.
+차트에는 매매 신호를 표시하지 않으며, cci_signal()은 페이퍼 트레이딩 엔진
+(utils/paper_trading.py)이 캔들 단위로 증분 평가할 때 사용합니다.
 """
 
 import pandas as pd
 
+def cci_signal(prev_cci, cci, overbought=100, oversold=-100):
+    """
+    직전 CCI와 현재 CCI 사이의 매매신호 (detect_cci_signals와 같은 규칙)
+    
+    Returns:
+    int: 1(매수: 과매도 영역 탈출 또는 0선 상향 돌파), -1(매도: 과매수 영역 이탈 또는 0선 하향 돌파), 0(신호 없음)
+    """
+    if (prev_cci < oversold and cci > oversold) or (prev_cci < 0 and cci > 0):
+        return 1
+    if (prev_cci > overbought and cci < overbought) or (prev_cci > 0 and cci < 0):
+        return -1
+    return 0
+
 def detect_cci_signals(df, cci_values, overbought=100, oversold=-100):
     """
     CCI 지표 기반 매매신호 감지
@@ -31,24 +44,13 @@ def detect_cci_signals(df, cci_values, overbought=100, oversold=-100):
     df_with_signals['cci_buy_signal'] = False
     df_with_signals['cci_sell_signal'] = False
     
-    # 과매수/과매도 영역 신호
-    for i in range(1, len(df_with_signals)):
-        # 과매도 영역에서 올라오는 경우 (매수 신호)
-        if df_with_signals['cci'].iloc[i-1] < oversold and df_with_signals['cci'].iloc[i] > oversold:
-            df_with_signals.loc[df_with_signals.index[i], 'cci_buy_signal'] = True
-        
-        # 과매수 영역에서 내려오는 경우 (매도 신호)
-        if df_with_signals['cci'].iloc[i-1] > overbought and df_with_signals['cci'].iloc[i] < overbought:
-            df_with_signals.loc[df_with_signals.index[i], 'cci_sell_signal'] = True
-    
-    # 0선 돌파 신호
+    # 과매수/과매도 영역 탈출 및 0선 돌파 신호
+    cci = df_with_signals['cci'].to_numpy()
     for i in range(1, len(df_with_signals)):
-        # 아래에서 위로 0선 돌파 (매수 신호)
-        if df_with_signals['cci'].iloc[i-1] < 0 and df_with_signals['cci'].iloc[i] > 0:
+        signal = cci_signal(cci[i-1], cci[i], overbought, oversold)
+        if signal == 1:
             df_with_signals.loc[df_with_signals.index[i], 'cci_buy_signal'] = True
-        
-        # 위에서 아래로 0선 돌파 (매도 신호)
-        if df_with_signals['cci'].iloc[i-1] > 0 and df_with_signals['cci'].iloc[i] < 0:
+        elif signal == -1:
             df_with_signals.loc[df_with_signals.index[i], 'cci_sell_signal'] = True
     
     return df_with_signals 
\ No newline at end of file